@@ -72,6 +72,9 @@ def get_addons():
         'tweak.resource = htsql.tweak.resource:TweakResourceAddon',
         'tweak.shell = htsql.tweak.shell:TweakShellAddon',
         'tweak.shell.default = htsql.tweak.shell.default:TweakShellDefaultAddon',
+        'tweak.snapshot = htsql.tweak.snapshot:TweakSnapshotAddon',
+        'tweak.snapshot.pgsql'
+            ' = htsql_pgsql.tweak.snapshot:TweakSnapshotPGSQLAddon',
         'tweak.sqlalchemy = htsql.tweak.sqlalchemy:TweakSQLAlchemyAddon',
         'tweak.system = htsql.tweak.system:TweakSystemAddon',
         'tweak.system.pgsql = htsql_pgsql.tweak.system:TweakSystemPGSQLAddon',
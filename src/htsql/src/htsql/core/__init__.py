@@ -6,7 +6,7 @@
 from . import (adapter, addon, application, cache, cmd, connect, context,
         domain, entity, error, introspect, split_sql, syn, tr, util, validator,
         wsgi)
-from .validator import DBVal, StrVal, BoolVal, UIntVal
+from .validator import DBVal, StrVal, BoolVal, UIntVal, PIntVal
 from .addon import Addon, Parameter, Variable, addon_registry
 from .connect import connect
 from .error import Error
@@ -41,7 +41,13 @@ class HTSQLAddon(Addon):
     the password given as a part of `db` parameter.
 
     The parameter `query_cache_size` specifies the number of cached
-    query plans.  The default value is 1024.
+    query plans.  The default value is 1024.  Cache hit, miss and eviction
+    counters are reported by `htsql.core.tr.translate.get_plan_cache_stats()`.
+
+    The parameter `fetch_limit`, if set, makes the HTTP service fetch
+    query results from the database in chunks of the given size, which
+    keeps memory usage flat for large results.  The chunks are spooled
+    to a temporary file and rendered incrementally.
 
     The parameter `debug`, if set to `True`, enables debug output.
     """
@@ -55,6 +61,9 @@ class HTSQLAddon(Addon):
             Parameter('query_cache_size', UIntVal(), default=1024,
                       value_name="""size""",
                       hint="""max size of the query cache"""),
+            Parameter('fetch_limit', PIntVal(is_nullable=True), default=None,
+                      value_name="""size""",
+                      hint="""fetch query output in chunks"""),
             Parameter('debug', BoolVal(), default=False,
                       hint="""dump debug information""")
     ]
@@ -49,3 +49,105 @@ def once(service):
     return wrapper
 
 
+class CacheItem:
+
+    __slots__ = ('key', 'value', 'is_referenced')
+
+    def __init__(self, key, value):
+        self.key = key
+        self.value = value
+        self.is_referenced = False
+
+
+class ClockCache:
+    """
+    A bounded cache with approximate LRU eviction.
+
+    Lookups do not take any locks: a hit only marks the item as recently
+    used.  Updates must be serialized by the caller.  When the cache is
+    full, the clock hand sweeps over the items giving each recently used
+    item a second chance and evicts the first one that was not used since
+    the previous sweep.
+
+    The cache counts hits, misses and evictions; the counters are updated
+    without synchronization and are therefore approximate.
+    """
+
+    __slots__ = ('items', 'ring', 'hand', 'size',
+                 'hits', 'misses', 'evictions')
+
+    def __init__(self, size):
+        assert size > 0
+        self.items = {}
+        self.ring = []
+        self.hand = 0
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        item = self.items.get(key)
+        if item is None:
+            self.misses += 1
+            return None
+        item.is_referenced = True
+        self.hits += 1
+        return item.value
+
+    def __getitem__(self, key):
+        item = self.items[key]
+        item.is_referenced = True
+        return item.value
+
+    def __setitem__(self, key, value):
+        item = self.items.get(key)
+        if item is not None:
+            item.value = value
+            return
+        item = CacheItem(key, value)
+        if len(self.ring) < self.size:
+            self.ring.append(item)
+        else:
+            while True:
+                victim = self.ring[self.hand]
+                if not victim.is_referenced:
+                    break
+                victim.is_referenced = False
+                self.hand = (self.hand+1) % self.size
+            del self.items[victim.key]
+            self.ring[self.hand] = item
+            self.hand = (self.hand+1) % self.size
+            self.evictions += 1
+        self.items[key] = item
+
+    def __contains__(self, key):
+        return key in self.items
+
+    def __len__(self):
+        return len(self.items)
+
+    def stats(self):
+        return {
+                'size': len(self.items),
+                'capacity': self.size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+        }
+
+
+def get_bounded_cache(service):
+    # Returns the bounded cache associated with the given service;
+    # `None` if caching is disabled with `query_cache_size`.
+    cache = context.app.htsql.cache
+    try:
+        return cache.values[service]
+    except KeyError:
+        size = context.app.htsql.query_cache_size
+        if not size:
+            return None
+        with cache.lock(service):
+            if service not in cache.values:
+                cache.values[service] = ClockCache(size=size)
+            return cache.values[service]
@@ -4,6 +4,7 @@
 
 
 from ..adapter import Adapter, adapt
+from ..context import context
 from ..error import Error, act_guard
 from ..util import Clonable
 from .command import Command, UniversalCmd, DefaultCmd, FormatCmd, FetchCmd
@@ -12,6 +13,8 @@ from .embed import embed
 from ..syn.parse import parse
 from ..syn.syntax import Syntax
 from ..fmt.emit import emit, emit_headers
+from ..fmt.format import (ProxyFormat, RawFormat, JSONFormat, CSVFormat,
+        XMLFormat)
 from ..fmt.accept import accept
 
 
@@ -88,7 +91,7 @@ class RenderFormat(Act):
 
     def __call__(self):
         format = self.command.format
-        product = produce(self.command.feed)
+        product = render_produce(self.command.feed, format)
         status = "200 OK"
         headers = emit_headers(format, product)
         body = emit(format, product)
@@ -105,7 +108,7 @@ class RenderProducer(Act):
 
     def __call__(self):
         format = accept(self.action.environ)
-        product = produce(self.command)
+        product = render_produce(self.command, format)
         status = "200 OK"
         headers = emit_headers(format, product)
         body = emit(format, product)
@@ -127,6 +130,19 @@ def produce(command, environment=None, **parameters):
     return act(command, action)
 
 
+def render_produce(command, format):
+    # Fetches the data in chunks if `fetch_limit` is set and the output
+    # format could be rendered incrementally, in a single pass.
+    batch = context.app.htsql.fetch_limit
+    while isinstance(format, ProxyFormat):
+        format = format.format
+    if not isinstance(format, (RawFormat, JSONFormat, CSVFormat, XMLFormat)):
+        batch = None
+    environment = embed(None)
+    action = ProduceAction(environment, batch=batch)
+    return act(command, action)
+
+
 def safe_produce(command, cut, offset=None, environment=None, **parameters):
     environment = embed(environment, **parameters)
     action = SafeProduceAction(environment, cut, offset)
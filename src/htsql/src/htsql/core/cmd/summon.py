@@ -8,7 +8,7 @@ from ..error import Error, recognize_guard, point, MarkRef
 from ..util import to_name
 from ..syn.syntax import (Syntax, SkipSyntax, FunctionSyntax, PipeSyntax,
         ApplySyntax, CollectSyntax)
-from ..syn.parse import parse
+from ..syn.parse import cached_parse
 from ..fmt.format import (TextFormat, HTMLFormat, RawFormat, JSONFormat,
         CSVFormat, TSVFormat, XMLFormat)
 from .command import SkipCmd, FetchCmd, FormatCmd, SQLCmd, DefaultCmd
@@ -169,7 +169,7 @@ class SummonSQL(Summon):
 def recognize(syntax):
     assert isinstance(syntax, (Syntax, str))
     if not isinstance(syntax, Syntax):
-        syntax = parse(syntax)
+        syntax = cached_parse(syntax)
     command = Recognize.__invoke__(syntax)
     if command is None:
         command = DefaultCmd(syntax)
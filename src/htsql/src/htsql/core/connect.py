@@ -313,6 +313,26 @@ class Connect(Utility):
         raise NotImplementedError()
 
 
+class OpenStreamCursor(Utility):
+    """
+    Opens a cursor for reading a large result set in chunks.
+
+    By default, returns a regular cursor.  Engines that support
+    server-side cursors should override it so that the rows are
+    transferred from the server only as they are fetched.
+
+    `connection` (:class:`ConnectionProxy`)
+        An open connection.
+    """
+
+    def __init__(self, connection):
+        assert isinstance(connection, ConnectionProxy)
+        self.connection = connection
+
+    def __call__(self):
+        return self.connection.cursor()
+
+
 class Scramble(Adapter):
 
     adapt(Domain)
@@ -389,6 +409,7 @@ class TransactionGuard:
 
 
 connect = Connect.__invoke__
+open_stream_cursor = OpenStreamCursor.__invoke__
 scramble = Scramble.__invoke__
 unscramble = Unscramble.__invoke__
 unscramble_error = UnscrambleError.__invoke__
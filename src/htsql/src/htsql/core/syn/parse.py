@@ -3,7 +3,8 @@
 #
 
 
-from ..cache import once
+from ..context import context
+from ..cache import once, get_bounded_cache
 from .token import (DIRSIG, PIPESIG, LHSSIG, STRING, LABEL, INTEGER, DECIMAL,
         FLOAT)
 from .syntax import (Syntax, SkipSyntax, AssignSyntax, SpecifySyntax,
@@ -660,3 +661,23 @@ def parse(text, start=None):
     return parse(tokens, start)
 
 
+def cached_parse(text):
+    """
+    Parses the input query string; reuses the syntax tree if the same
+    query string was parsed before.
+
+    `text`: ``str``
+        A raw query string.
+
+    *Returns*: :class:`.Syntax`
+        The corresponding syntax tree.
+    """
+    mapping = get_bounded_cache(cached_parse)
+    if mapping is None:
+        return parse(text)
+    syntax = mapping.get(text)
+    if syntax is None:
+        syntax = parse(text)
+        with context.app.htsql.cache.lock(cached_parse):
+            mapping[text] = syntax
+    return syntax
@@ -150,10 +150,14 @@ class SerializingState:
 
     `hook` (:class:`Hook`)
         Encapsulates serializing hints and directives.
+
+    `with_placeholders` (Boolean)
+        Set if the statement being serialized takes parameters.
     """
 
     def __init__(self, batch=None):
         self.batch = batch
+        self.with_placeholders = False
         # The stream that accumulates the generated SQL.
         self.stream = Stream()
         # A mapping: tag -> frame.
@@ -310,20 +314,19 @@ class SerializeSegment(Serialize):
     max_alias_length = 63
 
     def __call__(self):
-        # Populate the `frame_by_tag` mapping.
-        self.state.set_tree(self.clause)
-        # Generate `SELECT` and `FROM` aliases.
-        self.aliasing()
-        # Dump the `SELECT` statement.
-        self.state.dump(self.clause)
-        # Retrieve and return the generated SQL.
-        placeholders = self.state.placeholders
-        sql = self.state.flush()
+        sql, placeholders = self.dump()
+        if placeholders and "%" in sql:
+            # Some drivers use `%` in placeholders, so literals may need
+            # to be spelled differently when the statement takes parameters.
+            self.state.with_placeholders = True
+            sql, placeholders = self.dump()
+            self.state.with_placeholders = False
+        # Placeholders are numbered across the whole query; a segment
+        # may use only some of them.
         input_domains = None
         if placeholders:
-            input_domains = []
-            for index in sorted(placeholders):
-                input_domains.append(placeholders[index])
+            input_domains = [placeholders.get(index)
+                             for index in range(max(placeholders)+1)]
         output_domains = [phrase.domain for phrase in self.clause.select]
         if self.state.batch is None:
             pipe = SQLPipe(sql, input_domains, output_domains)
@@ -342,6 +345,23 @@ class SerializeSegment(Serialize):
             pipe = ComposePipe(pipe, mix_pipe)
         return pipe
 
+    def dump(self):
+        """
+        Generates the ``SELECT`` statement.
+
+        Returns the SQL and the domains of the placeholders.
+        """
+        # Populate the `frame_by_tag` mapping.
+        self.state.set_tree(self.clause)
+        # Generate `SELECT` and `FROM` aliases.
+        self.aliasing()
+        # Dump the `SELECT` statement.
+        self.state.dump(self.clause)
+        # Retrieve and return the generated SQL.
+        placeholders = self.state.placeholders
+        sql = self.state.flush()
+        return sql, placeholders
+
     def aliasing(self, frame=None,
                  taken_select_aliases=None,
                  taken_include_aliases=None):
@@ -6,7 +6,7 @@
 from ..util import Clonable, YAMLable
 from ..context import context
 from ..domain import Product
-from ..connect import transaction, scramble, unscramble
+from ..connect import transaction, scramble, unscramble, open_stream_cursor
 from ..error import PermissionError
 import operator
 import tempfile
@@ -49,20 +49,21 @@ class SQLPipe(Pipe):
                 raise PermissionError("No read permissions")
             scrambles = None
             if input_domains is not None:
-                scrambles = [scramble(domain) for domain in input_domains]
+                scrambles = [scramble(domain) if domain is not None else None
+                             for domain in input_domains]
             unscrambles = list(enumerate(
                     [unscramble(domain) for domain in output_domains]))
             with transaction() as connection:
                 cursor = connection.cursor()
                 if scrambles is None:
-                    assert input is None
                     cursor.execute(sql)
                 else:
                     assert isinstance(input, (tuple, list))
-                    assert len(input) == len(scrambles)
+                    assert len(input) >= len(scrambles)
                     parameters = dict((str(index+1), scramble(item))
                             for index, (item, scramble)
-                                    in enumerate(zip(input, scrambles)))
+                                    in enumerate(zip(input, scrambles))
+                            if scramble is not None)
                     cursor.execute(sql, parameters)
                 output = []
                 for row in cursor:
@@ -100,25 +101,27 @@ class BatchSQLPipe(Pipe):
                 raise PermissionError("No read permissions")
             scrambles = None
             if input_domains is not None:
-                scrambles = [scramble(domain) for domain in input_domains]
+                scrambles = [scramble(domain) if domain is not None else None
+                             for domain in input_domains]
             unscrambles = [unscramble(domain) for domain in output_domains]
             with transaction() as connection:
-                cursor = connection.cursor()
+                cursor = open_stream_cursor(connection)
                 if scrambles is None:
-                    assert input is None
                     cursor.execute(sql)
                 else:
                     assert isinstance(input, (tuple, list))
-                    assert len(input) == len(scrambles)
+                    assert len(input) >= len(scrambles)
                     parameters = dict((str(index+1), scramble(item))
                             for index, (item, scramble)
-                                    in enumerate(zip(input, scrambles)))
+                                    in enumerate(zip(input, scrambles))
+                            if scramble is not None)
                     cursor.execute(sql, parameters)
                 chunk = cursor.fetchmany(batch)
                 chunk = [tuple([convert(item)
                                 for item, convert in zip(row, unscrambles)])
                          for row in chunk]
                 if len(chunk) < batch:
+                    cursor.close()
                     return chunk
                 stream = tempfile.TemporaryFile()
                 size = 0
@@ -129,6 +132,7 @@ class BatchSQLPipe(Pipe):
                     chunk = [tuple([convert(item)
                                     for item, convert in zip(row, unscrambles)])
                              for row in chunk]
+                cursor.close()
                 stream.seek(0)
                 def iterate(stream=stream, size=size, load=pickle.load):
                     for k in range(size):
@@ -273,10 +277,16 @@ class MixPipe(Pipe):
         def mix(input, make_parent_key=make_keys[0],
                        make_kid_keys=make_keys[1:]):
             parent = input[0]
-            kids = input[1:]
+            kids = [kid if isinstance(kid, list) else list(kid)
+                    for kid in input[1:]]
+            if isinstance(parent, list):
+                return list(merge(parent, kids,
+                                  make_parent_key, make_kid_keys))
+            # Let a batched parent stream through.
+            return merge(parent, kids, make_parent_key, make_kid_keys)
+        def merge(parent, kids, make_parent_key, make_kid_keys):
             kids_range = list(range(len(kids)))
             tops = [0]*len(kids)
-            output = []
             for parent_row in parent:
                 row = list(parent_row)
                 parent_key = make_parent_key(parent_row)
@@ -291,10 +301,9 @@ class MixPipe(Pipe):
                         top += 1
                     tops[idx] = top
                     row.append(kid_rows)
-                output.append(tuple(row))
+                yield tuple(row)
             for idx in kids_range:
                 assert tops[idx] == len(kids[idx])
-            return output
         return mix
 
     def __yaml__(self):
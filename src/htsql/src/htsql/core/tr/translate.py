@@ -4,8 +4,10 @@
 
 
 from ..context import context
+from ..adapter import Utility
+from ..cache import get_bounded_cache
 from ..syn.syntax import Syntax
-from ..syn.parse import parse
+from ..syn.parse import cached_parse
 from .bind import bind
 from .binding import Binding
 from .decorate import decorate
@@ -21,87 +23,99 @@ from .pack import pack
 from .pipe import SQLPipe, RecordPipe, ComposePipe, ProducePipe
 
 
-class CacheItem:
-
-    __slots__ = ('prev', 'next', 'key', 'value')
-
-    def __init__(self, prev, next, key, value):
-        self.prev = prev
-        self.next = next
-        self.key = key
-        self.value = value
-
-
-class LRUCache:
-
-    __slots__ = ('head', 'tail', 'items', 'size')
-
-    def __init__(self, size):
-        self.head = None
-        self.tail = None
-        self.items = {}
-        self.size = size
-
-    def __getitem__(self, key):
-        item = self.items[key]
-        if item.prev is not None:
-            item.prev.next = item.next
-            if item.next is not None:
-                item.next.prev = item.prev
-            else:
-                self.tail = item.prev
-            item.prev = None
-            item.next = self.head
-            self.head.prev = item
-            self.head = item
-        return item.value
-
-    def __setitem__(self, key, value):
-        try:
-            self.items[key].value = value
-        except KeyError:
-            item = CacheItem(None, self.head, key, value)
-            if self.head is not None:
-                self.head.prev = item
-            else:
-                self.tail = item
-            self.head = item
-            self.items[key] = item
-            if len(self.items) > self.size:
-                del self.items[self.tail.key]
-                self.tail.prev.next = None
-                self.tail = self.tail.prev
-
-    def __len__(self):
-        return len(self.items)
-
-
 def cache_plan(key, plan):
+    mapping = get_bounded_cache(cache_plan)
+    if mapping is None:
+        return
     cache = context.app.htsql.cache
     with cache.lock(cache_plan):
-        try:
-            mapping = cache.values[cache_plan]
-        except KeyError:
-            size = context.app.htsql.query_cache_size
-            if not size:
-                return
-            mapping = cache.values[cache_plan] = LRUCache(size=size)
         mapping[key] = plan
 
 
 def get_cached_plan(key, cache_plan=cache_plan):
+    mapping = get_bounded_cache(cache_plan)
+    if mapping is None:
+        return None
+    return mapping.get(key)
+
+
+def get_plan_cache_stats(cache_plan=cache_plan):
+    """
+    Returns hit, miss and eviction counters of the query plan cache.
+
+    Use it to pick the value of the `query_cache_size` parameter.
+    """
+    mapping = get_bounded_cache(cache_plan)
+    if mapping is None:
+        return None
+    return mapping.stats()
+
+
+class TranslateContext(Utility):
+    """
+    Identifies the state of the environment that affects query binding.
+
+    Returns a hashable value, which becomes a part of the key of the
+    translation cache, or ``None`` if translation results must not be
+    cached.  Override when an addon makes binding depend on the state
+    of the environment.
+    """
+
+    def __call__(self):
+        return ()
+
+
+def cache_pipe(key, pipe):
+    mapping = get_bounded_cache(cache_pipe)
+    if mapping is None:
+        return
     cache = context.app.htsql.cache
-    with cache.lock(cache_plan):
-        try:
-            return cache.values[cache_plan][key]
-        except KeyError:
-            return None
+    with cache.lock(cache_pipe):
+        mapping[key] = pipe
+
+
+def get_cached_pipe(key, cache_pipe=cache_pipe):
+    mapping = get_bounded_cache(cache_pipe)
+    if mapping is None:
+        return None
+    return mapping.get(key)
+
+
+def get_pipe_key(syntax, environment, limit, offset, batch):
+    # Generates the key of the translation cache; `None` if the query
+    # cannot be cached.
+    if isinstance(syntax, Binding):
+        return None
+    state = translate_context()
+    if state is None:
+        return None
+    parameters = ()
+    if environment is not None:
+        parameters = []
+        for name in sorted(environment):
+            value = environment[name]
+            data = value.data
+            if isinstance(data, list):
+                data = tuple(data)
+            parameters.append((name, value.domain, data))
+        parameters = tuple(parameters)
+    key = (syntax, parameters, limit, offset, batch, state)
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
 
 
 def translate(syntax, environment=None, limit=None, offset=None, batch=None):
     assert isinstance(syntax, (Syntax, Binding, str))
     if isinstance(syntax, str):
-        syntax = parse(syntax)
+        syntax = cached_parse(syntax)
+    pipe_key = get_pipe_key(syntax, environment, limit, offset, batch)
+    if pipe_key is not None:
+        pipe = get_cached_pipe(pipe_key)
+        if pipe is not None:
+            return pipe
     if not isinstance(syntax, Binding):
         binding = bind(syntax, environment=environment)
     else:
@@ -113,6 +127,8 @@ def translate(syntax, environment=None, limit=None, offset=None, batch=None):
     if pipe_sql is not None:
         pipe, sql = pipe_sql
         pipe = ProducePipe(profile, pipe, sql=sql)
+        if pipe_key is not None:
+            cache_pipe(pipe_key, pipe)
         return pipe
     expression = encode(flow)
     if limit is not None or offset is not None:
@@ -128,9 +144,14 @@ def translate(syntax, environment=None, limit=None, offset=None, batch=None):
     #print pipe
     cache_plan(key, (pipe, sql))
     pipe = ProducePipe(profile, pipe, sql=sql)
+    if pipe_key is not None:
+        cache_pipe(pipe_key, pipe)
     return pipe
 
 
+translate_context = TranslateContext.__invoke__
+
+
 def get_sql(pipe):
     if isinstance(pipe, SQLPipe):
         return pipe.sql
@@ -15,7 +15,8 @@ class TweakETLAddon(Addon):
     help = """
     The extension provides the following commands:
 
-    `insert(feed)` adds records to a table.
+    `insert(feed)` adds records to a table; set `insert_limit`
+    to insert records in batches.
 
     `copy(feed)` adds records to a table chunking the input.
 
@@ -35,6 +36,8 @@ class TweakETLAddon(Addon):
     parameters = [
             Parameter('copy_limit', PIntVal(is_nullable=True), default=10000,
                       hint="""chunk size for copy (default: 10000)"""),
+            Parameter('insert_limit', PIntVal(is_nullable=True), default=1,
+                      hint="""batch size for insert (default: 1)"""),
     ]
 
     @classmethod
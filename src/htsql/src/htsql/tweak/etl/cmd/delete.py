@@ -31,6 +31,7 @@ class ExecuteDeletePipe:
         self.sql = sql
         self.key_converts = [scramble(column.domain)
                              for column in key_columns]
+        self.batch_sql = {}
 
     def __call__(self, key_row):
         key_row = tuple(convert(item)
@@ -41,6 +42,39 @@ class ExecuteDeletePipe:
             cursor = connection.cursor()
             cursor.execute(self.sql, key_row)
 
+    def batch(self, key_rows):
+        # Deletes a batch of records with multi-key statements.
+        if len(key_rows) <= 1:
+            for key_row in key_rows:
+                self(key_row)
+            return
+        # Only statements for a power of two keys are prepared, so that
+        # the number of distinct statements stays small.
+        start = 0
+        while start < len(key_rows):
+            size = 1 << ((len(key_rows)-start).bit_length()-1)
+            self.delete_many(key_rows[start:start+size])
+            start += size
+
+    def delete_many(self, key_rows):
+        if len(key_rows) == 1:
+            return self(key_rows[0])
+        sql = self.batch_sql.get(len(key_rows))
+        if sql is None:
+            sql = serialize_delete(self.table, self.key_columns,
+                                   len(key_rows))
+            self.batch_sql[len(key_rows)] = sql
+        parameters = []
+        for key_row in key_rows:
+            parameters.extend(convert(item)
+                              for item, convert
+                                    in zip(key_row, self.key_converts))
+        if not context.env.can_write:
+            raise PermissionError("No write permissions")
+        with transaction() as connection:
+            cursor = connection.cursor()
+            cursor.execute(sql, parameters)
+
 
 class BuildExecuteDelete(Utility):
 
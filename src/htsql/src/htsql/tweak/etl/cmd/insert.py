@@ -23,7 +23,7 @@ from ....core.syn.syntax import VoidSyntax, IdentifierSyntax
 from ....core.tr.binding import (VoidBinding, RootBinding, FormulaBinding,
         LocateBinding, SelectionBinding, SieveBinding, AliasBinding,
         CollectBinding, FreeTableRecipe, ColumnRecipe)
-from ....core.tr.signature import IsEqualSig, AndSig, PlaceholderSig
+from ....core.tr.signature import IsEqualSig, AndSig, OrSig, PlaceholderSig
 from ....core.tr.decorate import decorate
 from ....core.tr.coerce import coerce
 from ....core.tr.lookup import identify
@@ -395,6 +395,19 @@ class ExecuteInsertPipe:
                                for column in input_columns]
         self.output_converts = [unscramble(column.domain)
                                 for column in output_columns]
+        # Rows returned by a multi-row statement may come in any order,
+        # so they are matched to the input rows by the key when it is
+        # given, or else by all the inserted values.
+        if all(column in input_columns for column in output_columns):
+            self.match_columns = output_columns
+        else:
+            self.match_columns = input_columns
+        self.batch_columns = output_columns + \
+                [column for column in self.match_columns
+                        if column not in output_columns]
+        self.match_converts = [unscramble(column.domain)
+                               for column in self.match_columns]
+        self.batch_sql = {}
 
     def __call__(self, row):
         row = tuple(convert(item)
@@ -410,6 +423,68 @@ class ExecuteInsertPipe:
             [row] = rows
         return row
 
+    def batch(self, rows):
+        # Inserts a batch of records with multi-row statements; returns
+        # the generated keys in the order of the input rows.
+        if len(rows) <= 1 or not self.input_columns:
+            return [self(row) for row in rows]
+        # Only statements for a power of two rows are prepared, so that
+        # the number of distinct statements stays small.
+        keys = []
+        start = 0
+        while start < len(rows):
+            size = 1 << ((len(rows)-start).bit_length()-1)
+            keys.extend(self.insert_many(rows[start:start+size]))
+            start += size
+        return keys
+
+    def insert_many(self, rows):
+        if len(rows) == 1:
+            return [self(rows[0])]
+        sql = self.batch_sql.get(len(rows))
+        if sql is None:
+            sql = serialize_insert(self.table, self.input_columns,
+                                   self.batch_columns, len(rows))
+            self.batch_sql[len(rows)] = sql
+        parameters = []
+        for row in rows:
+            parameters.extend(convert(item)
+                              for item, convert
+                                    in zip(row, self.input_converts))
+        if not context.env.can_write:
+            raise PermissionError("No write permissions")
+        with transaction() as connection:
+            cursor = connection.cursor()
+            cursor.execute(sql, parameters)
+            results = cursor.fetchall()
+            if len(results) != len(rows):
+                raise Error("Failed to insert a batch of records")
+        width = len(self.output_columns)
+        match_indexes = [self.batch_columns.index(column)
+                         for column in self.match_columns]
+        keys_by_match = {}
+        try:
+            for result in results:
+                match = tuple(convert(result[index])
+                              for index, convert
+                                    in zip(match_indexes,
+                                           self.match_converts))
+                keys_by_match.setdefault(match, []).append(
+                        tuple(result[:width]))
+            input_indexes = [self.input_columns.index(column)
+                             for column in self.match_columns]
+            keys = []
+            for row in rows:
+                match = tuple(row[index] for index in input_indexes)
+                candidates = keys_by_match.get(match)
+                if not candidates:
+                    raise Error("Failed to insert a batch of records")
+                keys.append(candidates.pop(0))
+        except TypeError:
+            # Unhashable values.
+            raise Error("Failed to insert a batch of records")
+        return keys
+
 
 class BuildExecuteInsert(Utility):
 
@@ -440,9 +515,12 @@ class BuildExecuteInsert(Utility):
 
 class ResolveIdentityPipe:
 
-    def __init__(self, profile, pipe):
+    def __init__(self, profile, pipe, table=None, columns=None):
         self.profile = profile
         self.pipe = pipe
+        self.table = table
+        self.columns = columns
+        self.batch_pipes = {}
 
     def __call__(self, row):
         product = self.pipe()(row)
@@ -451,6 +529,63 @@ class ResolveIdentityPipe:
             raise Error("Unable to locate the inserted record")
         return data[0]
 
+    def batch(self, rows):
+        # Resolves identities of a batch of records with a single query;
+        # returns the identities in the order of the input keys.
+        if len(rows) <= 1 or self.table is None:
+            return [self(row) for row in rows]
+        # Queries are only prepared for a power of two keys, so the list
+        # of keys is padded by repeating the last one.
+        size = 1 << (len(rows)-1).bit_length()
+        pipe = self.batch_pipes.get(size)
+        if pipe is None:
+            pipe = BuildResolveIdentityBatch.__invoke__(
+                    self.table, self.columns, size)
+            self.batch_pipes[size] = pipe
+        parameters = []
+        for row in rows:
+            parameters.extend(row)
+        for idx in range(size-len(rows)):
+            parameters.extend(rows[-1])
+        product = pipe()(parameters)
+        identity_by_key = {}
+        for record in product.data:
+            identity_by_key[tuple(record[1:])] = record[0]
+        data = []
+        for row in rows:
+            key = tuple(row)
+            if key not in identity_by_key:
+                raise Error("Unable to locate the inserted record")
+            data.append(identity_by_key[key])
+        return data
+
+
+def build_key_condition(state, scope, columns, syntax, offset=0):
+    # Generates `column1=$1&column2=$2&...` condition.
+    conditions = []
+    for idx, column in enumerate(columns):
+        column_binding = state.use(ColumnRecipe(column), syntax)
+        placeholder_binding = FormulaBinding(scope,
+                                             PlaceholderSig(offset+idx),
+                                             column_binding.domain,
+                                             syntax)
+        condition = FormulaBinding(scope,
+                                   IsEqualSig(+1),
+                                   coerce(BooleanDomain()),
+                                   syntax,
+                                   lop=column_binding,
+                                   rop=placeholder_binding)
+        conditions.append(condition)
+    if len(conditions) == 1:
+        [condition] = conditions
+    else:
+        condition = FormulaBinding(scope,
+                                   AndSig(),
+                                   coerce(BooleanDomain()),
+                                   syntax,
+                                   ops=conditions)
+    return condition
+
 
 class BuildResolveIdentity(Utility):
 
@@ -467,28 +602,7 @@ class BuildResolveIdentity(Utility):
         state = BindingState(scope)
         scope = state.use(FreeTableRecipe(self.table), syntax)
         state.push_scope(scope)
-        conditions = []
-        for idx, column in enumerate(self.columns):
-            column_binding = state.use(ColumnRecipe(column), syntax)
-            placeholder_binding = FormulaBinding(scope,
-                                                 PlaceholderSig(idx),
-                                                 column_binding.domain,
-                                                 syntax)
-            condition = FormulaBinding(scope,
-                                       IsEqualSig(+1),
-                                       coerce(BooleanDomain()),
-                                       syntax,
-                                       lop=column_binding,
-                                       rop=placeholder_binding)
-            conditions.append(condition)
-        if len(conditions) == 1:
-            [condition] = conditions
-        else:
-            condition = FormulaBinding(scope,
-                                       AndSig(),
-                                       coerce(BooleanDomain()),
-                                       syntax,
-                                       ops=conditions)
+        condition = build_key_condition(state, scope, self.columns, syntax)
         scope = SieveBinding(scope, condition, syntax)
         state.push_scope(scope)
         recipe = identify(scope)
@@ -509,7 +623,56 @@ class BuildResolveIdentity(Utility):
         profile = pipe.meta
         if not self.is_list:
             profile = profile.clone(domain=profile.domain.item_domain)
-        return ResolveIdentityPipe(profile, pipe)
+        return ResolveIdentityPipe(profile, pipe, self.table, self.columns)
+
+
+class BuildResolveIdentityBatch(Utility):
+    # Builds a query that fetches identities of `size` records
+    # together with their keys:
+    #   /table{id(), column1, column2, ...}?(column1=$1&column2=$2)|...
+
+    def __init__(self, table, columns, size):
+        assert isinstance(table, TableEntity)
+        assert isinstance(columns, listof(ColumnEntity))
+        assert isinstance(size, int) and size > 0
+        self.table = table
+        self.columns = columns
+        self.size = size
+
+    def __call__(self):
+        syntax = VoidSyntax()
+        scope = RootBinding(syntax)
+        state = BindingState(scope)
+        scope = state.use(FreeTableRecipe(self.table), syntax)
+        state.push_scope(scope)
+        conditions = []
+        for idx in range(self.size):
+            condition = build_key_condition(state, scope, self.columns,
+                                            syntax, idx*len(self.columns))
+            conditions.append(condition)
+        if len(conditions) == 1:
+            [condition] = conditions
+        else:
+            condition = FormulaBinding(scope,
+                                       OrSig(),
+                                       coerce(BooleanDomain()),
+                                       syntax,
+                                       ops=conditions)
+        scope = SieveBinding(scope, condition, syntax)
+        state.push_scope(scope)
+        recipe = identify(scope)
+        if recipe is None:
+            raise Error("Cannot determine table identity")
+        elements = [state.use(recipe, syntax)]
+        for column in self.columns:
+            elements.append(state.use(ColumnRecipe(column), syntax))
+        fields = [decorate(element) for element in elements]
+        domain = RecordDomain(fields)
+        scope = SelectionBinding(scope, elements, domain, syntax)
+        binding = Select.__invoke__(scope, state)
+        domain = ListDomain(binding.domain)
+        binding = CollectBinding(state.root, binding, domain, syntax)
+        return translate(binding)
 
 
 class ResolveChainPipe:
@@ -666,6 +829,7 @@ class ProduceInsert(Act):
     adapt(InsertCmd, ProduceAction)
 
     def __call__(self):
+        batch = context.app.tweak.etl.insert_limit
         with transaction() as connection:
             product = act(self.command.feed, self.action)
             extract_node = BuildExtractNode.__invoke__(product.meta)
@@ -684,23 +848,47 @@ class ProduceInsert(Act):
             else:
                 records = [product.data]
                 record_domain = product.meta.domain
-            for idx, record in enumerate(records):
-                if record is None:
-                    continue
-                try:
-                    row = resolve_identity(
-                            execute_insert(
-                                extract_table(
-                                    extract_node(record))))
-                except Error as exc:
-                    if extract_node.is_list:
-                        message = "While inserting record #%s" % (idx+1)
-                    else:
-                        message = "While inserting a record"
-                    quote = record_domain.dump(record)
-                    exc.wrap(message, quote)
-                    raise
-                data.append(row)
+            if not batch or batch < 2 or not extract_node.is_list:
+                for idx, record in enumerate(records):
+                    if record is None:
+                        continue
+                    try:
+                        row = resolve_identity(
+                                execute_insert(
+                                    extract_table(
+                                        extract_node(record))))
+                    except Error as exc:
+                        self.wrap(exc, idx, record, extract_node.is_list,
+                                  record_domain)
+                        raise
+                    data.append(row)
+            else:
+                # The maximum number of parameters in a single statement
+                # is limited, so make sure the batch fits.
+                width = max(len(execute_insert.input_columns),
+                            len(execute_insert.output_columns)*2, 1)
+                batch = max(1, min(batch, 32767 // width))
+                # Batches of a power of two records are inserted with
+                # a single statement.
+                batch = 1 << (batch.bit_length()-1)
+                chunk = []
+                for idx, record in enumerate(records):
+                    if record is None:
+                        continue
+                    try:
+                        row = extract_table(extract_node(record))
+                    except Error as exc:
+                        self.wrap(exc, idx, record, True, record_domain)
+                        raise
+                    chunk.append((idx, record, row))
+                    if len(chunk) >= batch:
+                        data.extend(self.flush(chunk, execute_insert,
+                                               resolve_identity,
+                                               record_domain))
+                        chunk = []
+                if chunk:
+                    data.extend(self.flush(chunk, execute_insert,
+                                           resolve_identity, record_domain))
             if not extract_node.is_list:
                 assert len(data) <= 1
                 if data:
@@ -709,4 +897,38 @@ class ProduceInsert(Act):
                     data = None
             return Product(meta, data)
 
-
+    def flush(self, chunk, execute_insert, resolve_identity, record_domain):
+        # Inserts a batch of records; if the batch fails, replays it
+        # record by record to report the offending record.
+        with transaction() as connection:
+            cursor = connection.cursor()
+            cursor.execute("SAVEPOINT htsql_insert")
+            try:
+                keys = execute_insert.batch(
+                        [row for idx, record, row in chunk])
+            except Error:
+                cursor.execute("ROLLBACK TO SAVEPOINT htsql_insert")
+                keys = []
+                for idx, record, row in chunk:
+                    try:
+                        keys.append(execute_insert(row))
+                    except Error as exc:
+                        self.wrap(exc, idx, record, True, record_domain)
+                        raise
+            cursor.execute("RELEASE SAVEPOINT htsql_insert")
+            try:
+                return resolve_identity.batch(keys)
+            except Error as exc:
+                first = chunk[0][0]+1
+                last = chunk[-1][0]+1
+                exc.wrap("While inserting records #%s-#%s" % (first, last),
+                         None)
+                raise
+
+    def wrap(self, exc, idx, record, is_list, record_domain):
+        if is_list:
+            message = "While inserting record #%s" % (idx+1)
+        else:
+            message = "While inserting a record"
+        quote = record_domain.dump(record)
+        exc.wrap(message, quote)
@@ -11,7 +11,8 @@ from ....core.entity import TableEntity, ColumnEntity
 from ....core.model import TableArc, ColumnArc, ChainArc
 from ....core.classify import localize, relabel
 from ....core.connect import transaction, scramble, unscramble
-from ....core.domain import IdentityDomain, RecordDomain, ListDomain, Product
+from ....core.domain import (IdentityDomain, RecordDomain, ListDomain,
+        BooleanDomain, Product)
 from ....core.cmd.fetch import translate
 from ....core.cmd.act import Act, ProduceAction, act
 from ....core.tr.bind import BindingState, Select
@@ -19,7 +20,7 @@ from ....core.syn.syntax import VoidSyntax
 from ....core.tr.binding import (VoidBinding, RootBinding, FormulaBinding,
         LocateBinding, SelectionBinding, SieveBinding, AliasBinding,
         CollectBinding, FreeTableRecipe, ColumnRecipe)
-from ....core.tr.signature import IsEqualSig, AndSig, PlaceholderSig
+from ....core.tr.signature import IsEqualSig, AndSig, OrSig, PlaceholderSig
 from ....core.tr.decorate import decorate
 from ....core.tr.coerce import coerce
 from ....core.tr.lookup import prescribe
@@ -82,27 +83,72 @@ class BuildExtractIdentity(Utility):
 
 class ResolveKeyPipe:
 
-    def __init__(self, name, columns, domain, pipe, with_error):
+    def __init__(self, name, columns, domain, pipe, with_error,
+                 node=None, arcs=None):
         self.name = name
         self.columns = columns
         self.pipe = pipe
         self.domain = domain
         self.leaves = domain.leaves
         self.with_error = with_error
+        self.node = node
+        self.arcs = arcs
+        self.batch_pipes = {}
 
     def __call__(self, value):
         assert value is not None
+        product = self.pipe()(self.flatten(value))
+        data = product.data
+        assert len(data) <= 1
+        if data:
+            return data[0]
+        return self.fail(value)
+
+    def batch(self, values):
+        # Resolves a batch of identities with a single query; returns
+        # the keys in the order of the input identities.
+        if len(values) <= 1 or self.node is None:
+            return [self(value) for value in values]
+        # Queries are only prepared for a power of two identities, so
+        # the list of identities is padded by repeating the last one.
+        size = 1 << (len(values)-1).bit_length()
+        pipe = self.batch_pipes.get(size)
+        if pipe is None:
+            pipe = BuildResolveKeyBatch.__invoke__(
+                    self.node, self.arcs, size)
+            self.batch_pipes[size] = pipe
+        raw_rows = []
+        parameters = []
+        for value in values:
+            assert value is not None
+            raw_values = self.flatten(value)
+            raw_rows.append(tuple(raw_values))
+            parameters.extend(raw_values)
+        for idx in range(size-len(values)):
+            parameters.extend(raw_rows[-1])
+        product = pipe()(parameters)
+        width = len(self.columns)
+        key_by_identity = {}
+        for record in product.data:
+            key_by_identity[tuple(record[width:])] = tuple(record[:width])
+        data = []
+        for value, raw_values in zip(values, raw_rows):
+            if raw_values in key_by_identity:
+                data.append(key_by_identity[raw_values])
+            else:
+                data.append(self.fail(value))
+        return data
+
+    def flatten(self, value):
         raw_values = []
         for leaf in self.leaves:
             raw_value = value
             for idx in leaf:
                 raw_value = raw_value[idx]
             raw_values.append(raw_value)
-        product = self.pipe()(raw_values)
-        data = product.data
-        assert len(data) <= 1
-        if data:
-            return data[0]
+        return raw_values
+
+    def fail(self, value):
         if self.with_error:
             quote = None
             if self.name:
@@ -113,6 +159,67 @@ class ResolveKeyPipe:
         return None
 
 
+def bind_identity(state, scope, node, arcs, syntax):
+    # Generates a placeholder for each leaf of the table identity;
+    # returns pairs of placeholders and leaf bindings, and the
+    # identity domain.
+    column_by_link = {}
+    if arcs is not None:
+        for arc in arcs:
+            if isinstance(arc, ColumnArc) and arc.link is not None:
+                column_by_link[arc.link] = arc
+    identity_arcs = localize(node)
+    if identity_arcs is None:
+        raise Error("Expected a table with identity")
+    count = itertools.count()
+    def chain_arc(arc, scope):
+        images = []
+        recipe = prescribe(arc, scope)
+        binding = state.use(recipe, syntax, scope=scope)
+        identity_arcs = localize(arc.target)
+        if identity_arcs:
+            fields = []
+            for identity_arc in identity_arcs:
+                arc_images, arc_field = chain_arc(identity_arc, binding)
+                images.extend(arc_images)
+                fields.append(arc_field)
+            field = IdentityDomain(fields)
+        else:
+            item = FormulaBinding(scope,
+                                  PlaceholderSig(next(count)),
+                                  binding.domain,
+                                  syntax)
+            images.append((item, binding))
+            field = binding.domain
+        return images, field
+    images = []
+    fields = []
+    for arc in identity_arcs:
+        if arc in column_by_link:
+            arc = column_by_link[arc]
+        arc_images, arc_field = chain_arc(arc, scope)
+        images.extend(arc_images)
+        fields.append(arc_field)
+    return images, IdentityDomain(fields)
+
+
+def get_key_columns(table):
+    columns = []
+    if table.primary_key is not None:
+        columns = table.primary_key.origin_columns
+    else:
+        for key in table.unique_keys:
+            if key.is_partial:
+                continue
+            if all(not column.is_nullable
+                   for column in key.origin_columns):
+                rcolumns = key.origin_columns
+                break
+    if not columns:
+        raise Error("Table does not have a primary key")
+    return columns
+
+
 class BuildResolveKey(Utility):
 
     def __init__(self, node, arcs, with_error=True):
@@ -128,59 +235,11 @@ class BuildResolveKey(Utility):
         scope = RootBinding(syntax)
         state = BindingState(scope)
         seed = state.use(FreeTableRecipe(self.table), syntax)
-        column_by_link = {}
-        if self.arcs is not None:
-            for arc in self.arcs:
-                if isinstance(arc, ColumnArc) and arc.link is not None:
-                    column_by_link[arc.link] = arc
-        identity_arcs = localize(self.node)
-        if identity_arcs is None:
-            raise Error("Expected a table with identity")
-        count = itertools.count()
-        def chain_arc(arc, scope):
-            images = []
-            recipe = prescribe(arc, scope)
-            binding = state.use(recipe, syntax, scope=scope)
-            identity_arcs = localize(arc.target)
-            if identity_arcs:
-                fields = []
-                for identity_arc in identity_arcs:
-                    arc_images, arc_field = chain_arc(identity_arc, binding)
-                    images.extend(arc_images)
-                    fields.append(arc_field)
-                field = IdentityDomain(fields)
-            else:
-                item = FormulaBinding(scope,
-                                      PlaceholderSig(next(count)),
-                                      binding.domain,
-                                      syntax)
-                images.append((item, binding))
-                field = binding.domain
-            return images, field
-        images = []
-        fields = []
-        for arc in identity_arcs:
-            if arc in column_by_link:
-                arc = column_by_link[arc]
-            arc_images, arc_field = chain_arc(arc, seed)
-            images.extend(arc_images)
-            fields.append(arc_field)
-        identity_domain = IdentityDomain(fields)
+        images, identity_domain = bind_identity(state, seed, self.node,
+                                                self.arcs, syntax)
         scope = LocateBinding(scope, seed, images, None, syntax)
         state.push_scope(scope)
-        columns = []
-        if self.table.primary_key is not None:
-            columns = self.table.primary_key.origin_columns
-        else:
-            for key in self.table.unique_keys:
-                if key.is_partial:
-                    continue
-                if all(not column.is_nullable
-                       for column in key.origin_columns):
-                    rcolumns = key.origin_columns
-                    break
-        if not columns:
-            raise Error("Table does not have a primary key")
+        columns = get_key_columns(self.table)
         elements = []
         for column in columns:
             binding = state.use(ColumnRecipe(column), syntax)
@@ -193,7 +252,81 @@ class BuildResolveKey(Utility):
         binding = CollectBinding(state.root, binding, domain, syntax)
         pipe =  translate(binding)
         return ResolveKeyPipe(name, columns, identity_domain, pipe,
-                              self.with_error)
+                              self.with_error, self.node, self.arcs)
+
+
+class BuildResolveKeyBatch(Utility):
+    # Builds a query that fetches keys of `size` records together with
+    # their identities:
+    #   /table{key1, key2, ..., leaf1, leaf2, ...}
+    #       ?(leaf1=$1&leaf2=$2)|(leaf1=$3&leaf2=$4)|...
+
+    def __init__(self, node, arcs, size):
+        assert isinstance(size, int) and size > 0
+        self.node = node
+        self.arcs = arcs
+        self.table = node.table
+        self.size = size
+
+    def __call__(self):
+        syntax = VoidSyntax()
+        scope = RootBinding(syntax)
+        state = BindingState(scope)
+        seed = state.use(FreeTableRecipe(self.table), syntax)
+        state.push_scope(seed)
+        images, identity_domain = bind_identity(state, seed, self.node,
+                                                self.arcs, syntax)
+        conditions = []
+        for idx in range(self.size):
+            row_conditions = []
+            for image_idx, (item, binding) in enumerate(images):
+                placeholder = FormulaBinding(
+                        seed,
+                        PlaceholderSig(idx*len(images)+image_idx),
+                        binding.domain,
+                        syntax)
+                row_conditions.append(
+                        FormulaBinding(seed,
+                                       IsEqualSig(+1),
+                                       coerce(BooleanDomain()),
+                                       syntax,
+                                       lop=binding,
+                                       rop=placeholder))
+            if len(row_conditions) == 1:
+                [condition] = row_conditions
+            else:
+                condition = FormulaBinding(seed,
+                                           AndSig(),
+                                           coerce(BooleanDomain()),
+                                           syntax,
+                                           ops=row_conditions)
+            conditions.append(condition)
+        if len(conditions) == 1:
+            [condition] = conditions
+        else:
+            condition = FormulaBinding(seed,
+                                       OrSig(),
+                                       coerce(BooleanDomain()),
+                                       syntax,
+                                       ops=conditions)
+        scope = SieveBinding(seed, condition, syntax)
+        state.push_scope(scope)
+        # The identity is bound once again to be selected from the
+        # filtered table.
+        images, identity_domain = bind_identity(state, scope, self.node,
+                                                self.arcs, syntax)
+        elements = []
+        for column in get_key_columns(self.table):
+            elements.append(state.use(ColumnRecipe(column), syntax))
+        for item, binding in images:
+            elements.append(binding)
+        fields = [decorate(element) for element in elements]
+        domain = RecordDomain(fields)
+        scope = SelectionBinding(scope, elements, domain, syntax)
+        binding = Select.__invoke__(scope, state)
+        domain = ListDomain(binding.domain)
+        binding = CollectBinding(state.root, binding, domain, syntax)
+        return translate(binding)
 
 
 class ExecuteUpdatePipe:
@@ -216,6 +349,7 @@ class ExecuteUpdatePipe:
                              for column in key_columns]
         self.output_converts = [unscramble(column.domain)
                                 for column in output_columns]
+        self.batch_sql = {}
 
     def __call__(self, key_row, row):
         key_row = tuple(convert(item)
@@ -235,6 +369,61 @@ class ExecuteUpdatePipe:
             [row] = rows
         return row
 
+    def batch(self, key_rows, rows):
+        # Updates a batch of records with multi-row statements; returns
+        # the new keys of the records.
+        if len(rows) <= 1 or not self.input_columns:
+            return [self(key_row, row)
+                    for key_row, row in zip(key_rows, rows)]
+        # Only statements for a power of two rows are prepared, so that
+        # the number of distinct statements stays small.
+        keys = []
+        start = 0
+        while start < len(rows):
+            size = 1 << ((len(rows)-start).bit_length()-1)
+            keys.extend(self.update_many(key_rows[start:start+size],
+                                         rows[start:start+size]))
+            start += size
+        return keys
+
+    def update_many(self, key_rows, rows):
+        if len(rows) == 1:
+            return [self(key_rows[0], rows[0])]
+        sql = self.batch_sql.get(len(rows))
+        if sql is None:
+            sql = serialize_update(self.table, self.input_columns,
+                                   self.key_columns, None, len(rows))
+            self.batch_sql[len(rows)] = sql
+        # The key columns could be updated too, so the new key is made
+        # of the assigned values and of the old key.
+        output_indexes = []
+        for column in self.output_columns:
+            if column in self.input_columns:
+                output_indexes.append(
+                        (True, self.input_columns.index(column)))
+            else:
+                output_indexes.append(
+                        (False, self.key_columns.index(column)))
+        keys = []
+        parameters = []
+        for key_row, row in zip(key_rows, rows):
+            key_row = tuple(convert(item)
+                            for item, convert
+                                    in zip(key_row, self.key_converts))
+            row = tuple(convert(item)
+                        for item, convert in zip(row, self.input_converts))
+            keys.append(tuple(row[index] if is_input else key_row[index]
+                              for is_input, index in output_indexes))
+            parameters.extend(row+key_row)
+        if not context.env.can_write:
+            raise PermissionError("No write permissions")
+        with transaction() as connection:
+            cursor = connection.cursor()
+            cursor.execute(sql, parameters)
+            if cursor.rowcount != len(rows):
+                raise Error("Unable to locate the updated row")
+        return keys
+
 
 class BuildExecuteUpdate(Utility):
 
@@ -11,13 +11,16 @@ from ....core.tr.dump import SerializingState, DumpBase
 
 class SerializeInsert(Utility, DumpBase):
 
-    def __init__(self, table, columns, returning_columns):
+    def __init__(self, table, columns, returning_columns, count=1):
         assert isinstance(table, TableEntity)
         assert isinstance(columns, listof(ColumnEntity))
         assert isinstance(returning_columns, maybe(listof(ColumnEntity)))
+        assert isinstance(count, int) and count >= 1
+        assert count == 1 or columns
         self.table = table
         self.columns = columns
         self.returning_columns = returning_columns
+        self.count = count
         self.state = SerializingState()
         self.stream = self.state.stream
 
@@ -55,12 +58,19 @@ class SerializeInsert(Utility, DumpBase):
 
     def dump_values(self):
         self.newline()
-        self.write("VALUES (")
-        for idx, column in enumerate(self.columns):
-            self.format("{index:placeholder}", index=None)
-            if idx < len(self.columns)-1:
-                self.write(", ")
-        self.write(")")
+        self.write("VALUES ")
+        self.indent()
+        for row_idx in range(self.count):
+            if row_idx > 0:
+                self.write(",")
+                self.newline()
+            self.write("(")
+            for idx, column in enumerate(self.columns):
+                self.format("{index:placeholder}", index=None)
+                if idx < len(self.columns)-1:
+                    self.write(", ")
+            self.write(")")
+        self.dedent()
 
     def dump_no_values(self):
         self.newline()
@@ -77,15 +87,21 @@ class SerializeInsert(Utility, DumpBase):
 
 class SerializeUpdate(Utility, DumpBase):
 
-    def __init__(self, table, columns, key_columns, returning_columns):
+    def __init__(self, table, columns, key_columns, returning_columns,
+                 count=1):
         assert isinstance(table, TableEntity)
         assert isinstance(columns, listof(ColumnEntity))
         assert isinstance(key_columns, listof(ColumnEntity))
         assert isinstance(returning_columns, maybe(listof(ColumnEntity)))
+        assert isinstance(count, int) and count >= 1
+        assert count == 1 or (columns and key_columns)
         self.table = table
         self.columns = columns
         self.key_columns = key_columns
         self.returning_columns = returning_columns
+        self.count = count
+        # The name of the list of values when updating several rows.
+        self.alias = "values" if table.name != "values" else "values_"
         self.state = SerializingState()
         self.stream = self.state.stream
 
@@ -93,21 +109,27 @@ class SerializeUpdate(Utility, DumpBase):
         self.dump_update()
         if self.columns:
             self.dump_columns()
+        if self.count > 1:
+            self.dump_values()
         if self.key_columns:
             self.dump_keys()
         if self.returning_columns:
             self.dump_returning()
         return self.stream.flush()
 
-    def dump_update(self):
+    def dump_table(self):
         if self.table.schema.name:
-            self.format("UPDATE {schema:name}.{table:name}",
+            self.format("{schema:name}.{table:name}",
                         schema=self.table.schema.name,
                         table=self.table.name)
         else:
-            self.format("UPDATE {table:name}",
+            self.format("{table:name}",
                         table=self.table.name)
 
+    def dump_update(self):
+        self.write("UPDATE ")
+        self.dump_table()
+
     def dump_columns(self):
         self.newline()
         self.write("SET ")
@@ -115,20 +137,57 @@ class SerializeUpdate(Utility, DumpBase):
         for idx, column in enumerate(self.columns):
             if idx > 0:
                 self.newline()
-            self.format("{column:name} = {index:placeholder}",
-                        column=column.name, index=None)
+            if self.count > 1:
+                self.format("{column:name} = {alias:name}.{value:name}",
+                            column=column.name, alias=self.alias,
+                            value="column%s" % (idx+1))
+            else:
+                self.format("{column:name} = {index:placeholder}",
+                            column=column.name, index=None)
             if idx < len(self.columns)-1:
                 self.write(",")
         self.dedent()
 
+    def dump_values(self):
+        # The first row has no matching record; it makes the values take
+        # the types of the respective columns.
+        self.newline()
+        self.write("FROM (VALUES ")
+        self.indent()
+        self.write("(")
+        for idx, column in enumerate(self.columns+self.key_columns):
+            if idx > 0:
+                self.write(", ")
+            self.format("(SELECT {column:name} FROM ", column=column.name)
+            self.dump_table()
+            self.write(" WHERE FALSE)")
+        self.write(")")
+        for row_idx in range(self.count):
+            self.write(",")
+            self.newline()
+            self.write("(")
+            for idx in range(len(self.columns)+len(self.key_columns)):
+                if idx > 0:
+                    self.write(", ")
+                self.format("{index:placeholder}", index=None)
+            self.write(")")
+        self.dedent()
+        self.format(") AS {alias:name}", alias=self.alias)
+
     def dump_keys(self):
         self.newline()
         self.write("WHERE ")
         for idx, column in enumerate(self.key_columns):
             if idx > 0:
                 self.write(" AND ")
-            self.format("{column:name} = {index:placeholder}",
-                        column=column.name, index=None)
+            if self.count > 1:
+                self.dump_table()
+                self.format(".{column:name} = {alias:name}.{value:name}",
+                            column=column.name, alias=self.alias,
+                            value="column%s" % (len(self.columns)+idx+1))
+            else:
+                self.format("{column:name} = {index:placeholder}",
+                            column=column.name, index=None)
 
     def dump_returning(self):
         self.newline()
@@ -141,11 +200,14 @@ class SerializeUpdate(Utility, DumpBase):
 
 class SerializeDelete(Utility, DumpBase):
 
-    def __init__(self, table, key_columns):
+    def __init__(self, table, key_columns, count=1):
         assert isinstance(table, TableEntity)
         assert isinstance(key_columns, listof(ColumnEntity))
+        assert isinstance(count, int) and count >= 1
+        assert count == 1 or key_columns
         self.table = table
         self.key_columns = key_columns
+        self.count = count
         self.state = SerializingState()
         self.stream = self.state.stream
 
@@ -167,11 +229,30 @@ class SerializeDelete(Utility, DumpBase):
     def dump_keys(self):
         self.newline()
         self.write("WHERE ")
-        for idx, column in enumerate(self.key_columns):
-            if idx > 0:
-                self.write(" AND ")
-            self.format("{column:name} = {index:placeholder}",
-                        column=column.name, index=None)
+        if self.count > 1 and len(self.key_columns) == 1:
+            [column] = self.key_columns
+            self.format("{column:name} IN (", column=column.name)
+            for row_idx in range(self.count):
+                if row_idx > 0:
+                    self.write(", ")
+                self.format("{index:placeholder}", index=None)
+            self.write(")")
+            return
+        self.indent()
+        for row_idx in range(self.count):
+            if row_idx > 0:
+                self.write(" OR")
+                self.newline()
+            if self.count > 1:
+                self.write("(")
+            for idx, column in enumerate(self.key_columns):
+                if idx > 0:
+                    self.write(" AND ")
+                self.format("{column:name} = {index:placeholder}",
+                            column=column.name, index=None)
+            if self.count > 1:
+                self.write(")")
+        self.dedent()
 
 
 class SerializeTruncate(Utility, DumpBase):
@@ -195,17 +276,18 @@ class SerializeTruncate(Utility, DumpBase):
         return self.stream.flush()
 
 
-def serialize_insert(table, columns, returning_columns):
-    return SerializeInsert.__invoke__(table, columns, returning_columns)
+def serialize_insert(table, columns, returning_columns, count=1):
+    return SerializeInsert.__invoke__(table, columns, returning_columns, count)
 
 
-def serialize_update(table, columns, key_columns, returning_columns):
+def serialize_update(table, columns, key_columns, returning_columns,
+                     count=1):
     return SerializeUpdate.__invoke__(table, columns, key_columns,
-                                      returning_columns)
+                                      returning_columns, count)
 
 
-def serialize_delete(table, key_columns):
-    return SerializeDelete.__invoke__(table, key_columns)
+def serialize_delete(table, key_columns, count=1):
+    return SerializeDelete.__invoke__(table, key_columns, count)
 
 
 def serialize_truncate(table):
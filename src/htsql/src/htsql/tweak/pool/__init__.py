@@ -4,8 +4,9 @@
 
 
 from . import connect
-from ...core.addon import Addon
-import threading
+from .connect import ConnectionPool
+from ...core.addon import Addon, Parameter
+from ...core.validator import UIntVal, PIntVal, FloatVal, StrVal
 
 
 class TweakPoolAddon(Addon):
@@ -15,11 +16,52 @@ class TweakPoolAddon(Addon):
     help = """
     This addon caches database connections so that a single
     connection could be used to execute more than one query.
+
+    Parameter `max_size` limits the number of open connections;
+    when all of them are busy, a request waits up to `timeout`
+    seconds for a connection to be released.
+
+    Connections idle for longer than `idle_timeout` seconds are
+    closed, but at least `min_size` idle connections are kept.
+    Connections are also recycled after `max_lifetime` seconds
+    or after `max_usage` requests.
+
+    Set parameter `ping` to a query to validate idle connections
+    before reusing them.
     """
 
+    parameters = [
+            Parameter('min_size', UIntVal(), default=0,
+                      value_name="N",
+                      hint="""min. number of idle connections"""),
+            Parameter('max_size', PIntVal(is_nullable=True),
+                      value_name="N",
+                      hint="""max. number of open connections"""),
+            Parameter('timeout', FloatVal(0.0, is_nullable=True),
+                      value_name="SEC",
+                      hint="""max. time to wait for a connection"""),
+            Parameter('idle_timeout', FloatVal(0.0, is_nullable=True),
+                      value_name="SEC",
+                      hint="""close connections idle for this long"""),
+            Parameter('max_lifetime', FloatVal(0.0, is_nullable=True),
+                      value_name="SEC",
+                      hint="""close connections open for this long"""),
+            Parameter('max_usage', PIntVal(is_nullable=True),
+                      value_name="N",
+                      hint="""close connections after this many uses"""),
+            Parameter('ping', StrVal(is_nullable=True),
+                      value_name="SQL",
+                      hint="""query to validate idle connections"""),
+    ]
+
     def __init__(self, app, attributes):
         super(TweakPoolAddon, self).__init__(app, attributes)
-        self.lock = threading.Lock()
-        self.items = []
+        self.pool = ConnectionPool(min_size=self.min_size,
+                                   max_size=self.max_size,
+                                   timeout=self.timeout,
+                                   idle_timeout=self.idle_timeout,
+                                   max_lifetime=self.max_lifetime,
+                                   max_usage=self.max_usage,
+                                   ping=self.ping)
 
 
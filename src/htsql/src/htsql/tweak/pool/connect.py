@@ -5,7 +5,263 @@
 
 from ...core.adapter import rank
 from ...core.context import context
-from ...core.connect import Connect
+from ...core.connect import Connect, ConnectionProxy, DBErrorGuard
+from ...core.error import EngineError
+import collections
+import threading
+import time
+
+
+class PoolConnectionProxy(ConnectionProxy):
+    """
+    A connection proxy that returns itself to the pool when released.
+
+    `pool` (:class:`ConnectionPool`)
+        The pool that owns the connection.
+    """
+
+    def __init__(self, connection, guard, pool):
+        super(PoolConnectionProxy, self).__init__(connection, guard)
+        self.pool = pool
+        self.created = time.time()
+        self.returned = self.created
+        self.usage = 1
+
+    def close(self):
+        # A connection closed while checked out gives up its slot
+        # in the pool instead of being returned to it.
+        if self.is_busy:
+            self.is_busy = False
+            self.pool.remove(self)
+        return super(PoolConnectionProxy, self).close()
+
+    def release(self):
+        if not self.is_busy and not self.is_valid:
+            # Already closed and removed from the pool.
+            return
+        super(PoolConnectionProxy, self).release()
+        self.pool.put(self)
+
+
+class ConnectionPool:
+    """
+    A bounded pool of database connections.
+
+    `min_size` (integer)
+        The number of idle connections kept open regardless of
+        `idle_timeout`.
+
+    `max_size` (integer or ``None``)
+        The maximum number of open connections; ``None`` means
+        no limit.
+
+    `timeout` (float or ``None``)
+        How long to wait for a connection when the pool is exhausted;
+        ``None`` means wait indefinitely.
+
+    `idle_timeout` (float or ``None``)
+        Close connections that stayed idle longer than this.
+
+    `max_lifetime` (float or ``None``)
+        Close connections that have been open longer than this.
+
+    `max_usage` (integer or ``None``)
+        Close connections that have been checked out this many times.
+
+    `ping` (string or ``None``)
+        A query executed to validate an idle connection before
+        handing it out.
+    """
+
+    def __init__(self, min_size=0, max_size=None, timeout=None,
+                 idle_timeout=None, max_lifetime=None, max_usage=None,
+                 ping=None):
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.max_lifetime = max_lifetime
+        self.max_usage = max_usage
+        self.ping = ping
+        self.condition = threading.Condition(threading.Lock())
+        # Idle connections; the most recently returned go last.
+        self.idle = collections.deque()
+        # Number of open connections, both idle and busy.
+        self.size = 0
+        # Number of connections being opened right now.
+        self.pending = 0
+        self.created = 0
+        self.closed = 0
+        self.checkouts = 0
+        self.waits = 0
+        self.wait_time = 0.0
+        self.max_wait_time = 0.0
+        self.timeouts = 0
+
+    def is_expired(self, connection, now):
+        # Checks if the connection should be closed instead of reused.
+        if not connection.is_valid:
+            return True
+        if (self.max_lifetime is not None and
+                now - connection.created >= self.max_lifetime):
+            return True
+        if (self.max_usage is not None and
+                connection.usage >= self.max_usage):
+            return True
+        return False
+
+    def get(self, open):
+        """
+        Returns an idle connection or opens a new one using `open()`.
+
+        Blocks while the pool is exhausted; raises :exc:`EngineError`
+        when no connection becomes available within `timeout`.
+        """
+        discarded = []
+        start = time.time()
+        has_waited = False
+        try:
+            with self.condition:
+                while True:
+                    now = time.time()
+                    self.expire(now, discarded)
+                    while self.idle:
+                        connection = self.idle.pop()
+                        if self.is_expired(connection, now):
+                            self.discard(connection, discarded)
+                            continue
+                        connection.acquire()
+                        connection.usage += 1
+                        break
+                    else:
+                        connection = None
+                    if connection is not None:
+                        break
+                    if (self.max_size is None or
+                            self.size + self.pending < self.max_size):
+                        self.pending += 1
+                        break
+                    if not has_waited:
+                        has_waited = True
+                        self.waits += 1
+                    remaining = None
+                    if self.timeout is not None:
+                        remaining = self.timeout-(now-start)
+                        if remaining <= 0:
+                            self.timeouts += 1
+                            raise EngineError("Timed out waiting for"
+                                              " a database connection")
+                    self.condition.wait(remaining)
+                if has_waited:
+                    delay = time.time()-start
+                    self.wait_time += delay
+                    self.max_wait_time = max(self.max_wait_time, delay)
+                self.checkouts += 1
+        finally:
+            self.close(discarded)
+        if connection is not None:
+            if self.ping is None or self.validate(connection):
+                return connection
+            connection.invalidate()
+            with self.condition:
+                self.discard(connection, discarded)
+                self.pending += 1
+            self.close(discarded)
+        # Open a new connection in place of the reserved slot.
+        try:
+            connection = open(self)
+        except:
+            with self.condition:
+                self.pending -= 1
+                self.condition.notify()
+            raise
+        with self.condition:
+            self.pending -= 1
+            self.size += 1
+            self.created += 1
+        return connection
+
+    def put(self, connection):
+        """
+        Returns a released connection to the pool.
+        """
+        discarded = []
+        with self.condition:
+            now = time.time()
+            if self.is_expired(connection, now):
+                self.discard(connection, discarded)
+            else:
+                connection.returned = now
+                self.idle.append(connection)
+            self.expire(now, discarded)
+            self.condition.notify()
+        self.close(discarded)
+
+    def expire(self, now, discarded):
+        # Evicts connections idle for longer than `idle_timeout`,
+        # starting from the least recently used ones.
+        if self.idle_timeout is None:
+            return
+        while (len(self.idle) > self.min_size and
+               now - self.idle[0].returned >= self.idle_timeout):
+            self.discard(self.idle.popleft(), discarded)
+
+    def remove(self, connection):
+        """
+        Forgets a checked out connection that was closed by its user.
+        """
+        with self.condition:
+            self.size -= 1
+            self.closed += 1
+            self.condition.notify()
+
+    def discard(self, connection, discarded):
+        # Forgets the connection; it is closed outside the lock.
+        connection.is_busy = False
+        self.size -= 1
+        self.closed += 1
+        discarded.append(connection)
+        self.condition.notify()
+
+    def close(self, discarded):
+        # Closes discarded connections ignoring any errors.
+        while discarded:
+            connection = discarded.pop()
+            try:
+                connection.close()
+            except EngineError:
+                pass
+
+    def validate(self, connection):
+        # Checks that an idle connection is still usable.
+        try:
+            cursor = connection.cursor()
+            cursor.execute(self.ping)
+            cursor.fetchall()
+            cursor.close()
+            connection.rollback()
+        except EngineError:
+            return False
+        return True
+
+    def stats(self):
+        """
+        Returns a dictionary with pool utilisation statistics.
+        """
+        with self.condition:
+            return {
+                'size': self.size,
+                'idle': len(self.idle),
+                'busy': self.size-len(self.idle),
+                'max_size': self.max_size,
+                'created': self.created,
+                'closed': self.closed,
+                'checkouts': self.checkouts,
+                'waits': self.waits,
+                'wait_time': self.wait_time,
+                'max_wait_time': self.max_wait_time,
+                'timeouts': self.timeouts,
+            }
 
 
 class PoolConnect(Connect):
@@ -15,17 +271,13 @@ class PoolConnect(Connect):
     def __call__(self):
         if self.with_autocommit:
             return super(PoolConnect, self).__call__()
-        addon = context.app.tweak.pool
-        with addon.lock:
-            for connection in addon.items[:]:
-                if not connection.is_valid:
-                    addon.items.remove(connection)
-            for connection in addon.items:
-                if not connection.is_busy:
-                    connection.acquire()
-                    return connection
-            connection = super(PoolConnect, self).__call__()
-            addon.items.append(connection)
-            return connection
+        pool = context.app.tweak.pool.pool
+        return pool.get(self.open_proxy)
+
+    def open_proxy(self, pool):
+        guard = DBErrorGuard()
+        with guard:
+            connection = self.open()
+        return PoolConnectionProxy(connection, guard, pool)
 
 
@@ -0,0 +1,50 @@
+#
+# Copyright (c) 2006-2013, Prometheus Research, LLC
+#
+
+
+from . import introspect
+from ...core.addon import Addon, Parameter, addon_registry
+from ...core.validator import StrVal
+
+
+class TweakSnapshotAddon(Addon):
+
+    name = 'tweak.snapshot'
+    hint = """cache database metadata between restarts"""
+    help = """
+    This addon saves the introspected database metadata to a file
+    and reuses it when the application is created again, as long as
+    the database schema has not changed.
+
+    Parameter `cache-dir` specifies the directory where the metadata
+    is stored.  The directory must not be writable by untrusted users.
+
+    Only the catalog produced by the database introspector is saved.
+    Addons that read the database on their own, such as `rex_deploy`,
+    which loads table and column comments when the metadata is
+    classified, still query the database on every start.
+
+    Currently, only PostgreSQL backend is supported.
+    """
+
+    parameters = [
+            Parameter('cache_dir', StrVal(),
+                      value_name="DIR",
+                      hint="""directory for metadata snapshots"""),
+    ]
+
+    @classmethod
+    def get_extension(cls, app, attributes):
+        if app.htsql.db is not None:
+            name = '%s.%s' % (cls.name, app.htsql.db.engine)
+            if name not in addon_registry:
+                raise ImportError("%s is not implemented for %s"
+                                  % (cls.name, app.htsql.db.engine))
+            return name
+
+    def validate(self):
+        if self.cache_dir is None:
+            raise ValueError("cache-dir is not specified")
+
+
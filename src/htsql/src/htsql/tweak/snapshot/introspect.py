@@ -0,0 +1,160 @@
+#
+# Copyright (c) 2006-2013, Prometheus Research, LLC
+#
+
+
+from ... import __version__
+from ...core.context import context
+from ...core.adapter import Utility, rank
+from ...core.introspect import Introspect
+from ...core.entity import make_catalog
+import hashlib
+import os
+import os.path
+import pickle
+import tempfile
+
+
+class Fingerprint(Utility):
+    """
+    Generates a string that changes whenever the database schema changes.
+    """
+
+    def __call__(self):
+        # Override in implementations.
+        raise NotImplementedError()
+
+
+def dump_catalog(catalog):
+    # Converts the catalog to a structure of lists and tuples.
+    data = []
+    foreign_key_index = {}
+    for schema in catalog:
+        tables = []
+        for table in schema:
+            columns = [(column.name, column.domain,
+                        column.is_nullable, column.has_default)
+                       for column in table.columns]
+            unique_keys = [([column.name
+                             for column in unique_key.origin_columns],
+                            unique_key.is_primary, unique_key.is_partial)
+                           for unique_key in table.unique_keys]
+            foreign_keys = []
+            for foreign_key in table.foreign_keys:
+                foreign_key_index[id(foreign_key)] = len(foreign_key_index)
+                foreign_keys.append(([column.name
+                                      for column in foreign_key.origin_columns],
+                                     foreign_key.target.schema.name,
+                                     foreign_key.target.name,
+                                     [column.name
+                                      for column in foreign_key.target_columns],
+                                     foreign_key.is_partial))
+            tables.append([table.name, columns, unique_keys, foreign_keys])
+        data.append((schema.name, schema.priority, tables))
+    # The order of links to a table may differ from the order in which
+    # the foreign keys are added, so save it too.
+    for schema, (name, priority, tables) in zip(catalog, data):
+        for table, table_data in zip(schema, tables):
+            table_data.append([foreign_key_index[id(foreign_key)]
+                               for foreign_key
+                                    in table.referring_foreign_keys])
+    return data
+
+
+def load_catalog(data):
+    # Restores the catalog saved with `dump_catalog()`.
+    catalog = make_catalog()
+    for schema_name, priority, tables in data:
+        schema = catalog.add_schema(schema_name, priority)
+        for table_name, columns, unique_keys, foreign_keys, referring in tables:
+            table = schema.add_table(table_name)
+            for name, domain, is_nullable, has_default in columns:
+                table.add_column(name, domain, is_nullable, has_default)
+    all_foreign_keys = []
+    for schema_name, priority, tables in data:
+        schema = catalog[schema_name]
+        for table_name, columns, unique_keys, foreign_keys, referring in tables:
+            table = schema[table_name]
+            for names, is_primary, is_partial in unique_keys:
+                table.add_unique_key([table[name] for name in names],
+                                     is_primary, is_partial)
+            for (names, target_schema_name, target_name,
+                    target_names, is_partial) in foreign_keys:
+                target = catalog[target_schema_name][target_name]
+                foreign_key = table.add_foreign_key(
+                        [table[name] for name in names],
+                        target,
+                        [target[name] for name in target_names],
+                        is_partial)
+                all_foreign_keys.append(foreign_key)
+    for schema_name, priority, tables in data:
+        schema = catalog[schema_name]
+        for table_name, columns, unique_keys, foreign_keys, referring in tables:
+            schema[table_name].referring_foreign_keys[:] = \
+                    [all_foreign_keys[index] for index in referring]
+    return catalog
+
+
+class SnapshotIntrospect(Introspect):
+
+    rank(1.0)
+
+    def __call__(self):
+        addon = context.app.tweak.snapshot
+        fingerprint = Fingerprint.__invoke__()
+        if fingerprint is None:
+            return super(SnapshotIntrospect, self).__call__()
+        # The snapshot depends on the database and the set of addons,
+        # which may affect introspection.
+        db = context.app.htsql.db
+        identity = repr((db.engine, db.username, db.host, db.port,
+                         db.database,
+                         [other.name for other in context.app.addons]))
+        digest = hashlib.sha1(identity.encode('utf-8')).hexdigest()
+        path = os.path.join(addon.cache_dir, "htsql-%s.snapshot" % digest)
+        key = (__version__, fingerprint)
+        catalog = self.load(path, key)
+        if catalog is None:
+            catalog = super(SnapshotIntrospect, self).__call__()
+            self.save(path, key, catalog)
+        return catalog
+
+    def load(self, path, key):
+        # Returns the saved catalog if the snapshot is up to date.
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'rb') as stream:
+                snapshot_key, data = pickle.load(stream)
+            if snapshot_key != key:
+                return None
+            return load_catalog(data)
+        except Exception:
+            # A damaged or an incompatible snapshot; introspect
+            # the database and overwrite it.
+            return None
+
+    def save(self, path, key, catalog):
+        # Writes the snapshot; the file is replaced atomically so that
+        # concurrent processes never see a partially written snapshot.
+        data = dump_catalog(catalog)
+        directory = os.path.dirname(path)
+        temporary_path = None
+        try:
+            if not os.path.exists(directory):
+                os.makedirs(directory)
+            fd, temporary_path = tempfile.mkstemp(
+                    prefix=".htsql-", suffix=".snapshot", dir=directory)
+            with os.fdopen(fd, 'wb') as stream:
+                pickle.dump((key, data), stream, pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary_path, path)
+            temporary_path = None
+        except Exception:
+            # Caching is optional; keep using the introspected catalog
+            # if the snapshot cannot be written.
+            pass
+        finally:
+            if temporary_path is not None and os.path.exists(temporary_path):
+                os.unlink(temporary_path)
+
+
@@ -6,8 +6,9 @@
 from htsql.core.adapter import adapt
 from htsql.core.domain import TextDomain, EnumDomain
 from htsql.core.connect import (Connect, UnscrambleError, Unscramble,
-        Scramble)
+        Scramble, OpenStreamCursor, CursorProxy)
 from htsql.core.context import context
+import itertools
 import psycopg2, psycopg2.extensions
 
 
@@ -51,6 +52,21 @@ class ConnectPGSQL(Connect):
         return connection
 
 
+class OpenStreamCursorPGSQL(OpenStreamCursor):
+
+    counter = itertools.count(1)
+
+    def __call__(self):
+        # A named cursor is declared on the server; rows are transferred
+        # only when fetched.  It must be used inside a transaction.
+        if self.connection.connection.autocommit:
+            return super(OpenStreamCursorPGSQL, self).__call__()
+        name = "htsql_stream_%s" % next(self.counter)
+        with self.connection.guard:
+            cursor = self.connection.connection.cursor(name)
+            return CursorProxy(cursor, self.connection.guard)
+
+
 class UnscramblePGSQLError(UnscrambleError):
 
     def __call__(self):
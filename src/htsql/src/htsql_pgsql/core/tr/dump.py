@@ -19,6 +19,8 @@ class PGSQLFormatLiteral(FormatLiteral):
 
     def __call__(self):
         value = self.value.replace("'", "''")
+        if self.state.with_placeholders:
+            value = value.replace("%", "%%")
         if "\\" in value:
             value = value.replace("\\", "\\\\")
             self.stream.write("E'%s'" % value)
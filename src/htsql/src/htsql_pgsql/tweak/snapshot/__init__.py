@@ -0,0 +1,16 @@
+#
+# Copyright (c) 2006-2013, Prometheus Research, LLC
+#
+
+
+from . import introspect
+from htsql.core.addon import Addon
+
+
+class TweakSnapshotPGSQLAddon(Addon):
+
+    name = 'tweak.snapshot.pgsql'
+    hint = """implement `tweak.snapshot` for PostgreSQL"""
+    prerequisites = ['engine.pgsql']
+
+
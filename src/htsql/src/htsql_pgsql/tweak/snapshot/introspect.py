@@ -0,0 +1,40 @@
+#
+# Copyright (c) 2006-2013, Prometheus Research, LLC
+#
+
+
+from htsql.core.connect import connect
+from htsql.tweak.snapshot.introspect import Fingerprint
+
+
+# System catalogs used by the introspector, and `pg_description` for table
+# and column comments.  Any DDL statement, a comment or a change of
+# privileges adds, removes or updates rows in these tables, which changes
+# the number of rows or the latest `xmin`.
+FINGERPRINT_CATALOG_NAMES = ['pg_namespace', 'pg_class', 'pg_attribute',
+                             'pg_type', 'pg_enum', 'pg_constraint',
+                             'pg_description', 'pg_auth_members']
+
+
+# A query that returns a row which changes whenever the structure of
+# the database, as seen by the current user, changes.
+FINGERPRINT_SQL = """
+    SELECT CURRENT_USER, CURRENT_SCHEMAS(TRUE), %s
+""" % ", ".join("""
+        (SELECT COUNT(*) || ':' ||
+                COALESCE(MAX(xmin::text::bigint), 0)
+         FROM pg_catalog.%s)
+    """ % name for name in FINGERPRINT_CATALOG_NAMES)
+
+
+class FingerprintPGSQL(Fingerprint):
+
+    def __call__(self):
+        connection = connect()
+        cursor = connection.cursor()
+        cursor.execute(FINGERPRINT_SQL)
+        row = cursor.fetchone()
+        connection.release()
+        return repr(tuple(row))
+
+
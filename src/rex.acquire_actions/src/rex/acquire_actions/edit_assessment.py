@@ -62,7 +62,7 @@ class EditAssessmentAction(AssessmentAction):
         try:
             entry_impl.validate_data(
                 assessment_data,
-                instrument_definition=assessment.instrument_version.definition,
+                instrument_definition=assessment.instrument_version,
             )
         except InstrumentError as exc:
             raise HTTPBadRequest(exc.message)
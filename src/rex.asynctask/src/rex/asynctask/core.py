@@ -122,12 +122,24 @@ def _process(queue_name, worker_name, quiet):
         raise Error('Worker "%s" does not exist' % (worker_name,))
     worker = worker()
 
+    batch_size = 1
+    cfg = get_settings().asynctask_workers.get(queue_name)
+    if cfg and cfg.worker == worker_name:
+        batch_size = cfg.batch_size or cfg.concurrency or 1
+
     num_processed = 0
-    task = transport.get_task(queue_name)
-    while task is not None:
-        worker.process(task)
-        num_processed += 1
-        task = transport.get_task(queue_name)
+    tasks = transport.get_tasks(queue_name, batch_size)
+    while tasks:
+        for idx, task in enumerate(tasks):
+            try:
+                worker.process(task)
+            except BaseException:
+                # The rest of the batch was already taken off the queue;
+                # put it back so that it is not lost.
+                transport.submit_tasks(queue_name, tasks[idx + 1:])
+                raise
+            num_processed += 1
+        tasks = transport.get_tasks(queue_name, batch_size)
 
     if quiet:
         enable_logging()
@@ -39,6 +39,8 @@ class WorkerConfigVal(OneOfVal):
             ('worker', ChoiceVal(worker_names)),
             ('rate_max_calls', IntVal(1), None),
             ('rate_period', FloatVal(), None),
+            ('concurrency', IntVal(1), None),
+            ('batch_size', IntVal(1), None),
         )
         super(WorkerConfigVal, self).__init__(
             ChoiceVal(worker_names),
@@ -73,6 +75,15 @@ class AsyncTaskWorkersSetting(Setting):
             A float indicating the number of seconds the rate limiter logic
             should measure over. Optional.
 
+        concurrency
+            An integer indicating how many tasks the worker may process at the
+            same time using a pool of threads. Optional; defaults to ``1``.
+
+        batch_size
+            An integer indicating the maximum number of tasks to retrieve from
+            the queue at once. Optional; defaults to the value of
+            ``concurrency``.
+
     If not specified, defaults to ``{}``.
 
     This is a merged setting, meaning that the mappings defined for this
@@ -102,7 +113,9 @@ class AsyncTaskWorkersSetting(Setting):
 class AsyncWorkersPollIntervalSetting(Setting):
     """
     Indicates how many milliseconds an ``AsyncTaskWorker`` process must sleep
-    beween attempts to retrive tasks from its queue.
+    beween attempts to retrive tasks from its queue. Workers using a transport
+    that supports notifications (``pgsql``, ``redis``, ``localmem``) are woken
+    up as soon as a task is submitted, so this is only an upper bound.
 
     If not specified, defaults to ``500``.
     """
@@ -5,6 +5,7 @@
 
 import json
 import re
+import time
 
 from urllib.parse import parse_qs
 
@@ -151,6 +152,22 @@ class AsyncTransport(Extension):
 
         raise NotImplementedError()
 
+    def submit_tasks(self, queue_name, payloads):
+        """
+        Places several tasks into the specified queue, in the order given.
+
+        The default implementation calls ``submit_task()`` repeatedly;
+        concrete classes should override it to submit the tasks in bulk.
+
+        :param queue_name: the name of the queue to place the tasks in
+        :type queue_name: str
+        :param payloads: the data to send in each of the tasks
+        :type payloads: list of dicts
+        """
+
+        for payload in payloads:
+            self.submit_task(queue_name, payload)
+
     def get_task(self, queue_name):
         """
         Retrieves a task from the specified queue.
@@ -166,6 +183,51 @@ class AsyncTransport(Extension):
 
         raise NotImplementedError()
 
+    def get_tasks(self, queue_name, max_count):
+        """
+        Retrieves up to the specified number of tasks from the specified
+        queue.
+
+        The default implementation calls ``get_task()`` repeatedly; concrete
+        classes should override it to retrieve the tasks in bulk.
+
+        :param queue_name: the name of the queue to retrieve tasks from
+        :type queue_name: str
+        :param max_count: the maximum number of tasks to retrieve
+        :type max_count: int
+        :returns:
+            a list of the payload dictionaries of the tasks, in the order they
+            were submitted; an empty list if there are no tasks in the queue
+        """
+
+        payloads = []
+        while len(payloads) < max_count:
+            payload = self.get_task(queue_name)
+            if payload is None:
+                break
+            payloads.append(payload)
+        return payloads
+
+    def wait_for_task(self, queue_name, timeout):
+        """
+        Blocks until a task may be available in the specified queue, or until
+        the timeout expires.
+
+        The default implementation simply sleeps for the duration of the
+        timeout. Transports that are able to be notified about new tasks
+        should override this method so that workers wake up as soon as a task
+        is submitted.
+
+        :param queue_name: the name of the queue to wait on
+        :type queue_name: str
+        :param timeout: the maximum number of seconds to wait
+        :type timeout: float
+        """
+
+        # pylint: disable=no-self-use,unused-argument
+
+        time.sleep(timeout)
+
     def poll_queue(self, queue_name):
         """
         Counts the number of tasks in the specified queue.
@@ -70,6 +70,33 @@ class FileSysAsyncTransport(AsyncTransport):
 
             self._write_index(queue_name, next_start, next_end)
 
+    def submit_tasks(self, queue_name, payloads):
+        self._ensure_queue(queue_name)
+
+        full_payloads = [
+            self.encode_payload({
+                'payload': payload,
+            })
+            for payload in payloads
+        ]
+        if not full_payloads:
+            return
+
+        with self._lock(queue_name):
+            index = self._get_index(queue_name)
+            next_start = index[0] or 1
+            next_end = index[1]
+
+            for full_payload in full_payloads:
+                next_end += 1
+                path = os.path.join(
+                    self._queue_path(queue_name),
+                    str(next_end),
+                )
+                self._write_file(path, full_payload)
+
+            self._write_index(queue_name, next_start, next_end)
+
     def get_task(self, queue_name):
         self._ensure_queue(queue_name)
 
@@ -92,6 +119,36 @@ class FileSysAsyncTransport(AsyncTransport):
         contents = self.decode_payload(contents)
         return contents['payload']
 
+    def get_tasks(self, queue_name, max_count):
+        self._ensure_queue(queue_name)
+
+        contents = []
+        with self._lock(queue_name):
+            index = self._get_index(queue_name)
+            if index[1] == 0:
+                return []
+
+            next_start = index[0]
+            while next_start <= index[1] and len(contents) < max_count:
+                path = os.path.join(
+                    self._queue_path(queue_name),
+                    str(next_start),
+                )
+                with open(path, 'r') as task_file:
+                    contents.append(task_file.read())
+                os.remove(path)
+                next_start += 1
+
+            next_end = index[1]
+            if next_start > next_end:
+                next_start = next_end = 0
+            self._write_index(queue_name, next_start, next_end)
+
+        return [
+            self.decode_payload(content)['payload']
+            for content in contents
+        ]
+
     def poll_queue(self, queue_name):
         self._ensure_queue(queue_name)
 
@@ -5,7 +5,7 @@
 
 from collections import defaultdict
 from contextlib import contextmanager
-from threading import Lock
+from threading import Condition
 
 from .base import AsyncTransport
 
@@ -33,7 +33,7 @@ class LocalMemoryAsyncTransport(AsyncTransport):
 
     def initialize(self):
         self._queues = defaultdict(list)
-        self._locks = defaultdict(Lock)
+        self._locks = defaultdict(Condition)
 
     def submit_task(self, queue_name, payload):
         self.ensure_valid_name(queue_name)
@@ -41,6 +41,17 @@ class LocalMemoryAsyncTransport(AsyncTransport):
 
         with self._lock(queue_name):
             self._queues[queue_name].append(payload)
+            self._locks[queue_name].notify_all()
+
+    def submit_tasks(self, queue_name, payloads):
+        self.ensure_valid_name(queue_name)
+        payloads = [self.encode_payload(payload) for payload in payloads]
+        if not payloads:
+            return
+
+        with self._lock(queue_name):
+            self._queues[queue_name].extend(payloads)
+            self._locks[queue_name].notify_all()
 
     def get_task(self, queue_name):
         self.ensure_valid_name(queue_name)
@@ -54,6 +65,22 @@ class LocalMemoryAsyncTransport(AsyncTransport):
 
         return payload
 
+    def get_tasks(self, queue_name, max_count):
+        self.ensure_valid_name(queue_name)
+
+        with self._lock(queue_name):
+            queue = self._queues[queue_name]
+            payloads = queue[:max_count]
+            del queue[:max_count]
+
+        return [self.decode_payload(payload) for payload in payloads]
+
+    def wait_for_task(self, queue_name, timeout):
+        self.ensure_valid_name(queue_name)
+        with self._lock(queue_name):
+            if not self._queues[queue_name]:
+                self._locks[queue_name].wait(timeout)
+
     def poll_queue(self, queue_name):
         self.ensure_valid_name(queue_name)
         count = len(self._queues[queue_name])
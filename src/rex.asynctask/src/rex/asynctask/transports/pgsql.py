@@ -4,6 +4,9 @@
 
 
 import hashlib
+import os
+import select
+import threading
 
 from contextlib import contextmanager
 from urllib.parse import urlunparse
@@ -105,31 +108,75 @@ INSERT INTO asynctask.asynctask_queue (
 ) VALUES (
     %s,
     %s
-)
+);
+SELECT pg_notify(%s, '')
+'''
+
+SQL_INSERT_MANY = '''
+INSERT INTO asynctask.asynctask_queue (
+    queue_name,
+    payload
+) SELECT
+    %s,
+    task.payload::json
+FROM
+    unnest(%s::text[]) WITH ORDINALITY AS task (payload, position)
+ORDER BY
+    task.position
+;
+SELECT pg_notify(%s, '')
 '''
 
+SQL_LISTEN = 'LISTEN "%s"'
+
 SQL_RETRIEVE = '''
-SELECT
+DELETE FROM
+    asynctask.asynctask_queue
+WHERE
+    id = (
+        SELECT
+            id
+        FROM
+            asynctask.asynctask_queue
+        WHERE
+            queue_name = %s
+        ORDER BY
+            id
+        LIMIT
+            1
+        FOR UPDATE SKIP LOCKED
+    )
+RETURNING
     id,
     payload,
     date_submitted
-FROM
-    asynctask.asynctask_queue
-WHERE
-    queue_name = %s
-ORDER BY
-    id
-LIMIT
-    1
 '''
 
-SQL_DELETE = '''
+SQL_RETRIEVE_MANY = '''
 DELETE FROM
     asynctask.asynctask_queue
 WHERE
-    id = %s
+    id IN (
+        SELECT
+            id
+        FROM
+            asynctask.asynctask_queue
+        WHERE
+            queue_name = %s
+        ORDER BY
+            id
+        LIMIT
+            %s
+        FOR UPDATE SKIP LOCKED
+    )
+RETURNING
+    id,
+    payload,
+    date_submitted
 '''
 
+SQL_PING = 'SELECT 1'
+
 SQL_COUNT = '''
 SELECT COUNT(*)
 FROM
@@ -158,6 +205,12 @@ class PostgresAsyncTransport(AsyncTransport):
             database. You really should never need to touch this. If not
             specified, defaults to ``1234567890``.
 
+    The transport keeps a single connection per process, which is checked
+    before use and transparently re-established if it was lost. Tasks are
+    dequeued with ``FOR UPDATE SKIP LOCKED``, so any number of workers can
+    retrieve tasks from the same queue concurrently. Submitting a task sends
+    a ``NOTIFY`` on a channel named after the queue, which wakes up workers
+    waiting in ``wait_for_task()``.
     """
 
     #:
@@ -165,6 +218,10 @@ class PostgresAsyncTransport(AsyncTransport):
 
     def __init__(self, uri_parts):
         self._lock_id_cache = {}
+        self._connection = None
+        self._connection_pid = None
+        self._connection_lock = threading.RLock()
+        self._listening = set()
 
         parsed = DB.parse(urlunparse(uri_parts))
         self._connection_parameters = {
@@ -197,50 +254,111 @@ class PostgresAsyncTransport(AsyncTransport):
         self.ensure_valid_name(queue_name)
         payload = self.encode_payload(payload)
 
-        with self._lock(queue_name) as cur:
-            cur.execute(
-                SQL_INSERT,
-                (
-                    queue_name,
-                    payload,
-                )
+        self._execute(
+            SQL_INSERT,
+            (
+                queue_name,
+                payload,
+                self._get_channel(queue_name),
+            )
+        )
+
+    def submit_tasks(self, queue_name, payloads):
+        self.ensure_valid_name(queue_name)
+        payloads = [self.encode_payload(payload) for payload in payloads]
+        if not payloads:
+            return
+
+        self._execute(
+            SQL_INSERT_MANY,
+            (
+                queue_name,
+                payloads,
+                self._get_channel(queue_name),
             )
+        )
 
     def get_task(self, queue_name):
         self.ensure_valid_name(queue_name)
         payload = None
 
-        with self._lock(queue_name) as cur:
-            cur.execute(
-                SQL_RETRIEVE,
-                (
-                    queue_name,
-                )
-            )
-            recs = cur.fetchall()
-            if recs:
-                payload = self.decode_payload(recs[0][1])
-                cur.execute(
-                    SQL_DELETE,
-                    (
-                        recs[0][0],
-                    )
-                )
+        recs = self._execute(
+            SQL_RETRIEVE,
+            (
+                queue_name,
+            ),
+            fetch=True,
+        )
+        if recs:
+            payload = self.decode_payload(recs[0][1])
         return payload
 
+    def get_tasks(self, queue_name, max_count):
+        self.ensure_valid_name(queue_name)
+
+        recs = self._execute(
+            SQL_RETRIEVE_MANY,
+            (
+                queue_name,
+                max_count,
+            ),
+            fetch=True,
+        )
+        recs.sort(key=lambda rec: rec[0])
+        return [self.decode_payload(rec[1]) for rec in recs]
+
+    def wait_for_task(self, queue_name, timeout):
+        self.ensure_valid_name(queue_name)
+        channel = self._get_channel(queue_name)
+
+        with self._connection_lock:
+            conn = self._acquire_connection()
+            if channel not in self._listening:
+                self._execute(SQL_LISTEN % (channel,))
+                self._listening.add(channel)
+                conn = self._acquire_connection()
+            if self._pop_notifies(conn, channel):
+                return
+
+        try:
+            ready = select.select([conn], [], [], timeout)
+        except InterruptedError:  # pragma: no cover
+            return
+        if ready[0]:
+            with self._connection_lock:
+                try:
+                    conn.poll()
+                except psycopg2.Error:
+                    self._release_connection()
+                    return
+                self._pop_notifies(conn, channel)
+
+    def _pop_notifies(self, conn, channel):
+        # pylint: disable=no-self-use
+        found = False
+        for notify in list(conn.notifies):
+            if notify.channel == channel:
+                conn.notifies.remove(notify)
+                found = True
+        return found
+
+    def _get_channel(self, queue_name):
+        # pylint: disable=no-self-use
+        return 'asynctask_%s' % (queue_name,)
+
     def poll_queue(self, queue_name):
         self.ensure_valid_name(queue_name)
-        with self._lock(queue_name) as cur:
-            cur.execute(
-                SQL_COUNT,
-                (
-                    queue_name,
-                )
-            )
-            result = cur.fetchone()
-            if result:
-                result = int(result[0])
-            return result
+        recs = self._execute(
+            SQL_COUNT,
+            (
+                queue_name,
+            ),
+            fetch=True,
+        )
+        result = None
+        if recs:
+            result = int(recs[0][0])
+        return result
 
     def _get_connection(self):
         try:
@@ -255,27 +373,80 @@ class PostgresAsyncTransport(AsyncTransport):
         else:
             return conn
 
+    def _acquire_connection(self):
+        # The connection is never shared between processes; a forked worker
+        # opens its own connection the first time it needs one.
+        with self._connection_lock:
+            if self._connection is not None \
+                    and (self._connection.closed
+                         or self._connection_pid != os.getpid()):
+                self._release_connection()
+            if self._connection is None:
+                self._connection = self._get_connection()
+                self._connection_pid = os.getpid()
+            return self._connection
+
+    def _release_connection(self):
+        with self._connection_lock:
+            if self._connection is not None \
+                    and self._connection_pid == os.getpid():
+                try:
+                    self._connection.close()
+                except psycopg2.Error:  # pragma: no cover
+                    pass
+            self._connection = None
+            self._connection_pid = None
+            self._listening = set()
+
+    def _is_healthy(self):
+        with self._connection_lock:
+            if self._connection is None or self._connection.closed:
+                return False
+            try:
+                with self._connection.cursor() as cur:
+                    cur.execute(SQL_PING)
+            except psycopg2.Error:
+                return False
+            return True
+
+    def _execute(self, sql, parameters=None, fetch=False):
+        # Executes a statement on the persistent connection; if the
+        # connection turns out to be dead, reconnects and tries once more.
+        for attempt in (1, 2):
+            conn = self._acquire_connection()
+            try:
+                with conn.cursor() as cur:
+                    cur.execute(sql, parameters)
+                    if fetch:
+                        return cur.fetchall()
+                    return None
+            except (psycopg2.OperationalError, psycopg2.InterfaceError):
+                if attempt == 2 or self._is_healthy():
+                    raise
+                self._release_connection()
+        return None  # pragma: no cover
+
     @contextmanager
     def _lock(self, name):
-        cur = self._get_connection().cursor()
-        cur.execute(
-            SQL_LOCK,
-            (
-                self.master_lock_id,
-                self._get_lock_id(name),
-            )
-        )
-        try:
-            yield cur
-        finally:
+        conn = self._acquire_connection()
+        with conn.cursor() as cur:
             cur.execute(
-                SQL_UNLOCK,
+                SQL_LOCK,
                 (
                     self.master_lock_id,
                     self._get_lock_id(name),
                 )
             )
-            cur.close()
+            try:
+                yield cur
+            finally:
+                cur.execute(
+                    SQL_UNLOCK,
+                    (
+                        self.master_lock_id,
+                        self._get_lock_id(name),
+                    )
+                )
 
     def _get_lock_id(self, name):
         if name not in self._lock_id_cache:
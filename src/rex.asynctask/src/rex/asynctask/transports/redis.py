@@ -3,6 +3,7 @@
 #
 
 
+import time
 
 from redis import Redis, RedisError
 
@@ -75,7 +76,20 @@ class RedisAsyncTransport(AsyncTransport):
         self.ensure_valid_name(queue_name)
         queue_name = '_'.join([self.key_prefix, queue_name])
         payload = self.encode_payload(payload)
-        self._redis.rpush(queue_name, payload)
+        pipeline = self._redis.pipeline(transaction=True)
+        pipeline.rpush(queue_name, payload)
+        pipeline.publish(queue_name, '')
+        pipeline.execute()
+
+    def submit_tasks(self, queue_name, payloads):
+        self.ensure_valid_name(queue_name)
+        queue_name = '_'.join([self.key_prefix, queue_name])
+        payloads = [self.encode_payload(payload) for payload in payloads]
+        if payloads:
+            pipeline = self._redis.pipeline(transaction=True)
+            pipeline.rpush(queue_name, *payloads)
+            pipeline.publish(queue_name, '')
+            pipeline.execute()
 
     def get_task(self, queue_name):
         self.ensure_valid_name(queue_name)
@@ -83,6 +97,41 @@ class RedisAsyncTransport(AsyncTransport):
         payload = self.decode_payload(self._redis.lpop(queue_name))
         return payload
 
+    def get_tasks(self, queue_name, max_count):
+        self.ensure_valid_name(queue_name)
+        queue_name = '_'.join([self.key_prefix, queue_name])
+        pipeline = self._redis.pipeline(transaction=True)
+        pipeline.lrange(queue_name, 0, max_count - 1)
+        pipeline.ltrim(queue_name, max_count, -1)
+        payloads = pipeline.execute()[0]
+        return [self.decode_payload(payload) for payload in payloads]
+
+    def wait_for_task(self, queue_name, timeout):
+        self.ensure_valid_name(queue_name)
+        queue_name = '_'.join([self.key_prefix, queue_name])
+        # Submitting a task publishes a message on the channel named after
+        # the queue; the task itself is left in the queue for get_task().
+        deadline = time.time() + timeout
+        pubsub = self._redis.pubsub()
+        try:
+            pubsub.subscribe(queue_name)
+            while True:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                message = pubsub.get_message(timeout=remaining)
+                if message is None:
+                    continue
+                if message['type'] == 'subscribe':
+                    # Only check the queue once subscribed, so that a task
+                    # submitted in between is not missed.
+                    if self._redis.llen(queue_name):
+                        break
+                elif message['type'] == 'message':
+                    break
+        finally:
+            pubsub.close()
+
     def poll_queue(self, queue_name):
         self.ensure_valid_name(queue_name)
         queue_name = '_'.join([self.key_prefix, queue_name])
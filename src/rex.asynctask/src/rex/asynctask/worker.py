@@ -5,9 +5,11 @@
 
 import time
 
+from concurrent.futures import ThreadPoolExecutor
+
 from ratelimiter import RateLimiter
 
-from rex.core import Extension, get_settings
+from rex.core import Extension, get_settings, get_rex
 from rex.logging import get_logger
 
 from .core import get_transport
@@ -61,37 +63,70 @@ class AsyncTaskWorker(Extension):
 
         sleep_duration = self.get_poll_interval() / 1000.0
         limiter = self.get_limiter()
+        batch_size = self.get_batch_size()
+        concurrency = self.get_concurrency()
+        executor = None
+        if concurrency > 1:
+            executor = ThreadPoolExecutor(max_workers=concurrency)
 
         while not check_for_termination(conn):
-            with limiter:
-                payload = self._transport.get_task(queue_name)
-            if payload is not None:
-                self.logger.debug('Got payload: %r', payload)
-                try:
-                    self.process(payload)
-                except Exception:  # pylint: disable=broad-except
-                    self.logger.exception(
-                        'An unhandled exception occurred while processing the'
-                        ' payload'
-                    )
-                else:
-                    self.logger.debug('Processing complete')
+            payloads = self._transport.get_tasks(queue_name, batch_size)
+            if payloads:
+                self._process_payloads(payloads, limiter, executor)
 
             elif halt_when_empty:
                 self.logger.info('No tasks found in queue')
                 break
 
             else:
-                # No task to process, let's sleep a bit.
+                # No task to process, let's wait for one to arrive.
                 try:
-                    time.sleep(sleep_duration)
+                    self._transport.wait_for_task(queue_name, sleep_duration)
                 except KeyboardInterrupt:  # pragma: no cover
                     pass
 
+        if executor is not None:
+            executor.shutdown()
         self._queue_name = None
         self._transport = None
         self.logger.info('Terminating')
 
+    def _process_payloads(self, payloads, limiter, executor):
+        if executor is None:
+            for payload in payloads:
+                with limiter:
+                    self._process_payload(payload)
+            return
+
+        app = get_rex()
+        futures = []
+        for payload in payloads:
+            with limiter:
+                futures.append(
+                    executor.submit(self._process_payload, payload, app)
+                )
+        for future in futures:
+            future.result()
+
+    def _process_payload(self, payload, app=None):
+        if app is not None:
+            # The active application is thread-local, so activate it in the
+            # pool thread.
+            with app:
+                return self._process_payload(payload)
+
+        self.logger.debug('Got payload: %r', payload)
+        try:
+            self.process(payload)
+        except Exception:  # pylint: disable=broad-except
+            self.logger.exception(
+                'An unhandled exception occurred while processing the'
+                ' payload'
+            )
+        else:
+            self.logger.debug('Processing complete')
+        return None
+
     def _throttled(self, until):
         self.logger.debug(
             'Rate limited on queue %s, sleeping for %f seconds',
@@ -119,10 +154,42 @@ class AsyncTaskWorker(Extension):
             callback=self._throttled,
         )
 
+    def get_concurrency(self):
+        """
+        Returns the number of payloads this worker may process concurrently.
+        When greater than one, payloads are processed by a pool of threads, so
+        ``process()`` must be thread-safe.
+
+        :rtype: int
+        """
+
+        cfg = get_settings().asynctask_workers.get(self._queue_name)
+        if not cfg or cfg.concurrency is None:
+            return 1
+        return cfg.concurrency
+
+    def get_batch_size(self):
+        """
+        Returns the maximum number of payloads to retrieve from the queue at
+        once. Defaults to the concurrency of the worker, and never exceeds
+        the number of calls allowed by the rate limiter in one period.
+
+        :rtype: int
+        """
+
+        cfg = get_settings().asynctask_workers.get(self._queue_name)
+        if not cfg:
+            return 1
+        batch_size = cfg.batch_size or self.get_concurrency()
+        if cfg.rate_max_calls is not None and cfg.rate_period is not None:
+            batch_size = min(batch_size, cfg.rate_max_calls)
+        return batch_size
+
     def get_poll_interval(self):
         """
-        Returns the number of milliseconds to wait between attempts to retrieve
-        tasks from the queue.
+        Returns the maximum number of milliseconds to wait between attempts to
+        retrieve tasks from the queue. Transports that support notifications
+        wake the worker up as soon as a task is submitted.
 
         :rtype: int
         """
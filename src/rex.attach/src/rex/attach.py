@@ -9,7 +9,7 @@ This package provides a storage for uploaded files.
 
 
 from rex.core import (get_settings, Setting, Initialize, Validate, StrVal,
-        PathVal, MaybeVal, Error, cached)
+        PathVal, MaybeVal, BoolVal, Error, cached)
 from rex.web import HandleLocation, authorize
 from webob import Response
 from webob.static import FileIter, BLOCK_SIZE
@@ -20,7 +20,7 @@ import io
 import datetime
 import uuid
 import mimetypes
-import shutil
+import hashlib
 import cgi
 import collections
 
@@ -152,6 +152,18 @@ class Storage:
         """
         raise NotImplementedError
 
+    def exists(self, handle):
+        """
+        Checks if the storage contains an attachment with the given handle.
+        """
+        if not self.handle_re.match(handle):
+            raise Error("Ill-formed attachment handle:", handle)
+        try:
+            self.stat(handle)
+        except Error:
+            return False
+        return True
+
     def __iter__(self):
         """
         Generates handles for all attachments in the storage.
@@ -220,10 +232,28 @@ class LocalStorage(Storage):
 
     `attach_dir`
         Directory where attachments are stored.  Must exist and be writable.
+
+    `deduplicate`
+        If set, attachments with the same content are stored once.  Each
+        attachment file is a hard link to a content-addressed blob in the
+        ``.blobs`` subdirectory; the blob is removed with its last
+        attachment.
     """
 
-    def __init__(self, attach_dir):
+    # Directories on the path to an attachment: /YYYY/MM/DD/{uuid}.
+    dir_layout = [
+        re.compile(r'\A[0-9]{4}\Z'),
+        re.compile(r'\A[0-9]{2}\Z'),
+        re.compile(r'\A[0-9]{2}\Z'),
+        re.compile(r'\A[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-'
+                   r'[0-9a-f]{12}\Z'),
+    ]
+
+    blob_dir = '.blobs'
+
+    def __init__(self, attach_dir, deduplicate=False):
         self.attach_dir = attach_dir
+        self.deduplicate = deduplicate
 
     def verify(self):
         if not os.path.isdir(self.attach_dir):
@@ -235,8 +265,6 @@ class LocalStorage(Storage):
                         self.attach_dir)
 
     def add(self, name, content):
-        if isinstance(content, str):
-            content = content.encode('utf-8')
         # Create the handle.
         handle = self.reserve(name)
         target_dir, target_name = os.path.split(self.abspath(handle))
@@ -245,17 +273,61 @@ class LocalStorage(Storage):
         os.makedirs(tmp_dir)
         # Save the attachment to the temporary directory.
         path = os.path.join(tmp_dir, target_name)
+        digest = hashlib.sha256()
         with open(path, 'wb') as stream:
-            if hasattr(content, 'read'):
-                shutil.copyfileobj(content, stream)
-            else:
-                stream.write(content)
+            for chunk in self._chunks(content):
+                if self.deduplicate:
+                    digest.update(chunk)
+                stream.write(chunk)
             stream.flush()
-            os.fsync(stream.fileno())
+            if self.deduplicate:
+                self._link(stream, path, self._blobpath(digest.hexdigest()))
+            else:
+                os.fsync(stream.fileno())
         # Rename the temporary directory.
         os.rename(tmp_dir, target_dir)
         return handle
 
+    def _chunks(self, content):
+        # Generates the attachment content in blocks of bytes.
+        if isinstance(content, str):
+            for start in range(0, len(content), BLOCK_SIZE):
+                yield content[start:start+BLOCK_SIZE].encode('utf-8')
+        elif isinstance(content, bytes):
+            yield content
+        else:
+            while True:
+                chunk = content.read(BLOCK_SIZE)
+                if not chunk:
+                    break
+                if isinstance(chunk, str):
+                    chunk = chunk.encode('utf-8')
+                yield chunk
+
+    def _blobpath(self, digest):
+        # Path to the blob with the given SHA-256 digest.
+        return os.path.join(self.attach_dir, self.blob_dir, digest[:2], digest)
+
+    def _link(self, stream, path, blob_path):
+        # Replaces the uploaded file with a hard link to the blob with the
+        # same content; if there is no such blob, the uploaded file becomes
+        # one.  A copy of an existing blob need not reach the disk.
+        os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+        link_path = path+'.link'
+        while True:
+            try:
+                os.link(blob_path, link_path)
+            except FileNotFoundError:
+                os.fsync(stream.fileno())
+                try:
+                    os.link(path, blob_path)
+                except FileExistsError:
+                    # Added by a concurrent upload.
+                    continue
+                return
+            os.replace(link_path, path)
+            return
+
     def abspath(self, handle):
         # Converts an attachment handle to a path.  Verifies that the handle
         # is well-formed, but does not check if the file exists.
@@ -277,6 +349,15 @@ class LocalStorage(Storage):
         path = self.abspath(handle)
         if not os.path.exists(path):
             raise Error("Attachment does not exist:", handle)
+        # Find the blob shared with other attachments.
+        blob_path = None
+        stat = os.stat(path)
+        if stat.st_nlink > 1:
+            digest = hashlib.sha256()
+            with open(path, 'rb') as stream:
+                for chunk in self._chunks(stream):
+                    digest.update(chunk)
+            blob_path = self._blobpath(digest.hexdigest())
         # Start with renaming the attachment directory.
         target_dir, name = os.path.split(path)
         tmp_dir = target_dir+'.removing'
@@ -291,6 +372,16 @@ class LocalStorage(Storage):
         # Remove the attachment and the temporary directory.
         os.unlink(tmp_path)
         os.rmdir(tmp_dir)
+        # Remove the blob if it is not used by any other attachment.
+        if blob_path is not None:
+            try:
+                blob_stat = os.stat(blob_path)
+                if (blob_stat.st_ino == stat.st_ino and
+                        blob_stat.st_dev == stat.st_dev and
+                        blob_stat.st_nlink == 1):
+                    os.unlink(blob_path)
+            except FileNotFoundError:
+                pass
 
     def stat(self, handle):
         path = self.abspath(handle)
@@ -301,26 +392,38 @@ class LocalStorage(Storage):
                 raise Error("Attachment does not exist:", handle)
             raise
 
+    def exists(self, handle):
+        return os.path.isfile(self.abspath(handle))
+
     def __iter__(self):
         # Emit all files that have a well-formed handle for a path.
-        for handle in self._listdir(self.attach_dir):
+        for handle in self._scandir(self.attach_dir, 0):
             if self.handle_re.match(handle):
                 yield handle
 
-    def _listdir(self, base_dir):
-        # Emits handles for all files in the given directory.
-        for path in sorted(os.listdir(base_dir)):
-            handle = '/'+path
-            path = os.path.join(base_dir, path)
-            if os.path.isfile(path):
+    def _scandir(self, base_dir, depth):
+        # Emits handles for attachment files in the given directory.  Only
+        # directories that fit the handle layout are visited.
+        try:
+            entries = sorted(os.scandir(base_dir), key=(lambda e: e.name))
+        except FileNotFoundError:
+            # Removed while we were scanning.
+            return
+        for entry in entries:
+            handle = '/'+entry.name
+            if depth < len(self.dir_layout):
+                if (self.dir_layout[depth].match(entry.name) and
+                        entry.is_dir()):
+                    for subhandle in self._scandir(entry.path, depth+1):
+                        yield handle+subhandle
+            elif entry.is_file():
                 yield handle
-            elif os.path.isdir(path):
-                prefix = handle
-                for handle in self._listdir(path):
-                    yield prefix+handle
 
     def __repr__(self):
-        return "%s(%r)" % (self.__class__.__name__, self.attach_dir)
+        args = [repr(self.attach_dir)]
+        if self.deduplicate:
+            args.append("deduplicate=True")
+        return "%s(%s)" % (self.__class__.__name__, ", ".join(args))
 
 
 class NoCloseFile:
@@ -572,6 +675,22 @@ class AttachDirSetting(Setting):
     default = None
 
 
+class AttachDeduplicateSetting(Setting):
+    """
+    Store attachments with the same content only once.
+
+    Applies to the local attachment storage configured with ``attach_dir``.
+
+    Example::
+
+        attach_deduplicate: true
+    """
+
+    name = 'attach_deduplicate'
+    validate = BoolVal()
+    default = False
+
+
 class AttachS3BucketSetting(Setting):
     """
     The name of the S3 bucket holding the attachment storage.
@@ -703,7 +822,8 @@ def get_storage():
         raise Error("Only one of the parameters must be set:",
                     "attach_dir, attach_gcs_bucket, attach_s3_bucket")
     if settings.attach_dir is not None:
-        storage = LocalStorage(settings.attach_dir)
+        storage = LocalStorage(settings.attach_dir,
+                               deduplicate=settings.attach_deduplicate)
     if settings.attach_s3_bucket is not None:
         storage = S3Storage(name=settings.attach_s3_bucket,
                             endpoint=settings.attach_s3_endpoint,
@@ -31,16 +31,14 @@ class Cache(dict):
 
 class OpenGate:
     # An utility for loading data from a file and caching the result.  Rebuilds
-    # the result whenever any of the source files changes.
-    # NOTE: not resistant to race conditions -- use only to enable development
-    # without restarting the server.
+    # the result whenever any of the source files changes.  How often the
+    # source files are checked is determined by the `autoreload` setting.
 
-    __slots__ = ('callback', 'args', 'result', 'version')
+    __slots__ = ('callback', 'args', 'result', 'stats', 'valid', 'checked',
+                 'interval', 'lock')
 
-    # Global dictionary that maps file names to their stats.
-    stats = {}
-    stats_version = 1
-    stats_lock = threading.RLock()
+    # Gates that are being evaluated in the current thread.
+    active = threading.local()
 
     def __init__(self, callback, *args):
         # Function that generates the result.  Must have a parameter called
@@ -50,41 +48,78 @@ class OpenGate:
         self.args = args
         # Cached data.
         self.result = None
-        # The version of the data.
-        self.version = 0
+        # Maps names of the source files to their stats.
+        self.stats = {}
+        # Set if the cached data could be used.
+        self.valid = False
+        # When the source files were checked last time.
+        self.checked = 0
+        # Minimum period between two checks (in seconds); `None` if the
+        # source files are never checked.
+        self.interval = get_autoreload_interval()
+        self.lock = threading.RLock()
 
     def open(self, path):
         # Opens the file; saves its stats.
         stream = open(path)
         path = os.path.abspath(path)
-        if path not in OpenGate.stats:
+        if path not in self.stats:
             stat = os.fstat(stream.fileno())
-            OpenGate.stats[path] = (stat.st_mtime, stat.st_size)
+            self.stats[path] = (stat.st_mtime, stat.st_size)
         return stream
 
+    def check(self):
+        # Checks if the source files are unchanged.
+        if self.interval is None:
+            return True
+        timestamp = time.time()
+        if self.checked+self.interval > timestamp:
+            return True
+        for path, stat in self.stats.items():
+            try:
+                new_stat = os.stat(path)
+            except OSError:
+                return False
+            if (new_stat.st_mtime, new_stat.st_size) != stat:
+                return False
+        self.checked = timestamp
+        return True
+
     def __call__(self):
-        with OpenGate.stats_lock:
-            # Check if we can use the cached result.
-            if self.version > 0:
-                stats = {}
-                for path in list(OpenGate.stats.keys()):
-                    try:
-                        stat = os.stat(path)
-                        stats[path] = (stat.st_mtime, stat.st_size)
-                    except OSError:
-                        pass
-                if stats == OpenGate.stats:
-                    if self.version == OpenGate.stats_version:
-                        return self.result
-                else:
-                    OpenGate.stats = stats
-                    OpenGate.stats_version += 1
-            # If not, generate and cache the result.
-            self.result = self.callback(*self.args, open=self.open)
-            self.version = OpenGate.stats_version
+        stack = OpenGate.active.__dict__.setdefault('stack', [])
+        with self.lock:
+            # If not cached or any of the source files changed, generate
+            # and cache the result.
+            if not (self.valid and self.check()):
+                self.valid = False
+                self.stats = {}
+                stack.append(self)
+                try:
+                    self.result = self.callback(*self.args, open=self.open)
+                finally:
+                    stack.pop()
+                self.valid = True
+                self.checked = time.time()
+            # The caller depends on the same source files.
+            if stack:
+                parent_stats = stack[-1].stats
+                for path, stat in self.stats.items():
+                    parent_stats.setdefault(path, stat)
             return self.result
 
 
+def get_autoreload_interval():
+    # Converts the `autoreload` setting to the minimum period between two
+    # checks of the source files.
+    from .setting import get_settings
+    autoreload = get_settings().autoreload
+    if autoreload is True:
+        return 0
+    if autoreload is False:
+        return None
+    return autoreload
+
+
 class ExpireGate:
     # An utility that expires function result after a period of time.
 
@@ -200,6 +235,9 @@ def autoreload(fn):
     Decorates the function to cache its return value.  The cached value is
     re-evaluated if any of the files opened by the function change.
 
+    Use setting ``autoreload`` to limit how often the files are checked
+    for changes.
+
     The function must have only positional arguments with the last argument
     being ``open=open``.
     """
@@ -7,7 +7,7 @@ from .extension import Extension
 from .context import get_rex
 from .cache import cached
 from .package import get_packages
-from .validate import BoolVal, StrVal, MapVal
+from .validate import BoolVal, FloatVal, StrVal, MapVal
 from .error import Error
 import textwrap
 import yaml
@@ -117,6 +117,29 @@ class DebugSetting(Setting):
     validate = BoolVal()
 
 
+class AutoreloadSetting(Setting):
+    """
+    How often to check the source files of cached configuration for changes.
+
+    If ``true`` (the default), the files are checked on every access; if a
+    number, the files are checked at most once in the given number of
+    seconds; if ``false``, the configuration is never reloaded.
+    """
+
+    name = 'autoreload'
+    default = True
+
+    def validate(self, value):
+        if isinstance(value, bool) or value in ['true', 'false']:
+            return BoolVal()(value)
+        value = FloatVal()(value)
+        if value < 0:
+            error = Error("Expected a non-negative number")
+            error.wrap("Got:", repr(value))
+            raise error
+        return value
+
+
 class SettingCollection:
     """
     Application configuration.
@@ -35,6 +35,7 @@ from htsql.core.tr.binding import (Recipe, LiteralRecipe, ChainRecipe, Binding,
 from htsql.core.tr.bind import (BindByFreeTable, BindByAttachedTable,
         BindByRecipe)
 from htsql.core.tr.decorate import decorate_void
+from htsql.core.tr.translate import TranslateContext
 from htsql.core.tr.signature import Signature, Slot, IsInSig
 from htsql.core.tr.fn.bind import BindFunction, BindAmong
 from htsql.core.fmt.accept import AcceptJSON
@@ -332,6 +333,26 @@ class LookupReferenceInRoot(Lookup):
         return super(LookupReferenceInRoot, self).__call__()
 
 
+class RexTranslateContext(TranslateContext):
+
+    def __call__(self):
+        # Session properties are evaluated lazily per request, so queries
+        # cannot be cached when they are in effect; `$USER` depends on
+        # the session and the effective masks are compiled into the plan.
+        if context.app.rex.properties and \
+                context.env.session_properties is not None:
+            return None
+        session = (context.env.session()
+                   if context.env.session is not None else None)
+        if session is not None:
+            session = str(session)
+        masks = ()
+        if context.env.masks is not None:
+            masks = tuple((tuple(mask.path), mask.node, str(mask.syntax))
+                          for mask in context.env.masks())
+        return (session, masks)
+
+
 class LookupReferenceSetInRoot(Lookup):
 
     adapt(RootBinding, ReferenceSetProbe)
@@ -7,6 +7,8 @@ from rex.core import (Error, guard, StrVal, BoolVal, OneOrSeqVal, MapVal,
         UnionVal, OnScalar)
 from .fact import Fact, LabelVal
 from .model import model
+from .sql import (DEFAULT, sql_savepoint, sql_release_savepoint,
+        sql_rollback_to_savepoint)
 import os.path
 import csv
 import re
@@ -19,6 +21,8 @@ import htsql_rex_deploy
 import psycopg2.tz
 import json
 import collections
+import contextlib
+import itertools
 
 
 class _skip_type:
@@ -28,6 +32,12 @@ class _skip_type:
 #: Special value which indicates that the column or the link should be ignored.
 SKIP = _skip_type()
 
+# The number of rows changed by a single SQL statement.
+BATCH_SIZE = 1000
+
+# Savepoint for recovering from a failed batch.
+SAVEPOINT = 'rex_deploy_data'
+
 
 class DataVal(MapVal):
     # Like `MapVal`, but also accept `namedtuple` objects.
@@ -156,85 +166,73 @@ class DataFact(Fact):
         key_mask = [column_image.position
                     for column_image in image.primary_key]
 
+        # Compute the changes first, then apply them in batches.
+        changes = []
+        # Primary keys of the rows affected by pending changes.
+        handles = set()
+
         for record_idx, record in enumerate(records):
-            try:
-                # Convert field values to raw column values.
-                row = []
-                for column_image in image.columns:
-                    index = indexes.get(column_image)
-                    if index is not None:
-                        data = record[index]
-                        field = fields[index]
-                        # Resolve links.
-                        if field.is_link and \
-                                data is not None and data is not SKIP:
-                            target = field.target_table
-                            data_id = self._resolve(target, data)
-                            if data_id is None:
-                                target = field.target_table
-                                domain = self._domain(field)
-                                raise Error("Discovered missing record:",
-                                            "%s[%s]" % (target.label,
-                                                        domain.dump(data)))
-                            data = data_id
-                    else:
-                        data = SKIP
-                    row.append(data)
-                row = tuple(row)
-                # The primary key value.
-                handle = tuple([row[idx] for idx in key_mask])
-                # Find an existing row by the PK.
-                old_row = image.data.get(image.primary_key, handle)
-                if self.is_present:
-                    if old_row is not None:
-                        # Find columns and values that changed.
-                        columns = []
-                        values = []
-                        for column, data, old_data in zip(image, row, old_row):
-                            # Normalize JSON values before comparing them.
-                            if column.type.qname in [('pg_catalog', 'json'),
-                                                     ('pg_catalog', 'jsonb')] and \
-                                    isinstance(old_data, str):
-                                old_data = json.dumps(json.loads(old_data), sort_keys=True)
-                            if data is SKIP or data == old_data:
-                                continue
-                            columns.append(column)
-                            values.append(data)
-                        if not columns:
+            with self._guard_row(fields, record, record_idx):
+                row = self._make_row(image, fields, indexes, record,
+                                     is_strict=not changes)
+            if row is None:
+                # The row may refer to a row added by a pending change.
+                self._apply(table, fields, records, changes)
+                changes = []
+                handles = set()
+                with self._guard_row(fields, record, record_idx):
+                    row = self._make_row(image, fields, indexes, record)
+            # The primary key value.
+            handle = tuple([row[idx] for idx in key_mask])
+            if handle in handles:
+                # The row is already changed; apply pending changes
+                # to get its current state.
+                self._apply(table, fields, records, changes)
+                changes = []
+                handles = set()
+            # Find an existing row by the PK.
+            old_row = image.data.get(image.primary_key, handle)
+            if self.is_present:
+                if old_row is not None:
+                    # Find columns and values that changed.
+                    columns = []
+                    values = []
+                    for column, data, old_data in zip(image, row, old_row):
+                        # Normalize JSON values before comparing them.
+                        if column.type.qname in [('pg_catalog', 'json'),
+                                                 ('pg_catalog', 'jsonb')] and \
+                                isinstance(old_data, str):
+                            old_data = json.dumps(json.loads(old_data), sort_keys=True)
+                        if data is SKIP or data == old_data:
                             continue
-                        # Update an existing row.
-                        image.data.update(old_row, columns, values)
-                    else:
-                        # Add a new row.
-                        columns = []
-                        values = []
-                        for column, data in zip(image, row):
-                            if data is SKIP:
-                                continue
-                            columns.append(column)
-                            values.append(data)
-                        image.data.insert(columns, values)
-                else:
-                    if old_row is not None:
-                        # Remove the row.
-                        image.data.delete(old_row)
-                        # Data might be invalid.
-                        is_invalid = True
-            except Error as error:
-                # Add the row being processed to the error trace.
-                items = []
-                for field, data in zip(fields, record):
-                    if data is SKIP:
+                        columns.append(column)
+                        values.append(data)
+                    if not columns:
                         continue
-                    if data is None:
-                        item = 'null'
-                    else:
-                        dumper = self._domain(field).dump
-                        item = htsql.core.util.to_literal(dumper(data))
-                    items.append(item)
-                error.wrap("While processing row #%s:" % (record_idx+1),
-                           "{%s}" % ", ".join(items))
-                raise
+                    # Update an existing row.
+                    changes.append(
+                            ('update', record_idx, old_row, columns, values))
+                else:
+                    # Add a new row.
+                    columns = []
+                    values = []
+                    for column, data in zip(image, row):
+                        if data is SKIP:
+                            continue
+                        columns.append(column)
+                        values.append(data)
+                    changes.append(
+                            ('insert', record_idx, None, columns, values))
+                handles.add(handle)
+            else:
+                if old_row is not None:
+                    # Remove the row.
+                    changes.append(('delete', record_idx, old_row, [], []))
+                    handles.add(handle)
+                    # Data might be invalid.
+                    is_invalid = True
+
+        self._apply(table, fields, records, changes)
 
         # Invalidate cached data.
         if is_invalid:
@@ -242,6 +240,123 @@ class DataFact(Fact):
                 if dependent.is_link and dependent.target_table is table:
                     self._invalidate(dependent.table)
 
+    def _make_row(self, image, fields, indexes, record, is_strict=True):
+        # Converts field values to raw column values.  If a link cannot be
+        # resolved, returns `None` unless `is_strict` is set.
+        row = []
+        for column_image in image.columns:
+            index = indexes.get(column_image)
+            if index is not None:
+                data = record[index]
+                field = fields[index]
+                # Resolve links.
+                if field.is_link and \
+                        data is not None and data is not SKIP:
+                    target = field.target_table
+                    data_id = self._resolve(target, data)
+                    if data_id is None:
+                        if not is_strict:
+                            return None
+                        domain = self._domain(field)
+                        raise Error("Discovered missing record:",
+                                    "%s[%s]" % (target.label,
+                                                domain.dump(data)))
+                    data = data_id
+            else:
+                data = SKIP
+            row.append(data)
+        return tuple(row)
+
+    @contextlib.contextmanager
+    def _guard_row(self, fields, record, record_idx):
+        # Adds the row being processed to the error trace.
+        try:
+            yield
+        except Error as error:
+            items = []
+            for field, data in zip(fields, record):
+                if data is SKIP:
+                    continue
+                if data is None:
+                    item = 'null'
+                else:
+                    dumper = self._domain(field).dump
+                    item = htsql.core.util.to_literal(dumper(data))
+                items.append(item)
+            error.wrap("While processing row #%s:" % (record_idx+1),
+                       "{%s}" % ", ".join(items))
+            raise
+
+    def _apply(self, table, fields, records, changes):
+        # Applies the changes; consecutive changes of the same kind
+        # are applied in batches.
+        def key(change):
+            kind, record_idx, old_row, columns, values = change
+            if kind == 'update':
+                return (kind, tuple(columns))
+            return (kind,)
+        for batch_key, group in itertools.groupby(changes, key):
+            group = list(group)
+            for start in range(0, len(group), BATCH_SIZE):
+                batch = group[start:start+BATCH_SIZE]
+                self._apply_batch(table, fields, records, batch)
+
+    def _apply_batch(self, table, fields, records, batch):
+        # Applies a batch of changes of the same kind.
+        driver = table.schema.driver
+        data = table.image.data
+        kind = batch[0][0]
+        old_rows = [change[2] for change in batch]
+        if kind == 'insert':
+            # Use `DEFAULT` for columns missing in some of the rows.
+            present = set()
+            for change in batch:
+                present.update(change[3])
+            columns = [column for column in table.image if column in present]
+            rows = []
+            for change in batch:
+                row = dict(zip(change[3], change[4]))
+                rows.append([row.get(column, DEFAULT) for column in columns])
+        else:
+            columns = batch[0][3]
+            rows = [change[4] for change in batch]
+        if len(batch) > 1 and (columns or kind == 'delete') and \
+                not driver.is_locked:
+            self._submit_quietly(driver, sql_savepoint(SAVEPOINT))
+            try:
+                if kind == 'insert':
+                    data.insert_many(columns, rows)
+                elif kind == 'update':
+                    data.update_many(old_rows, columns, rows)
+                elif kind == 'delete':
+                    data.delete_many(old_rows)
+            except Error:
+                # Apply the changes one by one to find the failing row.
+                self._submit_quietly(
+                        driver, sql_rollback_to_savepoint(SAVEPOINT))
+            else:
+                self._submit_quietly(driver, sql_release_savepoint(SAVEPOINT))
+                return
+            self._submit_quietly(driver, sql_release_savepoint(SAVEPOINT))
+        for kind, record_idx, old_row, columns, values in batch:
+            with self._guard_row(fields, records[record_idx], record_idx):
+                if kind == 'insert':
+                    data.insert(columns, values)
+                elif kind == 'update':
+                    data.update(old_row, columns, values)
+                elif kind == 'delete':
+                    data.delete(old_row)
+
+    @staticmethod
+    def _submit_quietly(driver, sql):
+        # Executes a SQL statement without logging it.
+        logging = driver.logging
+        driver.logging = False
+        try:
+            driver.submit(sql)
+        finally:
+            driver.logging = logging
+
     def _load(self, table):
         # Loads input data and produces a list of tuples.
 
@@ -17,7 +17,8 @@ from .sql import (sql_create_schema, sql_drop_schema, sql_rename_schema,
         sql_rename_sequence, sql_nextval, sql_create_function,
         sql_drop_function, sql_rename_function, sql_create_trigger,
         sql_drop_trigger, sql_rename_trigger, sql_comment_on_trigger,
-        sql_select, sql_insert, sql_update, sql_delete)
+        sql_select, sql_insert, sql_insert_many, sql_update, sql_update_many,
+        sql_delete, sql_delete_many)
 import htsql.core.util
 import collections
 import weakref
@@ -1487,6 +1488,50 @@ class DataImage(Image):
         self.cursor.execute(sql)
         self.remove_row(old_row)
 
+    def insert_many(self, columns, rows):
+        """Inserts a batch of records into the table."""
+        names = [column.name for column in columns]
+        returning_names = [column.name for column in self.table]
+        sql = sql_insert_many(self.table.qname, names, rows, returning_names)
+        self.cursor.execute(sql)
+        output = self.cursor.fetchall()
+        assert len(output) == len(rows)
+        for new_row in output:
+            self.append_row(new_row)
+
+    def update_many(self, old_rows, columns, rows):
+        """Updates a batch of table records."""
+        key_column = self.table.columns.first()
+        assert len(key_column.unique_keys) > 0
+        key_values = [old_row[0] for old_row in old_rows]
+        assert None not in key_values
+        names = [column.name for column in columns]
+        type_qnames = [column.type.qname for column in columns]
+        returning_names = [column.name for column in self.table]
+        sql = sql_update_many(
+                self.table.qname, key_column.name, key_column.type.qname,
+                key_values, names, type_qnames, rows, returning_names)
+        self.cursor.execute(sql)
+        output = self.cursor.fetchall()
+        assert len(output) == len(old_rows)
+        # Rows may exchange unique values, so drop all the old handles
+        # before adding the new ones.
+        for old_row in old_rows:
+            self.remove_row(old_row)
+        for new_row in output:
+            self.append_row(new_row)
+
+    def delete_many(self, old_rows):
+        """Deletes a batch of table records."""
+        key_column = self.table.columns.first()
+        assert len(key_column.unique_keys) > 0
+        key_values = [old_row[0] for old_row in old_rows]
+        assert None not in key_values
+        sql = sql_delete_many(self.table.qname, key_column.name, key_values)
+        self.cursor.execute(sql)
+        for old_row in old_rows:
+            self.remove_row(old_row)
+
 
 def make_catalog(cursor):
     """Creates an empty catalog image."""
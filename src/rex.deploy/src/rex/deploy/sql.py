@@ -11,6 +11,14 @@ import inspect
 import jinja2
 
 
+class _default_type:
+    # Set a `repr()` value for `sphinx.ext.autodoc`.
+    def __repr__(self):
+        return "DEFAULT"
+#: Special value rendered as ``DEFAULT`` in ``INSERT`` statements.
+DEFAULT = _default_type()
+
+
 def mangle(fragments, suffix=None,
            max_length=63,
            forbidden_prefixes=["pg"],
@@ -101,9 +109,12 @@ def sql_value(value):
 
         Special values ``datetime.date.today`` and ``datetime.datetime.now``
         are converted to the current date and timestamp respectively.
+        Special value :data:`DEFAULT` is converted to ``DEFAULT``.
     """
     if value is None:
         return "NULL"
+    if value is DEFAULT:
+        return "DEFAULT"
     if isinstance(value, bool):
         if value is True:
             return "TRUE"
@@ -625,6 +636,47 @@ def sql_update(table_qname, key_name, key_value, names, values,
     """
 
 
+@sql_template
+def sql_insert_many(table_qname, names, rows, returning_names=None):
+    """
+    INSERT INTO {{ table_qname|qn }} ({{ names|n }})
+        VALUES
+    # for values in rows
+            ({{ values|v }})
+            {%- if not loop.last %},{% elif not returning_names %};{% endif %}
+    # endfor
+    # if returning_names
+        RETURNING {{ returning_names|n }};
+    # endif
+    """
+
+
+@sql_template
+def sql_update_many(table_qname, key_name, key_type_qname, key_values,
+                    names, type_qnames, rows, returning_names=None):
+    """
+    UPDATE {{ table_qname|qn }} AS "t"
+        SET {% for name in names -%}
+                {{ name|n }} = "v".{{ name|n }}{% if not loop.last %}, {% endif %}
+            {%- endfor %}
+        FROM (VALUES
+    # for key_value, values in zip(key_values, rows)
+            ({{ key_value|v }}::{{ key_type_qname|qn }}
+            {%- for value, type_qname in zip(values, type_qnames) -%}
+                , {{ value|v }}::{{ type_qname|qn }}
+            {%- endfor %}){% if not loop.last %},{% endif %}
+    # endfor
+        ) AS "v" ({{ key_name|n }}, {{ names|n }})
+        WHERE "t".{{ key_name|n }} = "v".{{ key_name|n }}
+        {%- if not returning_names %};{% endif %}
+    # if returning_names
+        RETURNING {% for name in returning_names -%}
+                "t".{{ name|n }}{% if not loop.last %}, {% endif %}
+            {%- endfor %};
+    # endif
+    """
+
+
 @sql_template
 def sql_delete(table_qname, key_name, key_value):
     """
@@ -633,6 +685,35 @@ def sql_delete(table_qname, key_name, key_value):
     """
 
 
+@sql_template
+def sql_delete_many(table_qname, key_name, key_values):
+    """
+    DELETE FROM {{ table_qname|qn }}
+        WHERE {{ key_name|n }} IN ({{ key_values|v }});
+    """
+
+
+@sql_template
+def sql_savepoint(name):
+    """
+    SAVEPOINT {{ name|n }};
+    """
+
+
+@sql_template
+def sql_release_savepoint(name):
+    """
+    RELEASE SAVEPOINT {{ name|n }};
+    """
+
+
+@sql_template
+def sql_rollback_to_savepoint(name):
+    """
+    ROLLBACK TO SAVEPOINT {{ name|n }};
+    """
+
+
 def plpgsql_primary_key_procedure(*parts):
     return "\n%s\n" % sql_render("""
     BEGIN
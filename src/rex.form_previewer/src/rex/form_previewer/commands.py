@@ -313,7 +313,7 @@ class CompleteFormCommand(BaseViewFormCommand):
         try:
             assessment_impl.validate_data(
                 data,
-                instrument_definition=instrument_version.definition,
+                instrument_definition=instrument_version,
             )
         except InstrumentError as exc:
             raise HTTPBadRequest(exc.message) from None
@@ -23,7 +23,7 @@ def preview_calculation_results(
     assessment_impl = Assessment.get_implementation()
     assessment_impl.validate_data(
         data,
-        instrument_definition=instrument_version.definition,
+        instrument_definition=instrument_version,
     )
 
     # Make some temporary objects so we can execute the calcs.
@@ -0,0 +1,66 @@
+"""
+
+    rex.graphql.cache
+    =================
+
+    Caches used to speed up execution of repeated GraphQL queries.
+
+    :copyright: 2019-present Prometheus Research, LLC
+
+"""
+
+import threading
+import typing as t
+from collections import OrderedDict
+
+
+class LRUCache:
+    """ Thread-safe mapping which keeps at most ``maxsize`` recently used
+    items."""
+
+    def __init__(self, maxsize: int):
+        assert maxsize > 0
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value = self._items[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._items.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def __len__(self):
+        return len(self._items)
+
+
+def freeze(value: t.Any) -> t.Any:
+    """ Convert a value into a hashable one suitable for a cache key.
+
+    Raises :class:`TypeError` if the value cannot be converted.
+    """
+    if isinstance(value, dict):
+        items = sorted((k, freeze(v)) for k, v in value.items())
+        return (dict, tuple(items))
+    if isinstance(value, (list, tuple)):
+        return (list, tuple(freeze(v) for v in value))
+    hash(value)
+    return (type(value), value)
@@ -233,12 +233,19 @@ class Compute(Field):
         name=None,
         description=None,
         deprecation_reason=None,
+        batch=False,
         loc=autoloc,
     ):
         if f is None:
-            f = lambda parent, info, params: getattr(
-                parent, info.field_name, None
-            )
+            if batch:
+                f = lambda parents, info, params: [
+                    getattr(parent, info.field_name, None)
+                    for parent in parents
+                ]
+            else:
+                f = lambda parent, info, params: getattr(
+                    parent, info.field_name, None
+                )
 
         if params is None:
             params = []
@@ -250,6 +257,7 @@ class Compute(Field):
         self.name = name
         self.description = description
         self.deprecation_reason = deprecation_reason
+        self.batch = batch
 
 
 class Query(Field):
@@ -808,7 +816,11 @@ def sort_from_function():
 
 
 def compute_from_function(
-    name=None, description=None, deprecation_reason=None, loc=autoloc
+    name=None,
+    description=None,
+    deprecation_reason=None,
+    batch=False,
+    loc=autoloc,
 ) -> Field:
     """ Decorator which allows to define a :func:`compute` field from a
     function.
@@ -828,8 +840,13 @@ def compute_from_function(
         >>> data.data['four']
         4
 
+    With ``batch=True`` the function computes values for many parents at once,
+    see :func:`compute`; :data:`parent_param` then refers to the list of
+    parents.
+
     :param description: Description
     :param deprecation_reason: Reason for deprecation
+    :param batch: If the function computes values in batches
     """
     loc = code_location.here() if loc is autoloc else loc
 
@@ -859,6 +876,7 @@ def compute_from_function(
             deprecation_reason=deprecation_reason,
             name=field_name,
             description=description,
+            batch=batch,
         )
 
     return decorate
@@ -1208,6 +1226,7 @@ def compute(
     description: t.Optional[str] = None,
     name: t.Optional[str] = None,
     deprecation_reason: t.Optional[str] = None,
+    batch: bool = False,
     loc=autoloc,
 ) -> Field:
     """
@@ -1243,12 +1262,42 @@ def compute(
     By default :func:`compute` computes the value as ``getattr(parent, name)``
     but ``f`` argument can be supplied instead.
 
+    With ``batch=True``, ``f`` receives a list of parents and must return a
+    list of values in the same order. When such a field is selected on a list
+    of entities, ``f`` is called once for the whole list instead of once per
+    entity. Values are memoized for the duration of the request so each
+    parent is computed only once::
+
+        >>> calls = []
+        >>> def id_lengths(parents, info, args):
+        ...     calls.append(len(parents))
+        ...     return [len(str(parent)) for parent in parents]
+
+        >>> sch = schema(fields=lambda: {
+        ...     'region': query(q.region, type=Entity(
+        ...         name='region',
+        ...         fields=lambda: {
+        ...             'id_length': compute(
+        ...                 scalar.Int, f=id_lengths, batch=True
+        ...             ),
+        ...         },
+        ...     ))
+        ... })
+
+        >>> data = execute(sch, '{ region { id_length } }')
+        >>> calls
+        [5]
+
+    Computed params (:func:`param`) of a batch field receive the list of
+    parents as well.
+
     :param type: GraphQL type
     :param f: Function used to compute the value of the field
     :param params: Field params
     :param name: Name
     :param description: Description
     :param deprecation_reason: Reason for deprecation
+    :param batch: If ``f`` computes values for many parents at once
     """
     loc = code_location.here() if loc is autoloc else loc
     return Compute(
@@ -1258,6 +1307,7 @@ def compute(
         name=name,
         description=description,
         deprecation_reason=deprecation_reason,
+        batch=batch,
         loc=loc,
     )
 
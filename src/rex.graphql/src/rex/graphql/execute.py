@@ -13,15 +13,18 @@
 """
 
 import sys
+import functools
 import typing
 import traceback
 import typing as t
 from collections import Iterable, OrderedDict
 
 from htsql.core.tr.bind import Select
-from htsql.core.tr.translate import translate
+from htsql.core.tr.translate import translate, translate_context
 from htsql.core.tr.decorate import decorate
 from htsql.core.tr import binding
+from htsql.core.tr.signature import PlaceholderSig
+from htsql.core.context import context as htsql_context
 from htsql.core.syn import syntax
 from htsql.core import domain
 
@@ -30,7 +33,7 @@ from graphql import language, error
 from rex.logging import get_logger
 from rex.core import get_sentry
 from rex.db import get_db
-from rex.query.bind import RexBindingState
+from rex.query.bind import RexBindingState, Output
 from .schema import Schema
 from .input_coercion import (
     coerce_input_value,
@@ -38,12 +41,26 @@ from .input_coercion import (
     undefined,
     are_types_compatible,
 )
+from .cache import freeze
 from . import model, desc
 from rex.query.builder import q
 
 
 logger = get_logger("rex.graphql.execute")
 
+# How many parsed GraphQL documents to keep around.
+DOCUMENT_CACHE_SIZE = 256
+
+
+@functools.lru_cache(maxsize=DOCUMENT_CACHE_SIZE)
+def parse(query: str) -> language.ast.Document:
+    """ Parse GraphQL query.
+
+    Parsed documents are cached by the query text so that clients which send
+    the same queries over and over do not pay for parsing each time.
+    """
+    return language.parser.parse(query)
+
 
 class VariableValue:
     __slots__ = ("type", "value", "node")
@@ -150,6 +167,7 @@ class ExecutionContext:
         context_value: typing.Any,
         variable_values: typing.Dict[str, typing.Any],
         operation_name: typing.Optional[str],
+        query: typing.Optional[str] = None,
     ):
         operation = None
         fragments = {}
@@ -200,8 +218,11 @@ class ExecutionContext:
         self.variable_values = variable_values
         self.errors = []
         self.context_value = context_value
+        self.query = query
         self._arguments_cache = {}
         self._subfields_cache = {}
+        self._batch_cache = {}
+        self._variables_key = undefined
 
     def get_field_params(
         self, parent, parent_type, field: model.Field, field_node: language.ast.Field
@@ -237,6 +258,37 @@ class ExecutionContext:
 
         return self._arguments_cache[k]
 
+    def get_query_key(self, field, path):
+        """ Key to cache the translated query field.
+
+        Returns ``None`` if the query field cannot be cached.
+        """
+        if self.query is None:
+            return None
+        # Variable values are passed to the query as parameters, see
+        # `get_query_params()`.
+        if self._variables_key is undefined:
+            self._variables_key = tuple(
+                sorted(
+                    (name, str(variable.type))
+                    for name, variable in self.variable_values.items()
+                )
+            )
+        # HTSQL may refuse caching, e.g., when session properties are used.
+        state = translate_context()
+        if state is None:
+            return None
+        # Items of the same list share the same query.
+        path = tuple(name for name in path if not isinstance(name, int))
+        return (
+            htsql_context.app,
+            state,
+            field,
+            self.query,
+            path,
+            self._variables_key,
+        )
+
     def raise_error(self, msg, exc_info=None):
         if exc_info is not None:
             type, value, tb = exc_info
@@ -639,6 +691,13 @@ def complete_data(
         return None
 
     if isinstance(return_type, model.ListType):
+        prefetch_batch_fields(
+            ctx=ctx,
+            item_type=return_type.type,
+            field_nodes=field_nodes,
+            path=path,
+            data=data,
+        )
         result = []
         for item in data:
             result.append(
@@ -852,65 +911,261 @@ def resolve_field(
 
     return_type = field_def.type
 
-    # The resolve function's optional third argument is a context value that is
-    # provided to every resolve function within an execution. It is commonly
-    # used to represent an authenticated user, or request-specific caches.
-    context = ctx.context_value
+    info = make_info(ctx, parent_type, field_def, field_nodes, path)
 
+    if isinstance(field_def, model.ComputedField) and field_def.batch:
+        [result] = resolve_batch(
+            ctx, parent_type, field_def, field_nodes, info, [parent]
+        )
+    elif isinstance(field_def, model.ComputedField):
+        # Build a dict of arguments from the field.arguments AST, using the
+        # variables scope to fulfill any variable references.
+        params = ctx.get_field_params(parent, parent_type, field_def, field_node)
+        result = call_resolver(
+            ctx, parent_type, field_def, parent, info, params
+        )
+    elif isinstance(field_def, model.QueryField):
+        result = execute_query_field(
+            ctx, parent, parent_type, field_def, field_nodes, path
+        )
+        if field_def.descriptor.transform:
+            result = field_def.descriptor.transform(result)
+    else:
+        assert False, f"unknown field type"
+
+    return result, info, return_type
+
+
+def make_info(ctx, parent_type, field_def, field_nodes, path):
+    field_name = field_nodes[0].name.value
     # The resolve function's optional third argument is a collection of
     # information about the current execution state.
-    info = ExecutionInfo(
+    return ExecutionInfo(
         field_name=field_name,
         field_nodes=field_nodes,
-        return_type=return_type,
+        return_type=field_def.type,
         parent_type=parent_type,
         schema=ctx.schema,
         fragments=ctx.fragments,
         root_value=ctx.root_value,
         operation=ctx.operation,
         variable_values=ctx.variable_values,
-        context=context,
+        # The context value is provided to every resolve function within an
+        # execution. It is commonly used to represent an authenticated user,
+        # or request-specific caches.
+        context=ctx.context_value,
         path=path + [field_name],
     )
 
-    if isinstance(field_def, model.ComputedField):
-        # Build a dict of arguments from the field.arguments AST, using the
-        # variables scope to fulfill any variable references.
-        params = ctx.get_field_params(parent, parent_type, field_def, field_node)
-        resolve_fn = field_def.resolver
+
+def call_resolver(ctx, parent_type, field_def, parent, info, params):
+    try:
+        return field_def.resolver(parent, info, params)
+    except error.GraphQLError as err:
+        ctx.raise_error(
+            msg=f"Error while executing {parent_type.name}.{info.field_name}: {err}",
+        )
+    except Exception:
+        get_sentry().captureException()
+        ctx.raise_error(
+            msg=f"Error while executing {parent_type.name}.{info.field_name}",
+            exc_info=sys.exc_info(),
+        )
+
+
+def resolve_batch(ctx, parent_type, field_def, field_nodes, info, parents):
+    """ Resolve a batch computed field for a list of parents.
+
+    The resolver is called once for all parents which were not seen before;
+    results are memoized for the duration of the request.
+    """
+    try:
+        memo = ctx._batch_cache.setdefault(
+            (field_def, tuple(field_nodes)), {}
+        )
+        missing = []
+        seen = set()
+        for parent in parents:
+            if parent not in memo and parent not in seen:
+                missing.append(parent)
+                seen.add(parent)
+    except TypeError:
+        # Parents are not hashable, so no memoization.
+        memo = None
+        missing = list(parents)
+    if not missing:
+        return [memo[parent] for parent in parents]
+
+    params = get_param_values(
+        ctx,
+        field=field_def,
+        parent=missing,
+        parent_type=parent_type,
+        params=field_def.params,
+        arg_nodes=field_nodes[0].arguments,
+        variables=ctx.variable_values,
+        allow_computed_params=True,
+    )
+    results = call_resolver(ctx, parent_type, field_def, missing, info, params)
+    results = list(results)
+    if len(results) != len(missing):
+        ctx.raise_error(
+            msg=f"Error while executing {parent_type.name}.{info.field_name}:"
+            f" expected {len(missing)} values, got {len(results)}"
+        )
+    if memo is None:
+        return results
+    memo.update(zip(missing, results))
+    return [memo[parent] for parent in parents]
+
+
+def prefetch_batch_fields(ctx, item_type, field_nodes, path, data):
+    # Resolve batch computed fields for all entities in the list at once.
+    if isinstance(item_type, model.NonNullType):
+        item_type = item_type.type
+    if not isinstance(item_type, model.RecordType):
+        return
+    batch_fields = []
+    subfield_nodes = ctx.get_sub_fields(item_type, field_nodes)
+    for name, nodes in subfield_nodes.items():
+        field_def = item_type.fields.get(nodes[0].name.value)
+        if not isinstance(field_def, model.ComputedField):
+            continue
+        if not field_def.batch:
+            continue
+        batch_fields.append((field_def, nodes))
+    # Entities carry `__id__` only when the type has computed fields.
+    if not batch_fields:
+        return
+    parents = [item.__id__ for item in data if item is not None]
+    if not parents:
+        return
+    for field_def, nodes in batch_fields:
+        info = make_info(ctx, item_type, field_def, nodes, path)
+        resolve_batch(ctx, item_type, field_def, nodes, info, parents)
+
+
+def execute_query_field(
+    ctx, parent, parent_type, field: model.QueryField, field_nodes, path=()
+):
+    # Translated queries are reused unless they depend on the parent value
+    # via computed parameters.
+    key = ctx.get_query_key(field, path)
+    pipe = None
+    inputs = None
+    if key is not None:
         try:
-            result = resolve_fn(parent, info, params)
-        except error.GraphQLError as err:
-            ctx.raise_error(
-                msg=f"Error while executing {parent_type.name}.{field_name}: {err}",
-            )
-        except Exception:
-            get_sentry().captureException()
-            ctx.raise_error(
-                msg=f"Error while executing {parent_type.name}.{field_name}",
-                exc_info=sys.exc_info(),
+            params_key, inputs = get_query_params(
+                ctx, parent, parent_type, field, field_nodes
             )
-    elif isinstance(field_def, model.QueryField):
-        result = execute_query_field(ctx, parent, parent_type, field_def, field_nodes)
-        if field_def.descriptor.transform:
-            result = field_def.descriptor.transform(result)
-    else:
-        assert False, f"unknown field type"
+        except TypeError:
+            key = None
+        else:
+            key = key + (params_key,)
+            pipe = ctx.schema.query_cache.get(key)
+    if pipe is None:
+        state = RexBindingState()
+        state.has_computed_params = False
+        state.inputs = [] if key is not None else None
+        binding = bind_query_field(
+            state, ctx, parent, parent_type, field, field_nodes
+        )
+        pipe = translate(binding)
+        inputs = state.inputs
+        if key is not None and not state.has_computed_params:
+            ctx.schema.query_cache.set(key, pipe)
+    product = pipe()(tuple(inputs) if inputs else None)
+    return product.data
 
-    return result, info, return_type
 
+def get_query_params(
+    ctx, parent, parent_type, field: model.QueryField, field_nodes
+):
+    """ Collect arguments of a query field and its query subfields.
 
-def execute_query_field(ctx, parent, parent_type, field: model.QueryField, field_nodes):
-    state = RexBindingState()
-    binding = bind_query_field(state, ctx, parent, parent_type, field, field_nodes)
-    pipe = translate(binding)
-    product = pipe()(None)
-    return product.data
+    Returns a key made of the arguments which determine the shape of the
+    query and a list of the argument values which are passed to the query as
+    parameters, in the order ``bind_query_field()`` binds them.
+
+    Raises :class:`TypeError` if some argument value is not hashable.
+    """
+    key = []
+    inputs = []
+
+    def collect(parent_type, field, field_nodes):
+        params = ctx.get_field_params(
+            parent, parent_type, field, field_nodes[0]
+        )
+        for name, arg in field.params.items():
+            if name not in params:
+                continue
+            if is_input_param(field, arg, params[name]):
+                inputs.append(params[name])
+                key.append((name, None))
+            else:
+                key.append((name, freeze(params[name])))
+        entity_type = model.find_named_type(field.type)
+        if not isinstance(entity_type, model.RecordType):
+            return
+        subfield_nodes = ctx.get_sub_fields(entity_type, field_nodes)
+        for subfield_nodes in subfield_nodes.values():
+            subfield = entity_type.fields.get(subfield_nodes[0].name.value)
+            if isinstance(subfield, model.QueryField):
+                collect(entity_type, subfield, subfield_nodes)
+
+    collect(parent_type, field, field_nodes)
+    return tuple(key), inputs
+
+
+def is_input_param(field: model.QueryField, arg, value):
+    """ Check if the argument value can be passed to the query as
+    a parameter.
+
+    That is the case for scalar values which are only referred to from
+    queries; values consumed by filter or sort functions and pagination
+    change the query itself.
+    """
+    if value is None or isinstance(value, (list, tuple, dict)):
+        return False
+    arg_type = arg.type
+    if isinstance(arg_type, model.NonNullType):
+        arg_type = arg_type.type
+    if not isinstance(arg_type, (model.ScalarType, model.EnumType)):
+        return False
+    if isinstance(arg_type, model.EntityIdType) or arg_type.domain is None:
+        return False
+    descriptor = field.descriptor
+    if descriptor.paginate and arg.name in ("limit", "offset"):
+        return False
+    for filter in descriptor.filters:
+        if isinstance(filter, desc.FilterOfQuery):
+            continue
+        if any(param.name == arg.name for param in filter.params.values()):
+            return False
+    if isinstance(descriptor.sort, desc.Sort):
+        if any(
+            param.name == arg.name for param in descriptor.sort.params.values()
+        ):
+            return False
+    return True
+
+
+def bind_input(state, domain, value):
+    """ Bind a query parameter."""
+    index = len(state.inputs)
+    state.inputs.append(value)
+    return Output(
+        binding.FormulaBinding(
+            state.scope, PlaceholderSig(index), domain, syntax.VoidSyntax()
+        )
+    )
 
 
 def bind_query_field(state, ctx, parent, parent_type, field: model.QueryField, field_nodes):
     field_node = field_nodes[0]
     params = ctx.get_field_params(parent, parent_type, field, field_node)
+    if any(isinstance(p, desc.ComputedParam) for p in field.params.values()):
+        state.has_computed_params = True
 
     # Bind GraphQL arguments
     vars = {}
@@ -924,7 +1179,12 @@ def bind_query_field(state, ctx, parent, parent_type, field: model.QueryField, f
             continue
         assert arg_type is not None
         assert arg_type.bind_value is not None, f"{arg_type!r}"
-        vars[name] = arg_type.bind_value(state, params[name])
+        if state.inputs is not None and is_input_param(
+            field, arg, params[name]
+        ):
+            vars[name] = bind_input(state, arg_type.domain, params[name])
+        else:
+            vars[name] = arg_type.bind_value(state, params[name])
 
     # Initial query
     query = field.descriptor.query
@@ -1021,7 +1281,7 @@ def bind_query_field(state, ctx, parent, parent_type, field: model.QueryField, f
 
 
 def execute_exn(schema, query: str, variables=None, context=None, db=None):
-    document_node = language.parser.parse(query)
+    document_node = parse(query)
 
     ctx = ExecutionContext(
         schema=schema,
@@ -1030,6 +1290,7 @@ def execute_exn(schema, query: str, variables=None, context=None, db=None):
         context_value=context or {},
         variable_values=variables or {},
         operation_name=None,
+        query=query,
     )
     operation = ctx.operation
 
@@ -372,6 +372,7 @@ class ComputedField(Field):
     """ Fields computed with resolver."""
 
     resolver = property(lambda self: self.descriptor.resolver)
+    batch = property(lambda self: self.descriptor.batch)
     description = property(lambda self: self.descriptor.description)
     deprecation_reason = property(
         lambda self: self.descriptor.deprecation_reason
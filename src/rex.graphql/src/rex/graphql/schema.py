@@ -13,6 +13,10 @@ from rex.core import Error, Extension
 from rex.db import get_db, RexHTSQL
 
 from . import introspection, model, model_scalar, desc, code_location
+from .cache import LRUCache
+
+# How many translated query fields to keep around per schema.
+QUERY_CACHE_SIZE = 1024
 
 
 class SchemaConfig(Extension):
@@ -65,6 +69,7 @@ class Schema:
         self.loc = loc
         self.skip_directive = self.directives["skip"]
         self.include_directive = self.directives["include"]
+        self.query_cache = LRUCache(QUERY_CACHE_SIZE)
 
     def __getitem__(self, name):
         return self.types[name]
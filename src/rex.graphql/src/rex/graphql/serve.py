@@ -11,8 +11,9 @@
 # copyright: 2016 GraphQL Python
 # copyright: 2019-present Prometheus Research, LLC
 
-from typing import Any
+from typing import Any, Iterable, Optional
 import datetime
+import hashlib
 import json
 
 from webob import Response, Request
@@ -21,9 +22,11 @@ from rex.core.validate import RexJSONEncoder
 
 from .schema import Schema
 from .serve_graphiql import serve_graphiql
-from .execute import execute
+from .execute import execute, Result
+from .cache import LRUCache
+from graphql import GraphQLError
 
-__all__ = ("serve",)
+__all__ = ("serve", "PersistedQueries")
 
 
 class RexGraphQLJSONEncoder(RexJSONEncoder):
@@ -36,14 +39,63 @@ class RexGraphQLJSONEncoder(RexJSONEncoder):
         return super(RexGraphQLJSONEncoder, self).default(o)
 
 
+class PersistedQueries:
+    """ Storage for persisted queries.
+
+    Clients may refer to a persisted query by the SHA-256 hash of its text
+    instead of sending the text itself, see
+    https://github.com/apollographql/apollo-link-persisted-queries for the
+    protocol.
+
+    :param queries: Queries known in advance.
+    :param allow_register:
+        If clients are allowed to persist new queries by sending the text
+        together with its hash.
+    :param maxsize: How many registered queries to keep.
+    """
+
+    def __init__(
+        self,
+        queries: Iterable[str] = (),
+        allow_register: bool = True,
+        maxsize: int = 1024,
+    ):
+        self.allow_register = allow_register
+        self.known = {self.hash(query): query for query in queries}
+        self.registered = LRUCache(maxsize)
+
+    @staticmethod
+    def hash(query: str) -> str:
+        return hashlib.sha256(query.encode("utf-8")).hexdigest()
+
+    def get(self, query_hash: str) -> Optional[str]:
+        query = self.known.get(query_hash)
+        if query is None:
+            query = self.registered.get(query_hash)
+        return query
+
+    def register(self, query_hash: str, query: str):
+        if self.hash(query) != query_hash:
+            raise GraphQLError("provided sha does not match query")
+        if query_hash not in self.known:
+            if not self.allow_register:
+                raise GraphQLError("PersistedQueryNotSupported")
+            self.registered.set(query_hash, query)
+
+
 def serve(
     schema: Schema,
     req: Request,
     db: Any = None,
     context: Any = None,
     graphiql_enabled: bool = True,
+    persisted_queries: Optional[PersistedQueries] = None,
 ) -> Response:
-    """ Serve GraphQL :class:`webob.Request`."""
+    """ Serve GraphQL :class:`webob.Request`.
+
+    Pass :class:`PersistedQueries` as ``persisted_queries`` to let clients
+    refer to queries by their hashes.
+    """
 
     method = req.method.lower()
 
@@ -60,7 +112,15 @@ def serve(
     params = Params.from_req(req, ignore_malformed_variables=show_graphiql)
 
     result = None
-    if params.query is not None:
+    if persisted_queries is not None and params.query_hash is not None:
+        try:
+            params.query = resolve_persisted_query(
+                persisted_queries, params.query_hash, params.query
+            )
+        except GraphQLError as err:
+            result = Result(errors=[err], invalid=True)
+
+    if result is None and params.query is not None:
         result = execute(
             query=params.query,
             schema=schema,
@@ -83,13 +143,24 @@ def serve(
         )
 
 
+def resolve_persisted_query(persisted_queries, query_hash, query):
+    if query is None:
+        query = persisted_queries.get(query_hash)
+        if query is None:
+            raise GraphQLError("PersistedQueryNotFound")
+    else:
+        persisted_queries.register(query_hash, query)
+    return query
+
+
 class Params:
-    __slots__ = ("query", "variables", "operation_name")
+    __slots__ = ("query", "variables", "operation_name", "query_hash")
 
-    def __init__(self, query, variables, operation_name):
+    def __init__(self, query, variables, operation_name, query_hash=None):
         self.query = query
         self.variables = variables
         self.operation_name = operation_name
+        self.query_hash = query_hash
 
     @classmethod
     def from_req(cls, req, ignore_malformed_variables=False):
@@ -120,9 +191,13 @@ class Params:
                     variables = json.loads(variables)
                 except Exception:
                     raise HTTPBadRequest("Variables are invalid JSON.")
+            query_hash = get_query_hash(data.get("extensions"))
 
             return cls(
-                query=query, variables=variables, operation_name=operation_name
+                query=query,
+                variables=variables,
+                operation_name=operation_name,
+                query_hash=query_hash,
             )
         elif req.method.lower() == "get":
             query = req.GET.get("query")
@@ -135,6 +210,32 @@ class Params:
                         variables = {}
                     else:
                         raise HTTPBadRequest("Variables are invalid JSON.")
-            return cls(query=query, operation_name=None, variables=variables)
+            query_hash = get_query_hash(req.GET.get("extensions"))
+            return cls(
+                query=query,
+                operation_name=None,
+                variables=variables,
+                query_hash=query_hash,
+            )
         else:
             assert False
+
+
+def get_query_hash(extensions):
+    # Extract the hash of a persisted query from request extensions.
+    if not extensions:
+        return None
+    if isinstance(extensions, str):
+        try:
+            extensions = json.loads(extensions)
+        except Exception:
+            raise HTTPBadRequest("Extensions are invalid JSON.")
+    if not isinstance(extensions, dict):
+        return None
+    persisted_query = extensions.get("persistedQuery")
+    if not isinstance(persisted_query, dict):
+        return None
+    query_hash = persisted_query.get("sha256Hash")
+    if not isinstance(query_hash, str):
+        return None
+    return query_hash
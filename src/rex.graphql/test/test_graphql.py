@@ -486,6 +486,86 @@ def test_data_computed_field():
     }
 
 
+def test_batch_computed_field():
+    calls = []
+
+    def get_messages(parents, info, params):
+        calls.append(list(parents))
+        return [f"Hello from '{parent}'" for parent in parents]
+
+    region = Entity(
+        "region",
+        fields=lambda: {
+            "name": query(q.name),
+            "message": compute(scalar.String, f=get_messages, batch=True),
+        },
+    )
+    sch = schema(
+        fields=lambda: {
+            "region": query(q.region, region),
+            "africa": query(q.region.filter(q.name == "AFRICA").first(), region),
+        }
+    )
+    data = execute(
+        sch,
+        """
+        query {
+            region {
+                message
+            }
+            africa {
+                message
+            }
+        }
+        """,
+    )
+    assert data == {
+        "region": [
+            {"message": "Hello from 'AFRICA'"},
+            {"message": "Hello from 'AMERICA'"},
+            {"message": "Hello from 'ASIA'"},
+            {"message": "Hello from 'EUROPE'"},
+            {"message": "Hello from ''MIDDLE EAST''"},
+        ],
+        "africa": {"message": "Hello from 'AFRICA'"},
+    }
+    # One call for the list, one for the singular field.
+    assert [len(parents) for parents in calls] == [5, 1]
+
+
+def test_batch_plain_entity_list():
+    # Entities without computed fields are fetched without `__id__`, so the
+    # batch prefetch must leave them alone.
+    region = Entity(
+        "region",
+        fields=lambda: {
+            "name": query(q.name),
+            "nation_count": query(q.nation.count()),
+        },
+    )
+    sch = schema(fields=lambda: {"region": query(q.region, region)})
+    data = execute(
+        sch,
+        """
+        query {
+            region {
+                name
+                nation_count
+            }
+        }
+        """,
+    )
+    assert data == {
+        "region": [
+            {"name": "AFRICA", "nation_count": 5},
+            {"name": "AMERICA", "nation_count": 5},
+            {"name": "ASIA", "nation_count": 5},
+            {"name": "EUROPE", "nation_count": 5},
+            {"name": "MIDDLE EAST", "nation_count": 5},
+        ]
+    }
+
+
 def test_computed_arg_simple():
     def get_message(parent, info, params):
         name = params.get("name", "Mr.None")
@@ -749,6 +829,66 @@ def test_query_filter_of_query():
     assert data == {"region": [{"name": "AFRICA"}]}
 
 
+def test_query_cache():
+    region = Entity("region", fields=lambda: {"name": query(q.name)})
+    sch = schema(
+        fields=lambda: {
+            "region": query(
+                q.region,
+                region,
+                filters=[q.name == argument("name", scalar.String)],
+            )
+        }
+    )
+    text = """
+    query Regions($name: String) {
+        region(name: $name) {
+            name
+        }
+    }
+    """
+    data = execute(sch, text, variables={"name": "AFRICA"})
+    assert data == {"region": [{"name": "AFRICA"}]}
+    assert len(sch.query_cache) == 1
+    # Same query, different variables: values are passed as parameters.
+    hits = sch.query_cache.hits
+    data = execute(sch, text, variables={"name": "ASIA"})
+    assert data == {"region": [{"name": "ASIA"}]}
+    assert len(sch.query_cache) == 1
+    assert sch.query_cache.hits == hits + 1
+
+
+def test_query_cache_filter_of_function():
+    @filter_from_function()
+    def filter_region(africa_only: scalar.Boolean):
+        if africa_only:
+            yield q.name == "AFRICA"
+
+    region = Entity("region", fields=lambda: {"name": query(q.name)})
+    sch = schema(
+        fields=lambda: {
+            "region": query(q.region, region, filters=[filter_region])
+        }
+    )
+    text = """
+    query Regions($africa_only: Boolean) {
+        region(africa_only: $africa_only) {
+            name
+        }
+    }
+    """
+    # Values consumed by filter functions change the query.
+    data = execute(sch, text, variables={"africa_only": True})
+    assert data == {"region": [{"name": "AFRICA"}]}
+    data = execute(sch, text, variables={"africa_only": False})
+    assert len(data["region"]) == 5
+    assert len(sch.query_cache) == 2
+    hits = sch.query_cache.hits
+    data = execute(sch, text, variables={"africa_only": True})
+    assert data == {"region": [{"name": "AFRICA"}]}
+    assert sch.query_cache.hits == hits + 1
+
+
 def test_query_fragment():
     sch = get_simple_schema()
     data = execute(
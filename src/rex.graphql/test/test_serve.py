@@ -5,7 +5,7 @@ from webob import Request
 from webob.exc import HTTPBadRequest, HTTPMethodNotAllowed
 from rex.core import Rex, Error
 from rex.graphql import schema, query, argument, q, Entity, scalar
-from rex.graphql.serve import serve
+from rex.graphql.serve import serve, PersistedQueries
 
 
 @pytest.fixture(scope="module")
@@ -275,3 +275,63 @@ def test_serve_exec_err_invalid_syntax(sch):
     assert res.content_type == "application/json"
     assert 'data' not in res.json
     assert res.json["errors"]
+
+
+def persisted_request(query_hash, query=None):
+    data = {
+        "extensions": {
+            "persistedQuery": {"version": 1, "sha256Hash": query_hash}
+        }
+    }
+    if query is not None:
+        data["query"] = query
+    return Request.blank(
+        "/",
+        method="POST",
+        accept="application/json",
+        content_type="application/json",
+        body=json.dumps(data).encode("utf8"),
+    )
+
+
+def test_serve_persisted_query(sch):
+    persisted_queries = PersistedQueries()
+    query_hash = PersistedQueries.hash(query_all)
+
+    req = persisted_request(query_hash)
+    res = serve(sch, req, persisted_queries=persisted_queries)
+    assert res.status_code == 400
+    assert res.json["errors"][0]["message"] == "PersistedQueryNotFound"
+
+    req = persisted_request(query_hash, query_all)
+    res = serve(sch, req, persisted_queries=persisted_queries)
+    assert res.status_code == 200
+    assert res.json == expected_all
+
+    req = persisted_request(query_hash)
+    res = serve(sch, req, persisted_queries=persisted_queries)
+    assert res.status_code == 200
+    assert res.json == expected_all
+
+
+def test_serve_persisted_query_known(sch):
+    persisted_queries = PersistedQueries([query_all], allow_register=False)
+
+    req = persisted_request(PersistedQueries.hash(query_all))
+    res = serve(sch, req, persisted_queries=persisted_queries)
+    assert res.status_code == 200
+    assert res.json == expected_all
+
+    query_hash = PersistedQueries.hash(query_byname)
+    req = persisted_request(query_hash, query_byname)
+    res = serve(sch, req, persisted_queries=persisted_queries)
+    assert res.status_code == 400
+    assert res.json["errors"][0]["message"] == "PersistedQueryNotSupported"
+
+
+def test_serve_persisted_query_hash_mismatch(sch):
+    persisted_queries = PersistedQueries()
+    req = persisted_request(PersistedQueries.hash(query_byname), query_all)
+    res = serve(sch, req, persisted_queries=persisted_queries)
+    assert res.status_code == 400
+    assert res.json["errors"]
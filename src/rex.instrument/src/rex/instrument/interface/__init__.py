@@ -26,6 +26,7 @@ __all__ = (
     'Instrument',
     'InstrumentVersion',
     'Assessment',
+    'AssessmentValidator',
     'DraftInstrumentVersion',
     'Channel',
     'Task',
@@ -3,12 +3,17 @@
 #
 
 
-from collections import namedtuple
+import hashlib
+import json
+import threading
+
+from collections import namedtuple, OrderedDict
 from copy import deepcopy
 from datetime import datetime, date
 
-from rios.core import validate_assessment, \
-    ValidationError as RiosValidationError
+from rios.core import ValidationError as RiosValidationError
+from rios.core.validation.assessment import \
+    Assessment as AssessmentSchema
 from rex.core import Extension, AnyVal, Error
 
 from .instrumentversion import InstrumentVersion
@@ -24,9 +29,91 @@ from ..util import to_unicode, memoized_property, get_implementation, \
 
 __all__ = (
     'Assessment',
+    'AssessmentValidator',
 )
 
 
+def make_validation_error(exc):
+    msg = [
+        'The following problems were encountered when validating this'
+        ' Assessment:',
+    ]
+    for key, details in list(exc.asdict().items()):
+        msg.append('%s: %s' % (
+            key or '<root>',
+            details,
+        ))
+    return ValidationError('\n'.join(msg))
+
+
+class AssessmentValidator(object):
+    """
+    Validates Assessment Documents against a Common Instrument Definition.
+
+    The Instrument Definition is parsed once, when the validator is created,
+    so one validator can be used to check any number of Assessments.
+
+    :param instrument_definition:
+        the Common Instrument Definition to validate the data against; if
+        not specified, only the adherance to the base Assessment Document
+        definition is checked
+    :type instrument_definition: dict or JSON string
+    :raises:
+        ValidationError if the Instrument Definition is not a mapped object
+    """
+
+    def __init__(self, instrument_definition=None):
+        if instrument_definition:
+            if isinstance(instrument_definition, str):
+                try:
+                    instrument_definition = AnyVal().parse(
+                        instrument_definition
+                    )
+                except Error as exc:
+                    raise ValidationError(
+                        'Invalid Instrument JSON/YAML provided: %s' % (
+                            str(exc),
+                        )
+                    )
+            if not isinstance(instrument_definition, dict):
+                raise ValidationError(
+                    'Instrument Definitions must be mapped objects.'
+                )
+        else:
+            instrument_definition = None
+        self.instrument_definition = instrument_definition
+        self.schema = AssessmentSchema(instrument=instrument_definition)
+
+    def __call__(self, data):
+        """
+        Validates that the specified data is a legal Assessment Document.
+
+        :param data: the Assessment data to validate
+        :type data: dict or JSON string
+        :raises:
+            ValidationError if the specified structure fails any of the
+            requirements
+        """
+
+        # Make sure we're working with a dict.
+        if isinstance(data, str):
+            try:
+                data = AnyVal().parse(data)
+            except Error as exc:
+                raise ValidationError(
+                    'Invalid JSON/YAML provided: %s' % str(exc)
+                )
+        if not isinstance(data, dict):
+            raise ValidationError(
+                'Assessment Documents must be mapped objects.'
+            )
+
+        try:
+            self.schema.deserialize(data)
+        except RiosValidationError as exc:
+            raise make_validation_error(exc)
+
+
 class Assessment(
         Extension,
         Comparable,
@@ -56,6 +143,74 @@ class Assessment(
         'evaluation_date',
     )
 
+    #: The maximum number of compiled validators to keep in memory.
+    VALIDATOR_CACHE_SIZE = 100
+
+    _validator_cache = OrderedDict()
+    _validator_cache_lock = threading.Lock()
+
+    @classmethod
+    def get_validator(cls, instrument_definition=None):
+        """
+        Returns an AssessmentValidator for the specified Instrument.
+
+        Validators are cached, keyed by the UID of an InstrumentVersion, by
+        the text of a JSON/YAML definition, or by the content of a dict
+        definition.
+
+        :param instrument_definition:
+            the InstrumentVersion or the Common Instrument Definition to
+            validate the data against; if not specified, only the adherance to
+            the base Assessment Document definition is checked
+        :type instrument_definition: InstrumentVersion, dict or JSON string
+        :rtype: AssessmentValidator
+        :raises:
+            ValidationError if the Instrument Definition is not a mapped
+            object
+        """
+
+        key = None
+        if isinstance(instrument_definition, InstrumentVersion):
+            if instrument_definition.uid is not None:
+                key = ('uid', instrument_definition.uid)
+            instrument_definition = instrument_definition.definition
+        if not instrument_definition:
+            key = ('none', None)
+        elif isinstance(instrument_definition, str):
+            key = ('text', instrument_definition)
+        elif isinstance(instrument_definition, dict) and key is None:
+            try:
+                content = json.dumps(
+                    instrument_definition,
+                    sort_keys=True,
+                    default=str,
+                )
+            except (TypeError, ValueError):
+                pass
+            else:
+                key = ('dict', hashlib.sha1(content.encode('utf-8')).digest())
+        if key is None:
+            return AssessmentValidator(instrument_definition)
+
+        with cls._validator_cache_lock:
+            validator = cls._validator_cache.get(key)
+            if validator is not None:
+                cls._validator_cache.move_to_end(key)
+        # The definition of an InstrumentVersion may have been changed since
+        # the validator was compiled.
+        if validator is None or (
+                key[0] == 'uid' and
+                validator.instrument_definition != instrument_definition):
+            if key[0] == 'dict':
+                # The caller may modify the dict after it is cached.
+                instrument_definition = deepcopy(instrument_definition)
+            validator = AssessmentValidator(instrument_definition)
+            with cls._validator_cache_lock:
+                cls._validator_cache[key] = validator
+                while len(cls._validator_cache) > cls.VALIDATOR_CACHE_SIZE:
+                    cls._validator_cache.popitem(last=False)
+        return validator
+
     @classmethod
     def validate_data(cls, data, instrument_definition=None):
         """
@@ -67,55 +222,42 @@ class Assessment(
             the Common Instrument Definition to validate the data against; if
             not specified, only the adherance to the base Assessment Document
             definition is checked
-        :type instrument_definition: dict or JSON string
+        :type instrument_definition: InstrumentVersion, dict or JSON string
         :raises:
             ValidationError if the specified structure fails any of the
             requirements
         """
 
-        # Make sure we're working with a dict.
-        if isinstance(data, str):
-            try:
-                data = AnyVal().parse(data)
-            except Error as exc:
-                raise ValidationError(
-                    'Invalid JSON/YAML provided: %s' % str(exc)
-                )
-        if not isinstance(data, dict):
-            raise ValidationError(
-                'Assessment Documents must be mapped objects.'
-            )
+        cls.get_validator(instrument_definition)(data)
 
-        if instrument_definition:
-            if isinstance(instrument_definition, str):
-                try:
-                    instrument_definition = AnyVal().parse(
-                        instrument_definition
-                    )
-                except Error as exc:
-                    raise ValidationError(
-                        'Invalid Instrument JSON/YAML provided: %s' % (
-                            str(exc),
-                        )
-                    )
-            if not isinstance(instrument_definition, dict):
-                raise ValidationError(
-                    'Instrument Definitions must be mapped objects.'
-                )
+    @classmethod
+    def bulk_validate_data(cls, data, instrument_definition=None):
+        """
+        Validates that each of the specified data structures is a legal
+        Assessment Document. The Instrument Definition is only checked once,
+        which makes it considerably faster than calling ``validate_data()``
+        for each Assessment.
 
-        try:
-            validate_assessment(data, instrument=instrument_definition)
-        except RiosValidationError as exc:
-            msg = [
-                'The following problems were encountered when validating this'
-                ' Assessment:',
-            ]
-            for key, details in list(exc.asdict().items()):
-                msg.append('%s: %s' % (
-                    key or '<root>',
-                    details,
+        :param data: the Assessment data to validate
+        :type data: iterable of dicts or JSON strings
+        :param instrument_definition:
+            the Common Instrument Definition to validate the data against; if
+            not specified, only the adherance to the base Assessment Document
+            definition is checked
+        :type instrument_definition: InstrumentVersion, dict or JSON string
+        :raises:
+            ValidationError if any of the structures fails any of the
+            requirements
+        """
+
+        validator = cls.get_validator(instrument_definition)
+        for idx, item in enumerate(data):
+            try:
+                validator(item)
+            except ValidationError as exc:
+                raise exc.wrap('While validating Assessment:', '#%s' % (
+                    idx + 1,
                 ))
-            raise ValidationError('\n'.join(msg))
 
     @staticmethod
     def generate_empty_data(instrument_version):
@@ -333,6 +475,9 @@ class Assessment(
           variables necessary to create the Assessment in the datastore.
           Optional.
 
+        Implementations should validate the Assessment Documents of each
+        Instrument Version with a single call to ``bulk_validate_data()``.
+
         :param assessments:
             the collection of Assessments to load into the datastore
         :type assessments: iterable of Assessment.BulkAssessment
@@ -532,7 +677,7 @@ class Assessment(
         """
 
         if (not instrument_definition) and self.instrument_version:
-            instrument_definition = self.instrument_version.definition
+            instrument_definition = self.instrument_version
 
         return self.__class__.validate_data(
             self.data,
@@ -83,7 +83,7 @@ class Entry(
             the Common Instrument Definition to validate the data against; if
             not specified, only the adherance to the base Assessment Document
             definition is checked
-        :type instrument_definition: dict or JSON string
+        :type instrument_definition: InstrumentVersion, dict or JSON string
         :raises:
             ValidationError if the specified structure fails any of the
             requirements
@@ -460,8 +460,7 @@ class Entry(
         """
 
         if (not instrument_definition) and self.assessment:
-            instrument_definition = \
-                self.assessment.instrument_version.definition
+            instrument_definition = self.assessment.instrument_version
 
         return self.__class__.validate_data(
             self.data,
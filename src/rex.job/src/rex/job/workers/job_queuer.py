@@ -2,6 +2,8 @@
 # Copyright (c) 2017, Prometheus Research, LLC
 #
 
+from collections import defaultdict
+
 from rex.asynctask import AsyncTaskWorker, get_transport
 from rex.core import get_settings
 from rex.db import get_db
@@ -12,33 +14,60 @@ __all__ = (
 )
 
 
-HTSQL_GET_NEW = '''
-/job{
+# Marks the "new" jobs that can be started without exceeding the
+# ``max_concurrency`` of their type as "queued". The jobs of each type are
+# numbered in the order they were submitted, so a type with N free slots
+# admits its N oldest jobs.
+SQL_QUEUE_NEW = '''
+WITH job_limit AS (
+    SELECT
+        type,
+        max_concurrency
+    FROM
+        unnest(%s::text[], %s::integer[]) AS job_limit (type, max_concurrency)
+),
+job_running AS (
+    SELECT
+        type,
+        COUNT(*) AS num_running
+    FROM
+        job
+    WHERE
+        status IN ('started', 'queued')
+    GROUP BY
+        type
+),
+job_new AS (
+    SELECT
         code,
         type,
-    }
-    .filter(
-        status='new'
-    )
-    .sort(
-        date_submitted,
-        code
+        ROW_NUMBER() OVER (
+            PARTITION BY type
+            ORDER BY date_submitted, code
+        ) AS position
+    FROM
+        job
+    WHERE
+        status = 'new'
+)
+UPDATE
+    job
+SET
+    status = 'queued'
+FROM
+    job_new
+    LEFT JOIN job_limit ON job_limit.type = job_new.type
+    LEFT JOIN job_running ON job_running.type = job_new.type
+WHERE
+    job.code = job_new.code
+    AND (
+        job_limit.max_concurrency IS NULL
+        OR job_new.position + COALESCE(job_running.num_running, 0)
+            <= job_limit.max_concurrency
     )
-'''
-
-HTSQL_CHECK_RUNNING = '''
-/count(job.filter(
-    type = $job_type
-    & status = {'started', 'queued'}
-))
-'''
-
-HTSQL_UPDATE_NEW = '''
-/job[$job]{
-        id(),
-        'queued' :as status,
-    }
-    /:update
+RETURNING
+    job.code,
+    job.date_submitted
 '''
 
 
@@ -55,23 +84,35 @@ class JobQueuerWorker(AsyncTaskWorker):
         database = get_db()
         transport = get_transport()
 
-        queue_num = 0
-        for job in database.produce(HTSQL_GET_NEW):
-            if job.type in get_settings().job_limits:
-                max_concurrency = get_settings() \
-                    .job_limits[job.type]['max_concurrency']
-                if max_concurrency is not None:
-                    num_type_running = database.produce(
-                        HTSQL_CHECK_RUNNING,
-                        job_type=job.type,
-                    )[0]
-                    if num_type_running >= max_concurrency:
-                        continue
+        limits = [
+            (job_type, limit['max_concurrency'])
+            for job_type, limit in get_settings().job_limits.items()
+            if limit['max_concurrency'] is not None
+        ]
 
-            transport.submit_task(
-                'rex_job_%s' % queue_num,
-                {'code': job.code},
+        # The jobs are only committed as "queued" once the tasks have been
+        # submitted; if the submission fails, they remain "new".
+        with database, database.transaction() as connection:
+            cursor = connection.cursor()
+            cursor.execute(
+                SQL_QUEUE_NEW,
+                (
+                    [job_type for job_type, _ in limits],
+                    [max_concurrency for _, max_concurrency in limits],
+                ),
+            )
+            jobs = sorted(
+                cursor.fetchall(),
+                key=lambda job: (job[1], job[0]),
             )
-            database.produce(HTSQL_UPDATE_NEW, job=job.code)
-            queue_num = (queue_num + 1) % get_settings().job_queues
 
+            payloads = defaultdict(list)
+            for queue_num, job in enumerate(jobs):
+                payloads[queue_num % get_settings().job_queues].append(
+                    {'code': job[0]},
+                )
+            for queue_num in sorted(payloads):
+                transport.submit_tasks(
+                    'rex_job_%s' % queue_num,
+                    payloads[queue_num],
+                )
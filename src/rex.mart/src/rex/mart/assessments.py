@@ -3,6 +3,14 @@
 #
 
 
+import multiprocessing
+import queue
+import threading
+
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from rex.core import Error, get_rex, get_settings
 from rex.port import Port
 from rex.port.replace import adapt, flatten, match, patch
 from rex.instrument import Assessment
@@ -15,6 +23,10 @@ __all__ = (
 )
 
 
+# The number of chunks that can be waiting in each stage of the loader.
+PIPELINE_DEPTH = 4
+
+
 class AssessmentLoader(object):
     def __init__(self, definition, database, parameters=None):
         self.definition = definition
@@ -35,50 +47,93 @@ class AssessmentLoader(object):
         params['INSTRUMENT'] = self.definition['instrument']
         return params
 
-    def load(self, database):
+    def load(self, database, log=None):
+        settings = get_settings()
+        chunk_size = settings.mart_assessment_chunk_size
+        processes = settings.mart_assessment_processes
+
         tree = self.mapping.get_port_tree()
         port = Port(tree, database)
-        assessment_impl = Assessment.get_implementation()
 
-        num_assessments = 0
         selected = database.produce(
             self.definition['selector']['query'],
             **self.get_selector_params()
         )
+        num_selected = len(selected)
+        chunks = [
+            selected[i:i + chunk_size]
+            for i in range(0, num_selected, chunk_size)
+        ]
 
-        for i in range(0, len(selected), 100):
-            # Retrieve a batch of Assessments from the datastore
-            selected_value_map = dict([
-                (str(rec.assessment_uid), rec)
-                for rec in selected[i:i + 100]
-            ])
-            assessments = assessment_impl.bulk_retrieve(
-                list(selected_value_map.keys())
-            )
-
-            # Collect port data.
-            dataset = []
-            for assessment in assessments:
-                if not assessment.data:
-                    continue
+        # Retrieval, transformation and writes run concurrently: the
+        # Assessments are retrieved in a separate thread, converted to port
+        # data in a pool of processes (if configured), and written to the
+        # Mart by the current thread.
+        retrieved = queue.Queue(maxsize=PIPELINE_DEPTH)
+        stopped = threading.Event()
+        retriever = threading.Thread(
+            target=_retrieve,
+            args=(get_rex(), chunks, retrieved, stopped),
+        )
+        retriever.daemon = True
 
-                data = self.mapping.get_port_data(
-                    assessment.data,
-                    assessment.instrument_version_uid,
-                    selected_value_map[assessment.uid],
+        executor = None
+        num_assessments = 0
+        num_processed = 0
+        pending = deque()
+        try:
+            if processes > 0 and len(chunks) > 1:
+                executor = _start_executor(
+                    min(processes, len(chunks)),
+                    self.mapping,
                 )
-                data['assessment_uid'] = assessment.uid
-                data['instrument_version_uid'] = \
-                    assessment.instrument_version_uid
-                dataset.append(data)
+            retriever.start()
 
-                num_assessments += 1
-
-            # Submit port data.
-            _insert_into_port(port, dataset)
+            while True:
+                item = retrieved.get()
+                if isinstance(item, BaseException):
+                    raise item
+                if item is not None:
+                    num_selected_chunk, assessments = item
+                    if executor:
+                        result = executor.submit(_transform, assessments)
+                    else:
+                        result = _transform(assessments, self.mapping)
+                    pending.append((num_selected_chunk, result))
+                while pending and (
+                        len(pending) > PIPELINE_DEPTH or item is None):
+                    num_selected_chunk, result = pending.popleft()
+                    num_assessments += self._write(port, result)
+                    num_processed += num_selected_chunk
+                    if log and num_selected > chunk_size:
+                        log('...%s of %s Assessments processed' % (
+                            num_processed,
+                            num_selected,
+                        ))
+                if item is None:
+                    break
+        finally:
+            stopped.set()
+            while retriever.is_alive():
+                # Unblock the retriever if we are bailing out early.
+                try:
+                    retrieved.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            if executor:
+                executor.shutdown()
 
         return num_assessments
 
+    def _write(self, port, result):  # pylint: disable=no-self-use
+        if isinstance(result, Future):
+            result = result.result()
+        dataset, failure = result
+        if failure:
+            raise Error(*failure)
+        _insert_into_port(port, dataset)
+        return len(dataset)
+
     def do_calculations(self, database):
         if not self.definition['post_load_calculations']:
             return
@@ -100,3 +155,104 @@ def _insert_into_port(port, dataset):
         pair_map = match(old_map, new_map)
         patch(pair_map, port._command_cache)  # noqa: protected-access
 
+
+
+class SelectionRecord(object):
+    # A picklable copy of a record produced by the selector query.
+
+    def __init__(self, record):
+        self.__fields__ = tuple(record.__fields__)
+        for name in self.__fields__:
+            setattr(self, name, getattr(record, name))
+
+
+def _retrieve(app, chunks, retrieved, stopped):
+    # Retrieves the Assessments for each chunk of selected records.
+    try:
+        with app:
+            assessment_impl = Assessment.get_implementation()
+            for chunk in chunks:
+                if stopped.is_set():
+                    return
+                selected_value_map = dict([
+                    (str(rec.assessment_uid), rec)
+                    for rec in chunk
+                ])
+                assessments = assessment_impl.bulk_retrieve(
+                    list(selected_value_map.keys())
+                )
+                retrieved.put((len(chunk), [
+                    (
+                        assessment.uid,
+                        assessment.data,
+                        assessment.instrument_version_uid,
+                        SelectionRecord(selected_value_map[assessment.uid]),
+                    )
+                    for assessment in assessments
+                    if assessment.data
+                ]))
+    except Exception as exc:  # pylint: disable=broad-except
+        retrieved.put(exc)
+    else:
+        retrieved.put(None)
+
+
+_MAPPING = None
+_STARTED = None
+
+
+def _start_executor(num_workers, mapping):
+    # Starts a pool of forked worker processes.  All of them are forked
+    # right away, before the retriever thread starts, so that none inherits
+    # a lock or a connection that the thread holds in the middle of a query.
+    context = multiprocessing.get_context('fork')
+    started = context.Barrier(num_workers)
+    executor = ProcessPoolExecutor(
+        max_workers=num_workers,
+        mp_context=context,
+        initializer=_initialize_transform,
+        initargs=(mapping, started),
+    )
+    try:
+        # Each warm-up task waits until all of them are running, so the
+        # executor has to fork a new worker for every one of them.
+        warm_ups = [executor.submit(_warm_up) for _ in range(num_workers)]
+        for warm_up in warm_ups:
+            warm_up.result()
+    except BaseException:
+        executor.shutdown()
+        raise
+    return executor
+
+
+def _warm_up():
+    _STARTED.wait()
+
+
+def _initialize_transform(mapping, started=None):
+    global _MAPPING, _STARTED  # pylint: disable=global-statement
+    _MAPPING = mapping
+    _STARTED = started
+
+
+def _transform(items, mapping=None):
+    # Converts a chunk of Assessments to port data; errors are returned
+    # rather than raised since they have to cross the process boundary.
+    mapping = mapping or _MAPPING
+    dataset = []
+    for uid, data, instrument_version_uid, selection in items:
+        try:
+            port_data = mapping.get_port_data(
+                data,
+                instrument_version_uid,
+                selection,
+            )
+        except Error as exc:
+            return None, ('While processing Assessment:', '%s\n%s' % (
+                uid,
+                exc,
+            ))
+        port_data['assessment_uid'] = uid
+        port_data['instrument_version_uid'] = instrument_version_uid
+        dataset.append(port_data)
+    return dataset, None
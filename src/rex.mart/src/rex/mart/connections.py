@@ -109,7 +109,7 @@ def get_latest_mart_db(definition, extensions=None):
     return get_mart_db(data[0], extensions=extensions)
 
 
-def get_mart_etl_db(name, extensions=None):
+def get_mart_etl_db(name, extensions=None, query_cache_size=0):
     """
     Returns an HTSQL instance connected to the specified Mart database. This
     instance is configured specifically for use in the ETL phases of Mart
@@ -121,6 +121,11 @@ def get_mart_etl_db(name, extensions=None):
         the HTSQL extensions to enable/configure, in addition to those defined
         by the ``mart_etl_htsql_extension`` setting
     :type extensions: dict
+    :param query_cache_size:
+        the number of compiled queries to keep in the instance, unless
+        configured by the ``mart_etl_htsql_extension`` setting; if not
+        specified, defaults to 0 (caching is disabled)
+    :type query_cache_size: int
     :rtype: rex.db.RexHTSQL
     """
 
@@ -144,7 +149,7 @@ def get_mart_etl_db(name, extensions=None):
 
     ext = {
         'htsql': {
-            'query_cache_size': 0,
+            'query_cache_size': query_cache_size,
         }
     }
     ext.update(get_settings().mart_etl_htsql_extensions)
@@ -5,10 +5,12 @@
 
 import gc
 import sys
+import time
 
 from copy import deepcopy
 from datetime import datetime
 
+from htsql_pgsql.tweak.snapshot.introspect import FINGERPRINT_SQL
 from rex.core import Error, get_settings
 from rex.deploy import model as deploy_model
 
@@ -66,6 +68,10 @@ HTSQL_UPDATE_COMPLETION_DETAILS = '''/rexmart_inventory{
 /:update'''
 
 
+#: The number of compiled HTSQL queries kept while the Mart is being built.
+ETL_QUERY_CACHE_SIZE = 1024
+
+
 class MartCreator(object):
     """
     A class that encapsulates the process of creating a Mart database.
@@ -84,6 +90,7 @@ class MartCreator(object):
         self.code = None
         self.name = None
         self.database = None
+        self.schema_fingerprint = None
         self.logger = None
         self.assessment_mappings = []
         self.parameters = {}
@@ -459,7 +466,10 @@ class MartCreator(object):
             return
 
         for idx, script in enumerate(scripts):
-            self.reconnect_mart()
+            # Scripts rarely change the structure of the Mart, so the HTSQL
+            # instance (along with its metadata and compiled queries) is
+            # only rebuilt when one does.
+            self.refresh_mart()
 
             idx_label = '#%s' % (idx + 1,)
             self.log('%s script %s...' % (
@@ -472,16 +482,20 @@ class MartCreator(object):
             if script['type'] == 'htsql':
                 statements = extract_htsql_statements(script['script'])
                 with guarded('While executing HTSQL script:', idx_label):
-                    for statement in statements:
+                    for stmt_idx, statement in enumerate(statements):
                         with guarded('While executing statement:', statement):
+                            started = time.time()
                             self.database.produce(statement, **params)
+                            self.log_statement(stmt_idx, started)
 
             elif script['type'] == 'sql':
                 with guarded('While executing SQL script:', idx_label):
                     with get_sql_connection(self.database) as sql:
                         cursor = sql.cursor()
                         try:
+                            started = time.time()
                             cursor.execute(script['script'], params)
+                            self.log_statement(0, started)
                         finally:
                             cursor.close()
 
@@ -490,6 +504,12 @@ class MartCreator(object):
                     script['type'],
                 ))
 
+    def log_statement(self, idx, started):
+        self.log('...statement #%s completed in %.3fs' % (
+            idx + 1,
+            time.time() - started,
+        ))
+
     def load_assessments(self):
         if not self.definition['assessments']:
             return
@@ -521,7 +541,7 @@ class MartCreator(object):
 
                 with guarded('While loading Assessments'):
                     self.log('...loading Assessments')
-                    num_loaded = loader.load(self.database)
+                    num_loaded = loader.load(self.database, log=self.log)
                     self.log('...%s Assessments loaded' % (
                         num_loaded,
                     ))
@@ -534,12 +554,17 @@ class MartCreator(object):
 
     def connect_mart(self):
         if not self.database:
-            self.database = get_mart_etl_db(self.name)
+            self.database = get_mart_etl_db(
+                self.name,
+                query_cache_size=ETL_QUERY_CACHE_SIZE,
+            )
+            self.schema_fingerprint = self.get_schema_fingerprint()
 
     def close_mart(self):
         # Force collection of the HTSQL instance to try to avoid corrupting
         # future instances.
         self.database = None
+        self.schema_fingerprint = None
         gc.collect()
 
     def reconnect_mart(self):
@@ -547,6 +572,23 @@ class MartCreator(object):
             self.close_mart()
         self.connect_mart()
 
+    def refresh_mart(self):
+        # Reconnects if the structure of the Mart database has changed since
+        # the HTSQL instance was created.
+        if self.database and \
+                self.get_schema_fingerprint() != self.schema_fingerprint:
+            self.close_mart()
+        self.connect_mart()
+
+    def get_schema_fingerprint(self):
+        with get_sql_connection(self.database) as sql:
+            cursor = sql.cursor()
+            try:
+                cursor.execute(FINGERPRINT_SQL)
+                return cursor.fetchone()
+            finally:
+                cursor.close()
+
     def execute_processors(self, processors):
         if not processors:
             return
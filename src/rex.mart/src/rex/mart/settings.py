@@ -20,6 +20,8 @@ __all__ = (
     'MartMaxMartsPerOwnerSetting',
     'MartDefaultMaxMartsPerOwnerDefinitionSetting',
     'MartHtsqlCacheDepthSetting',
+    'MartAssessmentChunkSizeSetting',
+    'MartAssessmentProcessesSetting',
 )
 
 
@@ -220,3 +222,30 @@ class MartDictionaryChannelPrioritySetting(Setting):
     validate = SeqVal(StrVal())
     default = []
 
+
+
+class MartAssessmentChunkSizeSetting(Setting):
+    """
+    Specifies the number of Assessments that are retrieved, transformed and
+    written to a Mart at a time.
+
+    If not specified, defaults to 100.
+    """
+
+    name = 'mart_assessment_chunk_size'
+    validate = IntVal(min_bound=1)
+    default = 100
+
+
+class MartAssessmentProcessesSetting(Setting):
+    """
+    Specifies the number of processes used to convert Assessment data into
+    Mart table records while loading Assessments. Use ``0`` to perform the
+    conversion in the loading process itself.
+
+    If not specified, defaults to 0.
+    """
+
+    name = 'mart_assessment_processes'
+    validate = IntVal(min_bound=0)
+    default = 0
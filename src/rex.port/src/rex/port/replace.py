@@ -395,6 +395,9 @@ def patch(pair_map, command_cache):
         identities = []
         identity_map[schema_path] = identities
 
+        # Consecutive commands of the same kind are executed together.
+        batch = []
+
         for old_cell, new_cell in pairs:
             node = old_cell.node if old_cell is not None else new_cell.node
             if old_cell is None:
@@ -409,10 +412,16 @@ def patch(pair_map, command_cache):
                 identity = old_cell.identity
                 old_fields = old_cell.fields
                 new_fields = new_cell.fields
+            arcs = None
             if new_fields is not None:
                 resolved_fields = []
                 for field in new_fields:
                     if isinstance(field, Reference):
+                        if field not in reference_to_identity and batch:
+                            # The reference may point to a pending record.
+                            execute(batch, reference_to_identity, identities,
+                                    command_cache)
+                            batch = []
                         if field not in reference_to_identity:
                             raise Error("Got unknown reference:", field)
                         field = reference_to_identity[field]
@@ -431,26 +440,65 @@ def patch(pair_map, command_cache):
                         trimmed_fields.append(field)
                 new_fields = trimmed_fields
             if old_fields is None:
-                new_identity = insert(node, arcs, new_fields, command_cache)
+                operation = insert
             elif new_fields is None:
-                delete(node, identity, command_cache)
-                new_identity = None
+                operation = delete
             else:
-                new_identity = update(
-                        node, arcs, identity, new_fields, command_cache)
-            if new_identity is not None:
-                reference_to_identity[new_cell.reference] = new_identity
-                identity_cell = Cell(new_cell.node, new_cell.reference,
-                                     new_identity, None)
-                identities.append(identity_cell)
+                operation = update
+            kind = (operation, node, tuple(arcs or ()))
+            if batch and batch[0][0] != kind:
+                execute(batch, reference_to_identity, identities,
+                        command_cache)
+                batch = []
+            batch.append((kind, new_cell, identity, new_fields))
+        if batch:
+            execute(batch, reference_to_identity, identities, command_cache)
     return identity_map
 
 
+def execute(batch, reference_to_identity, identities, command_cache):
+    # Executes a sequence of commands of the same kind.
+    (operation, node, arcs) = batch[0][0]
+    arcs = list(arcs)
+    if operation is insert:
+        new_identities = insert_many(
+                node, arcs, [fields for kind, cell, identity, fields in batch],
+                command_cache)
+    elif operation is delete:
+        delete_many(
+                node, [identity for kind, cell, identity, fields in batch],
+                command_cache)
+        new_identities = [None]*len(batch)
+    else:
+        new_identities = update_many(
+                node, arcs,
+                [(identity, fields) for kind, cell, identity, fields in batch],
+                command_cache)
+    for (kind, new_cell, identity, fields), new_identity \
+            in zip(batch, new_identities):
+        if new_identity is not None:
+            reference_to_identity[new_cell.reference] = new_identity
+            identity_cell = Cell(new_cell.node, new_cell.reference,
+                                 new_identity, None)
+            identities.append(identity_cell)
+
+
+# The maximum number of parameters in a single SQL statement.
+MAX_PARAMETERS = 32767
+
+
 def insert(node, arcs, fields, command_cache):
     # Inserts a record.
+    [identity] = insert_many(node, arcs, [fields], command_cache)
+    return identity
+
+
+def insert_many(node, arcs, fields_set, command_cache):
+    # Inserts a sequence of records using multi-row statements.
     cache_key = (insert, node, tuple(arcs))
     try:
-        command = command_cache[cache_key]
+        extract_table, execute_insert, resolve_identity = \
+                command_cache[cache_key]
     except KeyError:
         extract_table = BuildExtractTable.__invoke__(
                 node, arcs)
@@ -459,17 +507,34 @@ def insert(node, arcs, fields, command_cache):
         resolve_identity = BuildResolveIdentity.__invoke__(
                 execute_insert.table, execute_insert.output_columns,
                 is_list=False)
-        command = command_cache[cache_key] = (
-                lambda fields:
-                    resolve_identity(execute_insert(extract_table(fields))))
-    return command(fields)
+        command_cache[cache_key] = (
+                extract_table, execute_insert, resolve_identity)
+    rows = [extract_table(fields) for fields in fields_set]
+    width = max(len(execute_insert.input_columns),
+                len(execute_insert.output_columns)*2, 1)
+    size = max(1, MAX_PARAMETERS // width)
+    identities = []
+    for start in range(0, len(rows), size):
+        # The generated keys are matched to the rows by the pipe, and
+        # the identities are matched to the keys, so neither relies on
+        # the order of the returned rows.
+        keys = execute_insert.batch(rows[start:start+size])
+        identities.extend(resolve_identity.batch(keys))
+    return identities
 
 
 def update(node, arcs, identity, fields, command_cache):
     # Updates a record.
+    [identity] = update_many(node, arcs, [(identity, fields)], command_cache)
+    return identity
+
+
+def update_many(node, arcs, changes, command_cache):
+    # Updates a sequence of records using multi-row statements.
     cache_key = (update, node, tuple(arcs))
     try:
-        command = command_cache[cache_key]
+        resolve_key, extract_table, execute_update, resolve_identity = \
+                command_cache[cache_key]
     except KeyError:
         resolve_key = BuildResolveKey.__invoke__(
                 node, arcs)
@@ -480,29 +545,45 @@ def update(node, arcs, identity, fields, command_cache):
         resolve_identity = BuildResolveIdentity.__invoke__(
                 execute_update.table, execute_update.output_columns,
                 is_list=False)
-        command = command_cache[cache_key] = (
-                lambda identity, fields:
-                    resolve_identity(
-                        execute_update(
-                            resolve_key(identity),
-                            extract_table(fields))))
-    return command(identity, fields)
+        command_cache[cache_key] = (
+                resolve_key, extract_table, execute_update, resolve_identity)
+    old_identities = [identity for identity, fields in changes]
+    rows = [extract_table(fields) for identity, fields in changes]
+    width = max(len(execute_update.input_columns)+
+                len(execute_update.key_columns),
+                len(resolve_key.leaves)*2,
+                len(execute_update.output_columns)*2, 1)
+    size = max(1, MAX_PARAMETERS // width)
+    identities = []
+    for start in range(0, len(rows), size):
+        key_rows = resolve_key.batch(old_identities[start:start+size])
+        keys = execute_update.batch(key_rows, rows[start:start+size])
+        identities.extend(resolve_identity.batch(keys))
+    return identities
 
 
 def delete(node, identity, command_cache):
     # Deletes a record.
+    delete_many(node, [identity], command_cache)
+
+
+def delete_many(node, identities, command_cache):
+    # Deletes a sequence of records using multi-key statements.
     cache_key = (delete, node)
     try:
-        command = command_cache[cache_key]
+        resolve_key, execute_delete = command_cache[cache_key]
     except KeyError:
         resolve_key = BuildResolveKey.__invoke__(
                 node, [])
         execute_delete = BuildExecuteDelete.__invoke__(
                 node.table)
-        command = command_cache[cache_key] = (
-                lambda identity:
-                    execute_delete(resolve_key(identity)))
-    return command(identity)
+        command_cache[cache_key] = (resolve_key, execute_delete)
+    width = max(len(execute_delete.key_columns),
+                len(resolve_key.leaves)*2, 1)
+    size = max(1, MAX_PARAMETERS // width)
+    for start in range(0, len(identities), size):
+        key_rows = resolve_key.batch(identities[start:start+size])
+        execute_delete.batch(key_rows)
 
 
 def verify(identity_map, actual_map):
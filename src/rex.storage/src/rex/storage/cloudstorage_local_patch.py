@@ -37,6 +37,8 @@ from cloudstorage.typed import (
     MetaData,
 )
 
+from .stream import open_range
+
 __all__ = ['LocalDriver']
 
 logger = logging.getLogger(__name__)
@@ -71,6 +73,24 @@ def lock_local_file(path: str) -> filelock.FileLock:
     os.remove(lock.lock_file)
 
 
+class LocalBlob(Blob):
+    """Blob which calculates the checksum of the file on demand."""
+
+    _file_path = None
+
+    @property
+    def checksum(self) -> str:
+        if self._checksum is None and self._file_path is not None:
+            file_hash = file_checksum(self._file_path,
+                                      hash_type=self.driver.hash_type)
+            self._checksum = file_hash.hexdigest()
+        return self._checksum
+
+    @checksum.setter
+    def checksum(self, value: str) -> None:
+        self._checksum = value
+
+
 class LocalDriver(Driver):
     """Driver for interacting with local file-system.
 
@@ -299,8 +319,8 @@ class LocalDriver(Driver):
         return Container(name=folder_name, driver=self, meta_data=None,
                          created_at=created_at)
 
-    def _make_blob(self, container: Container, object_name: str) -> Blob:
-        """Convert local file name to a Cloud Storage Blob.
+    def _get_object_path(self, container: Container, object_name: str) -> str:
+        """Get the full path of an object; the object may not exist.
 
         :param container: Container instance.
         :type container: :class:`.Container`
@@ -308,8 +328,10 @@ class LocalDriver(Driver):
         :param object_name: Filename.
         :type object_name: str
 
-        :return: Blob instance.
-        :rtype: :class:`.Blob`
+        :return: Full path to the object.
+        :rtype: str
+
+        :raise NotFoundError: If the path is outside of the container.
         """
         base_path = pathlib.Path(self.base_path)
         # we have to use `os.path.normapth` here since Path.resolve() also
@@ -322,10 +344,24 @@ class LocalDriver(Driver):
         if container_path not in object_path.parents:
             raise NotFoundError(messages.BLOB_NOT_FOUND % (object_name,
                                                            container.name))
-        full_path = str(object_path)
+        return str(object_path)
+
+    def _make_blob(self, container: Container, object_name: str) -> Blob:
+        """Convert local file name to a Cloud Storage Blob.
+
+        :param container: Container instance.
+        :type container: :class:`.Container`
+
+        :param object_name: Filename.
+        :type object_name: str
+
+        :return: Blob instance.
+        :rtype: :class:`.Blob`
+        """
+        full_path = self._get_object_path(container, object_name)
 
         try:
-            stat = os.stat(str(object_path))
+            stat = os.stat(full_path)
         except FileNotFoundError:
             raise NotFoundError(messages.BLOB_NOT_FOUND % (object_name,
                                                            container.name))
@@ -360,21 +396,19 @@ class LocalDriver(Driver):
         except OSError:
             logger.warning(messages.LOCAL_NO_ATTRIBUTES)
 
-        # TODO: QUESTION: Option to disable checksum for large files?
-        # TODO: QUESTION: Save a .hash file for each file?
-        file_hash = file_checksum(full_path, hash_type=self.hash_type)
-        checksum = file_hash.hexdigest()
-
+        # The checksum is calculated when it is requested for the first time.
         etag = hashlib.sha1(full_path.encode('utf-8')).hexdigest()
         created_at = datetime.fromtimestamp(stat.st_ctime, timezone.utc)
         modified_at = datetime.fromtimestamp(stat.st_mtime, timezone.utc)
 
-        return Blob(name=object_name, checksum=checksum, etag=etag,
-                    size=stat.st_size, container=container, driver=self,
-                    acl=None, meta_data=meta_data,
-                    content_disposition=content_disposition,
-                    content_type=content_type, cache_control=cache_control,
-                    created_at=created_at, modified_at=modified_at)
+        blob = LocalBlob(name=object_name, checksum=None, etag=etag,
+                         size=stat.st_size, container=container, driver=self,
+                         acl=None, meta_data=meta_data,
+                         content_disposition=content_disposition,
+                         content_type=content_type, cache_control=cache_control,
+                         created_at=created_at, modified_at=modified_at)
+        blob._file_path = full_path
+        return blob
 
     def validate_credentials(self) -> None:
         if not os.access(self.base_path, os.W_OK):
@@ -521,6 +555,28 @@ class LocalDriver(Driver):
                 for data in read_in_chunks(blob_file):
                     destination.write(data)
 
+    def open_blob(self, container: Container, blob_name: str,
+                  start: int = None, end: int = None):
+        """Open a blob for reading, optionally limited to a byte range.
+
+        :raise NotFoundError: If the blob does not exist.
+        """
+        path = self._get_object_path(container, blob_name)
+        try:
+            fobj = open(path, 'rb')
+        except (FileNotFoundError, IsADirectoryError):
+            raise NotFoundError(messages.BLOB_NOT_FOUND % (blob_name,
+                                                           container.name))
+        return open_range(fobj, start, end)
+
+    def blob_exists(self, container: Container, blob_name: str) -> bool:
+        """Check if a blob exists without loading its attributes."""
+        try:
+            path = self._get_object_path(container, blob_name)
+        except NotFoundError:
+            return False
+        return os.path.isfile(path)
+
     def patch_blob(self, blob: Blob) -> None:
         raise NotImplementedError
 
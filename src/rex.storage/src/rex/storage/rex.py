@@ -25,6 +25,8 @@ from cloudstorage.typed import (
 
 from rex.core import get_packages
 
+from .stream import open_range
+
 
 def _get_all_packages() -> Iterable[str]:
     return [
@@ -163,6 +165,19 @@ class RexDriver(Driver):
                 for data in read_in_chunks(blob_file):
                     destination.write(data)
 
+    def open_blob(
+            self,
+            container: Container,
+            blob_name: str,
+            start: int = None,
+            end: int = None):
+        blob = self._make_blob(container, blob_name)
+        fobj = open(_get_file_path(container.name, blob.name), 'rb')
+        return open_range(fobj, start, end)
+
+    def blob_exists(self, container: Container, blob_name: str) -> bool:
+        return os.path.isfile(_get_file_path(container.name, blob_name))
+
     def generate_blob_download_url(
             self,
             blob: Blob,
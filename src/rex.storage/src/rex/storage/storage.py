@@ -12,6 +12,7 @@ from rex.core import get_settings, cached
 from .util import parse_url, join
 from .driver import get_driver
 from .errors import StorageError
+from .stream import CHUNK_SIZE, EncodingReader, open_range
 
 
 @cached
@@ -174,6 +175,28 @@ class Path:
         """
         return get_storage().get(self, encoding=encoding)
 
+    def open(self, start=None, end=None, encoding=None):
+        """
+        Opens the object for streaming reads.
+
+        :param start: the offset of the first byte to read
+        :type start: int
+        :param end: the offset after the last byte to read
+        :type end: int
+        :param encoding:
+            if the content of the object is text, this is the encoding to use
+            to decode the bytes when reading it
+        :type encoding: str
+        :rtype: rex.storage.File
+        """
+        return get_storage().open(self, start=start, end=end, encoding=encoding)
+
+    def exists(self):
+        """
+        Determines whether or not this Path is an actual object in the system.
+        """
+        return get_storage().exists(self)
+
     def delete(self):
         """
         Deletes the object from the container.
@@ -356,10 +379,10 @@ class Storage:
                 content.encoding or encoding,
             ))
         elif isinstance(content, io.TextIOBase):
-            # This is not optimal, as it requires us to read the whole thing
-            # into memory.
-            content = io.BytesIO(
-                content.read().encode(content.encoding or encoding),
+            # Encode the content as it is being uploaded.
+            content = io.BufferedReader(
+                EncodingReader(content, content.encoding or encoding),
+                CHUNK_SIZE,
             )
 
         try:
@@ -385,17 +408,16 @@ class Storage:
 
         path = self.parse_path(storage_path)
 
-        if isinstance(file_or_path, str):
-            file = open(file_or_path, 'wb')
-        else:
-            file = file_or_path
-
         try:
             blob = path.mount.container.get_blob(path.container_location)
         except cloudstorage.exceptions.NotFoundError as exc:
             raise StorageError(str(exc))
 
-        blob.download(file)
+        if isinstance(file_or_path, str):
+            with open(file_or_path, 'wb') as file:
+                blob.download(file)
+        else:
+            blob.download(file_or_path)
 
     def get(self, storage_path, encoding=None):
         """
@@ -410,19 +432,61 @@ class Storage:
         :rtype: rex.storage.File
         """
 
-        tmp = tempfile.TemporaryFile()
+        return self.open(storage_path, encoding=encoding)
+
+    def open(self, storage_path, start=None, end=None, encoding=None):
+        """
+        Opens an object in the system for streaming reads, optionally
+        limited to a range of bytes.
+
+        Objects in local and RexDB package containers are read directly from
+        the disk; objects in other containers are downloaded to a temporary
+        file first.
+
+        :param storage_path: the path of the object to read
+        :type storage_path: str|rex.storage.Path
+        :param start: the offset of the first byte to read
+        :type start: int
+        :param end: the offset after the last byte to read
+        :type end: int
+        :param encoding:
+            if the content of the object is text, this is the encoding to use
+            to decode the bytes when reading it
+        :type encoding: str
+        :rtype: rex.storage.File
+        """
+
+        if start is not None and start < 0:
+            raise StorageError(f'Invalid start of the range: {start}')
+        if end is not None and end < (start or 0):
+            raise StorageError(f'Invalid end of the range: {end}')
 
         path = self.parse_path(storage_path)
-        self.download(path, tmp)
-        tmp.seek(0)
+        container = path.mount.container
+        open_blob = getattr(container.driver, 'open_blob', None)
+
+        if open_blob is not None:
+            try:
+                fobj = open_blob(
+                    container,
+                    path.container_location,
+                    start=start,
+                    end=end,
+                )
+            except cloudstorage.exceptions.NotFoundError as exc:
+                raise StorageError(str(exc))
+        else:
+            tmp = tempfile.TemporaryFile()
+            self.download(path, tmp)
+            tmp.seek(0)
+            fobj = open_range(tmp, start, end)
 
         if encoding:
-            tmp = io.TextIOWrapper(
-                io.BufferedReader(tmp),
-                encoding=encoding,
-            )
+            if not isinstance(fobj, io.BufferedIOBase):
+                fobj = io.BufferedReader(fobj)
+            fobj = io.TextIOWrapper(fobj, encoding=encoding)
 
-        return File(path, fobj=tmp)
+        return File(path, fobj=fobj)
 
     def exists(self, storage_path):
         """
@@ -432,7 +496,17 @@ class Storage:
         :param storage_path: the path of the object check for
         :type storage_path: str|rex.storage.Path
         """
-        return len(list(self.object_list(storage_path))) == 1
+
+        path = self.parse_path(storage_path)
+        container = path.mount.container
+        blob_exists = getattr(container.driver, 'blob_exists', None)
+        if blob_exists is not None:
+            return blob_exists(container, path.container_location)
+        try:
+            container.get_blob(path.container_location)
+        except cloudstorage.exceptions.NotFoundError:
+            return False
+        return True
 
     def delete(self, storage_path):
         """
@@ -0,0 +1,100 @@
+import codecs
+import io
+
+
+#: The number of bytes (or characters) to move between streams at once.
+CHUNK_SIZE = 1024 * 1024
+
+
+class RangeReader(io.RawIOBase):
+    """
+    A binary stream that reads at most ``length`` bytes from the underlying
+    binary stream.
+    """
+
+    def __init__(self, fobj, length=None):
+        super().__init__()
+        self._fobj = fobj
+        self._remaining = length
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        size = len(b)
+        if self._remaining is not None:
+            size = min(size, self._remaining)
+        if size <= 0:
+            return 0
+        data = self._fobj.read(size)
+        b[:len(data)] = data
+        if self._remaining is not None:
+            self._remaining -= len(data)
+        return len(data)
+
+    def close(self):
+        if not self.closed:
+            self._fobj.close()
+        super().close()
+
+
+class EncodingReader(io.RawIOBase):
+    """
+    A binary stream that produces the encoded content of the underlying
+    text stream.
+    """
+
+    def __init__(self, fobj, encoding, chunk_size=CHUNK_SIZE):
+        super().__init__()
+        self._fobj = fobj
+        self._encoder = codecs.getincrementalencoder(encoding)()
+        self._chunk_size = chunk_size
+        self._buffer = b''
+        self._offset = 0
+        self._position = 0
+        self._eof = False
+
+    def readable(self):
+        return True
+
+    def tell(self):
+        return self._position
+
+    def readinto(self, b):
+        while self._offset >= len(self._buffer) and not self._eof:
+            text = self._fobj.read(self._chunk_size)
+            if not text:
+                self._buffer = self._encoder.encode('', final=True)
+                self._eof = True
+            else:
+                self._buffer = self._encoder.encode(text)
+            self._offset = 0
+        size = min(len(b), len(self._buffer) - self._offset)
+        b[:size] = self._buffer[self._offset:self._offset+size]
+        self._offset += size
+        self._position += size
+        return size
+
+
+def open_range(fobj, start=None, end=None):
+    """
+    Limits a seekable binary stream to the given byte range.
+
+    :param fobj: the stream to read from
+    :type fobj: io.IOBase
+    :param start: the offset of the first byte to read
+    :type start: int
+    :param end: the offset after the last byte to read
+    :type end: int
+    :rtype: io.IOBase
+    """
+
+    if not start and end is None:
+        return fobj
+    start = start or 0
+    if start:
+        fobj.seek(start)
+    length = None
+    if end is not None:
+        length = max(end - start, 0)
+    return io.BufferedReader(RangeReader(fobj, length))
@@ -118,6 +118,8 @@ def test_object_tree():
 def test_exists():
     assert get_storage().exists('/other-p/1.txt') is True
     assert get_storage().exists('/other-p/doesntexist') is False
+    assert get_storage().exists('/other-p/dir2') is False
+    assert get_storage().parse_path('/other-p/1.txt').exists() is True
 
 
 def test_put():
@@ -156,6 +158,32 @@ def test_get():
     assert content == "1.txt"
 
 
+def test_open():
+    file = get_storage().open('/other-p/1.txt', start=1, end=3)
+    assert file.path.name == '1.txt'
+    assert file.read() == b".t"
+
+    file = get_storage().parse_path('/other-p/1.txt').open(start=2)
+    assert file.read() == b"txt"
+
+    file = get_storage().open('/other-p/1.txt', end=1, encoding='utf8')
+    assert file.read() == "1"
+
+    with pytest.raises(StorageError):
+        get_storage().open('/other-p/doesntexist')
+    with pytest.raises(StorageError):
+        get_storage().open('/other-p/1.txt', start=3, end=2)
+
+
+def test_put_large_textio():
+    content = "\u00fc" * (1024 * 1024 + 1)
+    temp = tempfile.TemporaryFile(mode='w+t', encoding='utf-8')
+    temp.write(content)
+    temp.seek(0)
+    file = get_storage().put("/other-p/large.txt", temp)
+    assert file.read() == content.encode('utf-8')
+
+
 def test_download():
     temp = tempfile.TemporaryFile()
     file = get_storage().download('/other-p/1.txt', temp)
@@ -115,6 +115,14 @@ def test_get():
     assert content == "hello\n"
 
 
+def test_open():
+    file = get_storage().open('/rst/stuff/foo', start=1, end=4)
+    assert file.read() == b"ell"
+
+    file = get_storage().open('/rst/stuff/foo', start=1, encoding='utf8')
+    assert file.read() == "ello\n"
+
+
 def test_driver_iter():
     driver = get_storage().mounts['/rst/'].container.driver
     containers = list(driver)
@@ -9,7 +9,7 @@ from rex.core import Error
 from rex.ctl import RexTask, argument, option, log
 
 from .introspect import get_table_description
-from .load import import_tabular_data
+from .load import import_tabular_data, DEFAULT_BATCH_SIZE
 from .marshal import FILE_FORMATS, FILE_FORMAT_CSV, make_template
 
 
@@ -26,6 +26,13 @@ def file_formats(value):
     raise ValueError('Invalid format type "%s" specified' % value)
 
 
+def positive_integer(value):
+    value = int(value)
+    if value > 0:
+        return value
+    raise ValueError('Invalid positive integer "%s" specified' % value)
+
+
 class TabularImportTemplateTask(RexTask):
     """
     creates a template file that can be used with the tabular-import task
@@ -114,23 +121,34 @@ class TabularImportTask(RexTask):
             ' key fields should be used when null columns are received; by'
             ' default, this is disabled',
         )
+        batch_size = option(
+            None,
+            positive_integer,
+            default=DEFAULT_BATCH_SIZE,
+            value_name='SIZE',
+            hint='the number of records to send to the database at once; if'
+            ' not specified, defaults to %s' % (
+                DEFAULT_BATCH_SIZE,
+            ),
+        )
 
     def __call__(self):
         try:
-            file_content = open(self.data, 'rb').read()
+            file_content = open(self.data, 'rb')
         except Exception as exc:
             raise Error('Could not open "%s" for reading: %s' % (
                 self.data,
                 str(exc),
             )) from None
 
-        with self.make():
+        with self.make(), file_content:
             try:
                 num_imported = import_tabular_data(
                     self.table,
                     file_content,
                     self.format,
                     use_defaults=self.use_defaults,
+                    batch_size=self.batch_size,
                 )
             except Exception as exc:
                 raise Error(str(exc)) from None
@@ -3,9 +3,13 @@
 #
 
 
-from htsql.core.error import Error as HTSQLError
+import io
+
+from htsql.core.context import context
+from htsql.core.error import Error as HTSQLError, PermissionError
 from htsql.core.domain import Profile, RecordDomain, UntypedDomain
-from htsql.core.classify import classify
+from htsql.core.classify import classify, localize
+from htsql.core.model import ChainArc
 from htsql.core.cmd.embed import Embed
 from htsql.tweak.etl.cmd.insert import (
         BuildExtractNode, BuildExtractTable,
@@ -14,15 +18,156 @@ from rex.db import get_db
 
 from .error import TabularImportError
 from .introspect import get_table_description
-from .marshal import get_dataset
+from .marshal import get_records
 
 
 __all__ = (
+    'DEFAULT_BATCH_SIZE',
     'import_tabular_data',
 )
 
 
-def insert(
+#: The default number of records sent to the database at once.
+DEFAULT_BATCH_SIZE = 1000
+
+#: The savepoint used to isolate failed inserts.
+SAVEPOINT = 'tabular_import'
+
+
+def quote_name(name):
+    return '"%s"' % (name.replace('"', '""'),)
+
+
+def to_copy_literal(value):
+    # Converts a value to the text format of the COPY statement.
+    if value is None:
+        return '\\N'
+    if value is True:
+        return 't'
+    if value is False:
+        return 'f'
+    return str(value) \
+        .replace('\\', '\\\\') \
+        .replace('\t', '\\t') \
+        .replace('\n', '\\n') \
+        .replace('\r', '\\r')
+
+
+def refers_to(arc, table, seen=None):
+    # Checks if resolving the link may look up records of the given table,
+    # either directly or through the identity of the link target.
+    if any(join.target == table for join in arc.joins):
+        return True
+    if seen is None:
+        seen = set()
+    if arc.target in seen:
+        return False
+    seen.add(arc.target)
+    return any(
+        refers_to(identity_arc, table, seen)
+        for identity_arc in localize(arc.target) or []
+        if isinstance(identity_arc, ChainArc)
+    )
+
+
+def execute_sql(connection, sql):
+    cursor = connection.cursor()
+    try:
+        cursor.execute(sql)
+    finally:
+        cursor.close()
+
+
+class InsertPlan(object):
+    """
+    The HTSQL ETL chain that inserts records with the same set of columns
+    into a table.
+    """
+
+    def __init__(self, table, columns, domains):
+        meta = Profile(
+                RecordDomain([
+                    Profile(domain, tag=column)
+                    for domain, column in zip(domains, columns)]), tag=table)
+        self.extract_node = BuildExtractNode.__invoke__(meta)
+        self.extract_table = BuildExtractTable.__invoke__(
+                self.extract_node.node,
+                self.extract_node.arcs)
+        self.execute_insert = BuildExecuteInsert.__invoke__(
+                self.extract_table.table,
+                self.extract_table.columns)
+        self._resolve_identity = None
+
+        # Records that link to the table itself could only be resolved
+        # once the preceding records are inserted.
+        self.is_recursive = any(
+                isinstance(arc, ChainArc) and
+                refers_to(arc, self.extract_table.table)
+                for arc in self.extract_node.arcs)
+
+        # Records that do not refer to other tables could be loaded
+        # with COPY.
+        self.copy_sql = None
+        if context.app.htsql.db.engine == 'pgsql' and \
+                self.extract_table.columns and \
+                all(resolve is None for resolve in self.extract_table.resolves):
+            table = self.extract_table.table
+            name = quote_name(table.name)
+            if table.schema.name:
+                name = '%s.%s' % (quote_name(table.schema.name), name)
+            self.copy_sql = 'COPY %s (%s) FROM STDIN' % (
+                name,
+                ', '.join([
+                    quote_name(column.name)
+                    for column in self.extract_table.columns
+                ]),
+            )
+
+    @property
+    def resolve_identity(self):
+        if self._resolve_identity is None:
+            self._resolve_identity = BuildResolveIdentity.__invoke__(
+                    self.execute_insert.table,
+                    self.execute_insert.output_columns,
+                    is_list=False)
+        return self._resolve_identity
+
+    def extract(self, values):
+        """
+        Converts the raw values of a record and resolves its links.
+        """
+        return self.extract_table(self.extract_node(values))
+
+    def __call__(self, values):
+        return self.resolve_identity(self.execute_insert(self.extract(values)))
+
+    def insert_many(self, connection, rows):
+        """
+        Inserts a batch of extracted records.
+        """
+        if self.copy_sql is None or len(rows) == 1:
+            self.execute_insert.batch(rows)
+            return
+        if not context.env.can_write:
+            raise PermissionError("No write permissions")
+        converts = self.execute_insert.input_converts
+        stream = io.StringIO()
+        for row in rows:
+            stream.write('\t'.join([
+                to_copy_literal(convert(item))
+                for item, convert in zip(row, converts)
+            ]))
+            stream.write('\n')
+        stream.seek(0)
+        with connection.guard:
+            cursor = connection.connection.cursor()
+            try:
+                cursor.copy_expert(self.copy_sql, stream)
+            finally:
+                cursor.close()
+
+
+def get_insert_plan(
         table,
         columns,
         values,
@@ -40,43 +185,79 @@ def insert(
             domains.append(value.domain)
     cache_key = (table, tuple(columns), tuple(domains))
     if cache_key not in query_cache:
-        meta = Profile(
-                RecordDomain([
-                    Profile(domain, tag=column)
-                    for domain, column in zip(domains, columns)]), tag=table)
-        extract_node = BuildExtractNode.__invoke__(meta)
-        extract_table = BuildExtractTable.__invoke__(
-                extract_node.node,
-                extract_node.arcs)
-        execute_insert = BuildExecuteInsert.__invoke__(
-                extract_table.table,
-                extract_table.columns)
-        resolve_identity = BuildResolveIdentity.__invoke__(
-                execute_insert.table,
-                execute_insert.output_columns,
-                is_list=False)
-        query = query_cache[cache_key] = (
-                lambda values:
-                    resolve_identity(
-                    execute_insert(
-                    extract_table(
-                    extract_node(values)))))
-    query = query_cache[cache_key]
-    return query(row)
+        query_cache[cache_key] = InsertPlan(table, columns, domains)
+    return query_cache[cache_key], row
+
+
+def insert(
+        table,
+        columns,
+        values,
+        query_cache,
+        untyped=UntypedDomain()):
+    plan, row = get_insert_plan(table, columns, values, query_cache, untyped)
+    return plan(row)
+
+
+def insert_batch(connection, batch, error):
+    # Inserts a batch of `(index, record, plan, row)` entries; consecutive
+    # records with the same set of columns are inserted together, so the
+    # records are stored in the order of the file.  When a group fails,
+    # its records are inserted one by one to find the offending ones.
+    groups = []
+    for entry in batch:
+        if groups and groups[-1][0] is entry[2]:
+            groups[-1][1].append(entry)
+        else:
+            groups.append((entry[2], [entry]))
+
+    for plan, entries in groups:
+        if len(entries) > 1:
+            execute_sql(connection, 'SAVEPOINT %s' % (SAVEPOINT,))
+            try:
+                plan.insert_many(connection, [entry[3] for entry in entries])
+            except HTSQLError:
+                execute_sql(
+                    connection,
+                    'ROLLBACK TO SAVEPOINT %s' % (SAVEPOINT,),
+                )
+            else:
+                execute_sql(connection, 'RELEASE SAVEPOINT %s' % (SAVEPOINT,))
+                continue
+            execute_sql(connection, 'RELEASE SAVEPOINT %s' % (SAVEPOINT,))
+
+        for row_idx, record, plan, row in entries:
+            execute_sql(connection, 'SAVEPOINT %s' % (SAVEPOINT,))
+            try:
+                plan.execute_insert(row)
+            except HTSQLError as exc:
+                if not error:
+                    error = TabularImportError()
+                error.add_row_error(record, row_idx, exc)
+                execute_sql(
+                    connection,
+                    'ROLLBACK TO SAVEPOINT %s' % (SAVEPOINT,),
+                )
+            execute_sql(connection, 'RELEASE SAVEPOINT %s' % (SAVEPOINT,))
+
+    return error
 
 
 def import_tabular_data(
         table_name,
         file_content,
         file_format,
-        use_defaults=False):
+        use_defaults=False,
+        batch_size=DEFAULT_BATCH_SIZE):
     """
     Imports a set of records from a flat file into a table.
 
     :param table_name: the name of the table to import the records into
     :type table_name: str
-    :param file_content: the content of the file that contains the records
-    :type file_content: str
+    :param file_content:
+        the content of the file that contains the records, or a file object
+        to read the records from
+    :type file_content: str, bytes, or file
     :param file_format:
         the file format the file that contains the records; see
         ``FILE_FORMATS`` for possible values
@@ -86,11 +267,18 @@ def import_tabular_data(
         fields should be used when NULL values are received; if not specified,
         defaults to False
     :type use_defaults: bool
+    :param batch_size:
+        the number of records to send to the database at once; if not
+        specified, defaults to ``DEFAULT_BATCH_SIZE``
+    :type batch_size: int
     :returns: the number of records that were imported into the table
     :raises:
         TabularImportError if there was a problem trying to import the records
     """
 
+    if batch_size < 1:
+        raise ValueError('Batch size must be a positive integer')
+
     # Get table info
     description = get_table_description(table_name)
     if not description:
@@ -101,13 +289,13 @@ def import_tabular_data(
         if col['identity']
     ]
 
-    # Parse the file
-    data = get_dataset(file_content, file_format)
+    # Start parsing the file
+    headers, records = get_records(file_content, file_format)
 
     # Make sure we've got the right set of columns
     description_headers = set([col['name'] for col in description['columns']])
-    file_headers = set(data.headers)
-    if len(file_headers) != len(data.headers):
+    file_headers = set(headers)
+    if len(file_headers) != len(headers):
         raise TabularImportError(
             'Incoming dataset has duplicate column headers'
         )
@@ -127,14 +315,27 @@ def import_tabular_data(
         )
 
     error = None
+    num_records = 0
     db = get_db()
     query_cache = {}
     with db:
         with db.transaction() as db_connection:
-            for row_idx, row in enumerate(data):
+            batch = []
+            for row_idx, row in enumerate(records):
+                num_records += 1
+                if len(row) != len(headers):
+                    if not error:
+                        error = TabularImportError()
+                    error.add_row_error(
+                        row,
+                        row_idx + 1,
+                        'Incorrect number of columns',
+                    )
+                    continue
+
                 col_names = []
                 col_values = []
-                for col_idx, col_name in enumerate(data.headers):
+                for col_idx, col_name in enumerate(headers):
                     if row[col_idx] != '':
                         col_names.append(col_name)
                         col_values.append(row[col_idx])
@@ -149,21 +350,38 @@ def import_tabular_data(
                             col_values.append(None)
 
                 try:
-                    insert(table_name, col_names, col_values, query_cache)
+                    plan, values = get_insert_plan(
+                        table_name,
+                        col_names,
+                        col_values,
+                        query_cache,
+                    )
+                    if batch and plan.is_recursive:
+                        error = insert_batch(db_connection, batch, error)
+                        batch = []
+                    values = plan.extract(values)
                 except HTSQLError as exc:
                     if not error:
                         error = TabularImportError()
                     error.add_row_error(row, row_idx + 1, exc)
 
-                    # Yes, the context manager will automatically do a rollback
-                    # for us at the end of the loop, but we want to reset the
-                    # database transaction so we can keep trying more rows to
-                    # determine if other rows have problems, too.
+                    # The database transaction is going to be rolled back
+                    # anyway, but we want to reset it so we can keep trying
+                    # more rows to determine if other rows have problems, too.
                     db_connection.rollback()
+                    continue
+
+                batch.append((row_idx + 1, row, plan, values))
+                if len(batch) >= batch_size:
+                    error = insert_batch(db_connection, batch, error)
+                    batch = []
+
+            if batch:
+                error = insert_batch(db_connection, batch, error)
 
             if error:
                 db_connection.rollback()
+                error.row_errors.sort(key=lambda row_error: row_error['index'])
                 raise error
 
-    return len(data)
-
+    return num_records
@@ -3,6 +3,9 @@
 #
 
 
+import csv
+import io
+
 from tablib import Dataset, formats, InvalidDimensions
 
 from .error import TabularImportError
@@ -15,6 +18,7 @@ __all__ = (
     'FILE_FORMAT_XLS',
     'make_template',
     'get_dataset',
+    'get_records',
 )
 
 
@@ -171,3 +175,65 @@ def get_dataset(file_content, file_format):
         raise error
     return data
 
+
+
+FILE_FORMAT_DELIMITERS = {
+    FILE_FORMAT_CSV: ',',
+    FILE_FORMAT_TSV: '\t',
+}
+
+
+def get_records(file_content, file_format):
+    """
+    Parses a file's content into a stream of records.
+
+    Unlike ``get_dataset()``, CSV and TSV content is read incrementally, so
+    the whole file is never kept in memory.
+
+    :param file_content:
+        the content of the file that contains the data, or a file object to
+        read the data from
+    :type file_content: str, bytes, or file
+    :param file_format:
+        the format of the data; see ``FILE_FORMATS`` for possible values
+    :type file_format: str
+    :returns:
+        a tuple of the column headers and an iterator over the records; empty
+        lines are skipped
+    :rtype: tuple(list, iterator)
+    """
+
+    if file_format not in FILE_FORMAT_IMPLEMENTATIONS:
+        raise ValueError(
+            '"%s" is not a supported file format' % (
+                file_format,
+            )
+        )
+
+    if file_format not in FILE_FORMAT_DELIMITERS:
+        if hasattr(file_content, 'read'):
+            file_content = file_content.read()
+        data = get_dataset(file_content, file_format)
+        return list(data.headers or []), iter(data)
+
+    if isinstance(file_content, bytes):
+        file_content = file_content.decode('utf-8', 'replace')
+    if isinstance(file_content, str):
+        stream = io.StringIO(file_content, newline='')
+    elif isinstance(file_content, io.TextIOBase):
+        stream = file_content
+    else:
+        stream = io.TextIOWrapper(
+            file_content,
+            encoding='utf-8',
+            errors='replace',
+            newline='',
+        )
+
+    reader = csv.reader(
+        stream,
+        delimiter=FILE_FORMAT_DELIMITERS[file_format],
+    )
+    records = (record for record in reader if record)
+    headers = next(records, [])
+    return headers, records
@@ -6,12 +6,14 @@
 from rex.setup import watch
 from rex.core import (
         get_packages, get_settings, Error, PythonPackage, StrVal, PIntVal,
-        BoolVal, MaybeVal, MapVal, Validate)
+        FloatVal, BoolVal, MaybeVal, MapVal, Validate)
 from rex.ctl import (
         env, RexTask, Global, Topic, argument, option, log, fail, exe, COLORS)
 import sys
 import os
 import time
+import threading
+import itertools
 import tempfile
 import shlex
 import hashlib
@@ -722,6 +724,7 @@ class ReplayHandler:
         self.user = None
         self.date = None
         self.method = None
+        self.path = None
         self.query = None
         self.protocol = None
         self.size = None
@@ -739,7 +742,8 @@ class ReplayHandler:
         self.host = environ.get('REMOTE_HOST') or environ.get('REMOTE_ADDR')
         self.user = environ.get('REMOTE_USER') or '-'
         self.method = environ['REQUEST_METHOD']
-        self.query = environ.get('PATH_INFO', '')
+        self.path = environ.get('PATH_INFO', '')
+        self.query = self.path
         if environ.get('QUERY_STRING'):
             self.query += '?' + environ['QUERY_STRING']
         self.protocol = environ.get('SERVER_PROTOCOL') or '-'
@@ -801,8 +805,112 @@ class ReplayHandler:
             log("ERRORS: :warning:`{}`", self.errors)
 
 
+class ReplayBenchmark:
+    # Collects latencies of replayed requests grouped by route.
+
+    percentiles = [50, 95, 99]
+
+    def __init__(self, concurrency, rate):
+        self.concurrency = concurrency
+        self.rate = rate
+        self.lock = threading.Lock()
+        self.latencies = {}
+        self.errors = {}
+        self.started = None
+        self.finished = None
+
+    def start(self):
+        self.started = time.perf_counter()
+
+    def stop(self):
+        self.finished = time.perf_counter()
+
+    def add(self, handler):
+        route = "%s %s" % (handler.method, handler.path)
+        latency = (handler.finished - handler.started).total_seconds()
+        self.latencies.setdefault(route, []).append(latency)
+        self.errors.setdefault(route, 0)
+        if handler.code >= '400':
+            self.errors[route] += 1
+
+    @staticmethod
+    def percentile(latencies, p):
+        # Nearest-rank percentile of a sorted list.
+        rank = int(math.ceil(p/100.0*len(latencies)))
+        return latencies[max(rank-1, 0)]
+
+    def stats(self, latencies, errors):
+        latencies = sorted(latencies)
+        data = {
+            'requests': len(latencies),
+            'errors': errors,
+            'mean': sum(latencies)/len(latencies),
+            'max': latencies[-1],
+        }
+        for p in self.percentiles:
+            data['p%s' % p] = self.percentile(latencies, p)
+        return data
+
+    def results(self):
+        elapsed = self.finished - self.started
+        latencies = [latency
+                     for route in self.latencies
+                     for latency in self.latencies[route]]
+        results = {
+            'concurrency': self.concurrency,
+            'rate': self.rate,
+            'elapsed': elapsed,
+            'requests': len(latencies),
+            'errors': sum(self.errors.values()),
+            'throughput': len(latencies)/elapsed if elapsed > 0 else None,
+            'latency': None,
+            'routes': {},
+        }
+        if latencies:
+            results['latency'] = \
+                    self.stats(latencies, results['errors'])
+        for route in sorted(self.latencies):
+            results['routes'][route] = \
+                    self.stats(self.latencies[route], self.errors[route])
+        return results
+
+    def summary(self):
+        results = self.results()
+        log("---")
+        log("TIME ELAPSED: {}", datetime.timedelta(seconds=results['elapsed']))
+        log("REQUESTS: {}", results['requests'])
+        if results['errors']:
+            log("ERRORS: :warning:`{}`", results['errors'])
+        if results['throughput'] is not None:
+            log("THROUGHPUT: {:.2f} requests/sec", results['throughput'])
+        if results['routes']:
+            log("LATENCY (P50 / P95 / P99):")
+        for route, data in sorted(results['routes'].items()):
+            log("  `{}`: {:.1f}ms / {:.1f}ms / {:.1f}ms ({} requests)",
+                route, 1000*data['p50'], 1000*data['p95'], 1000*data['p99'],
+                data['requests'])
+
+    def dump(self, path):
+        with open(path, 'w') as stream:
+            json.dump(self.results(), stream, indent=2, sort_keys=True)
+            stream.write("\n")
+
+
 class ReplayTask(RexTask):
-    """replay WSGI requests from the log"""
+    """replay WSGI requests from the log
+
+    The `replay` task replays requests saved by `rex serve --replay-log`
+    one by one and prints the time it took to handle each request.
+
+    Use option `--concurrency` to replay requests from several threads
+    at once, and option `--rate` to send requests at the given number
+    of requests per second instead of as fast as possible.  In this
+    benchmark mode, the task reports throughput and p50/p95/p99
+    latencies of every route.
+
+    Use option `--output` to save benchmark results as a JSON file,
+    which can be used to compare different runs.
+    """
 
     name = 'replay'
 
@@ -811,8 +919,21 @@ class ReplayTask(RexTask):
         profile = option(None, str, default=None,
                 value_name="FILE",
                 hint="write profile information")
+        concurrency = option(None, PIntVal(), default=1,
+                value_name="N",
+                hint="number of concurrent replay threads")
+        rate = option(None, MaybeVal(FloatVal()), default=None,
+                value_name="RPS",
+                hint="target number of requests per second")
+        output = option('o', str, default=None,
+                value_name="FILE",
+                hint="write benchmark results as JSON")
 
     def __call__(self):
+        if self.rate is not None and self.rate <= 0:
+            raise fail("request rate must be positive: {}", self.rate)
+        if self.profile is not None and self.concurrency > 1:
+            raise fail("cannot profile concurrent replay")
         # Open the replay log.
         app = self.make(initialize=False)
         with app:
@@ -823,9 +944,12 @@ class ReplayTask(RexTask):
             raise fail("replay log does not exist: {}", replay_log)
         replay_log = open(replay_log, 'rb')
         # Run the logs.
+        app = self.make(extra_parameters={'replay_log': None})
+        if (self.concurrency > 1 or self.rate is not None or
+                self.output is not None):
+            return self.benchmark(app, replay_log)
         if self.profile is not None:
             profile = cProfile.Profile()
-        app = self.make(extra_parameters={'replay_log': None})
         handler = ReplayHandler(app)
         while True:
             try:
@@ -846,6 +970,64 @@ class ReplayTask(RexTask):
             profile.dump_stats(self.profile)
         handler.summary()
 
+    def benchmark(self, app, replay_log):
+        # Load all requests upfront so that reading the log does not
+        # affect the measurements.
+        environs = []
+        while True:
+            try:
+                environ = marshal.load(replay_log)
+            except EOFError:
+                break
+            wsgi_input = environ.get('wsgi.input')
+            if isinstance(wsgi_input, str):
+                environ['wsgi.input'] = io.StringIO(wsgi_input)
+            environs.append(environ)
+        profile = None
+        if self.profile is not None:
+            profile = cProfile.Profile()
+        benchmark = ReplayBenchmark(self.concurrency, self.rate)
+        positions = itertools.count()
+
+        def work():
+            handler = ReplayHandler(app)
+            while True:
+                with benchmark.lock:
+                    position = next(positions)
+                if position >= len(environs):
+                    break
+                if self.rate is not None:
+                    delay = (benchmark.started + position/self.rate -
+                             time.perf_counter())
+                    if delay > 0:
+                        time.sleep(delay)
+                if profile is not None:
+                    profile.enable()
+                handler(environs[position])
+                if profile is not None:
+                    profile.disable()
+                with benchmark.lock:
+                    benchmark.add(handler)
+                    if not self.quiet:
+                        handler.log()
+
+        benchmark.start()
+        if self.concurrency == 1:
+            work()
+        else:
+            threads = [threading.Thread(target=work)
+                       for k in range(self.concurrency)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        benchmark.stop()
+        if profile is not None:
+            profile.dump_stats(self.profile)
+        benchmark.summary()
+        if self.output is not None:
+            benchmark.dump(self.output)
+
 
 class DeploymentTopic(Topic):
     """how to run a RexDB application on a web server
@@ -15,9 +15,12 @@ from webob.exc import (WSGIHTTPException, HTTPNotFound, HTTPUnauthorized,
         HTTPMovedPermanently, HTTPMethodNotAllowed)
 from webob.static import FileIter, BLOCK_SIZE
 import sys
-import copy
+import collections.abc
 import os
 import fnmatch
+import re
+import hashlib
+import gzip
 import json
 import datetime
 import wsgiref
@@ -137,44 +140,120 @@ class Pipe(Extension):
         return self.handle(req)
 
 
+class Session(collections.abc.MutableMapping):
+    # Session data decoded from the encrypted cookie on first access.
+
+    def __init__(self, cookie, application_url):
+        self.cookie = cookie
+        self.application_url = application_url
+        # JSON representation of the session as stored in the cookie.
+        self.json = None
+        self._data = None
+
+    @property
+    def loaded(self):
+        return (self._data is not None)
+
+    @property
+    def data(self):
+        if self._data is None:
+            data = {}
+            if self.cookie is not None:
+                session_json = validate_and_decrypt(
+                        self.cookie, self.application_url)
+                if session_json is not None:
+                    data = json.loads(session_json)
+                    assert isinstance(data, dict)
+                    self.json = session_json
+            self._data = data
+        return self._data
+
+    def encode(self):
+        # Returns the updated JSON representation of the session if it
+        # was changed by the request, otherwise `None`.
+        if self._data is None:
+            return None
+        session_json = json.dumps(self._data) if self._data else ''
+        if session_json == (self.json or ''):
+            return None
+        return session_json
+
+    def __getitem__(self, key):
+        return self.data[key]
+
+    def __setitem__(self, key, value):
+        self.data[key] = value
+
+    def __delitem__(self, key):
+        del self.data[key]
+
+    def __iter__(self):
+        return iter(self.data)
+
+    def __len__(self):
+        return len(self.data)
+
+    def __contains__(self, key):
+        return key in self.data
+
+    def __repr__(self):
+        return "%s(%r)" % (self.__class__.__name__, self.data)
+
+
 class PipeSession(Pipe):
     # Adds `rex.session` and `rex.mount` to the request environment.
 
     priority = 'session'
 
     SESSION_COOKIE = 'rex.session'
+    # Maximum number of application URLs with a cached mount table.
+    MOUNT_CACHE_SIZE = 64
+
+    def __init__(self, handle):
+        super(PipeSession, self).__init__(handle)
+        self.mount_cache = {}
+
+    def mount(self, application_url):
+        # Builds package mount table.
+        mount = self.mount_cache.get(application_url)
+        if mount is None:
+            mount = {}
+            for name, segment in list(get_settings().mount.items()):
+                if segment:
+                    mount[name] = application_url+"/"+segment
+                else:
+                    mount[name] = application_url
+            if len(self.mount_cache) >= self.MOUNT_CACHE_SIZE:
+                self.mount_cache.clear()
+            self.mount_cache[application_url] = mount
+        return mount
 
     def __call__(self, req):
         # Do not mangle the original request object.
         req = req.copy()
         application_url = req.application_url
-        # Extract session data from the encrypted cookie.
-        session = {}
-        if self.SESSION_COOKIE in req.cookies:
-            session_cookie = req.cookies[self.SESSION_COOKIE]
-            session_json = validate_and_decrypt(session_cookie, application_url)
-            if session_json is not None:
-                session = json.loads(session_json)
-                assert isinstance(session, dict)
-        req.environ['rex.session'] = copy.deepcopy(session)
-        # Build package mount table.
-        mount = {}
-        for name, segment in list(get_settings().mount.items()):
-            if segment:
-                mount[name] = application_url+"/"+segment
-            else:
-                mount[name] = application_url
-        req.environ['rex.mount'] = mount
+        # Session data is decrypted when it is accessed for the first time.
+        session = Session(req.cookies.get(self.SESSION_COOKIE),
+                          application_url)
+        req.environ['rex.session'] = session
+        req.environ['rex.mount'] = self.mount(application_url).copy()
         # Process the request.
         resp = self.handle(req)
         # Update the session cookie if necessary.
         new_session = req.environ['rex.session']
-        if new_session != session:
-            if not new_session:
+        if new_session is session:
+            session_json = session.encode()
+        else:
+            # The session was replaced with another mapping.
+            new_session = dict(new_session)
+            session_json = None
+            if new_session != session.data:
+                session_json = json.dumps(new_session) if new_session else ''
+        if session_json is not None:
+            if not session_json:
                 resp.delete_cookie(self.SESSION_COOKIE,
                                    path=req.script_name+'/')
             else:
-                session_json = json.dumps(new_session)
                 session_cookie = encrypt_and_sign(session_json, application_url)
                 assert len(session_cookie) < 4096, \
                         "session data is too large"
@@ -299,6 +378,74 @@ class StaticGuard:
         return os.path.isfile(real_path)
 
 
+class AccessMap:
+    # Maps URLs to permissions using patterns from `_access.yaml`.
+
+    def __init__(self, access_map):
+        self.patterns = [(re.compile(fnmatch.translate(pattern)).match,
+                          access)
+                         for pattern, access in access_map.items()]
+        # Permissions for URLs seen so far.
+        self.cache = {}
+
+    def __call__(self, url):
+        # Finds the permission for the URL; `None` if there is no match.
+        try:
+            return self.cache[url]
+        except KeyError:
+            pass
+        access = None
+        for match, pattern_access in self.patterns:
+            if match(url):
+                access = pattern_access
+                break
+        self.cache[url] = access
+        return access
+
+
+class StaticAsset:
+    # Metadata of a static file.
+
+    __slots__ = ('mtime', 'size', 'etag', 'content_type',
+                 'content_encoding', 'variants')
+
+    def __init__(self, mtime, size, etag, content_type, content_encoding,
+                 variants):
+        # Stats used to detect if the file changed.
+        self.mtime = mtime
+        self.size = size
+        # Strong entity tag.
+        self.etag = etag
+        self.content_type = content_type
+        self.content_encoding = content_encoding
+        # List of `(encoding, path, body)`; either `path` to a precompressed
+        # file or the compressed content `body` is set.
+        self.variants = variants
+
+
+def accepts_encoding(header, encoding):
+    # Checks if the encoding is acceptable according to
+    # the `Accept-Encoding` header.
+    quality = None
+    for item in header.split(','):
+        params = item.strip().split(';')
+        name = params[0].strip().lower()
+        if name != encoding and not (name == '*' and quality is None):
+            continue
+        value = 1.0
+        for param in params[1:]:
+            key, _, param_value = param.partition('=')
+            if key.strip() == 'q':
+                try:
+                    value = float(param_value)
+                except ValueError:
+                    value = 0.0
+        if name == encoding:
+            return value > 0.0
+        quality = value
+    return bool(quality)
+
+
 class StaticServer:
     # Handles static resources.
 
@@ -310,11 +457,27 @@ class StaticServer:
     access_val = OMapVal(StrVal(), StrVal())
     # Directory published on HTTP.
     www_root = '/www'
-
-    def __init__(self, package, file_handler_map):
+    # Precompressed variants of a file are looked up by these extensions,
+    # in the order of preference.
+    encoding_extensions = [('br', '.br'), ('gzip', '.gz')]
+    # Content types that are worth compressing.
+    compress_types = re.compile(r'^(?:text/.*|application/(?:javascript|json'
+                                r'|xml|.*\+xml|.*\+json)|image/svg\+xml)$')
+    # Files smaller than this are never compressed.
+    compress_min_size = 1024
+    # Files larger than this are not compressed in memory.
+    compress_max_size = 32*1024*1024
+
+    def __init__(self, package, file_handler_map, access_map=None):
         self.package = package
         # Maps file extensions to handler types.
         self.file_handler_map = file_handler_map
+        # Maps URLs to permissions.
+        if access_map is not None and not isinstance(access_map, AccessMap):
+            access_map = AccessMap(access_map)
+        self.access_map = access_map
+        # Maps file paths to `StaticAsset` records.
+        self.assets = {}
 
     def __call__(self, req):
         # Normalize the URL.
@@ -334,15 +497,8 @@ class StaticServer:
 
         # Detemine and check access permissions for the requested URL.
         access = None
-        if not self.package.exists('www.yaml'):
-            access_path = self.www_root + self.access_file
-            if self.package.exists(access_path):
-                access_map = self.access_val.parse(
-                        self.package.open(access_path))
-                for pattern in access_map:
-                    if fnmatch.fnmatchcase(url, pattern):
-                        access = access_map[pattern]
-                        break
+        if self.access_map is not None:
+            access = self.access_map(url)
         if access is None:
             access = self.package
         if not authorize(req, access):
@@ -357,25 +513,86 @@ class StaticServer:
         else:
             if req.method not in ('GET', 'HEAD'):
                 raise HTTPMethodNotAllowed()
-            stream = open(real_path, 'rb')
+            asset = self.asset(real_path)
+            # Pick a compressed variant acceptable by the client.
+            encoding = asset.content_encoding
+            etag = asset.etag
+            path = real_path
+            body = None
+            accept_encoding = req.headers.get('Accept-Encoding', '')
+            for variant_encoding, variant_path, variant_body \
+                    in asset.variants:
+                if accepts_encoding(accept_encoding, variant_encoding):
+                    encoding = variant_encoding
+                    etag = "%s-%s" % (asset.etag, variant_encoding)
+                    path = variant_path
+                    body = variant_body
+                    break
+            vary = ('Accept-Encoding',) if asset.variants else None
+            if body is not None:
+                return Response(
+                        body=body,
+                        content_type=asset.content_type,
+                        content_encoding=encoding,
+                        last_modified=asset.mtime,
+                        etag=etag,
+                        vary=vary,
+                        accept_ranges='bytes',
+                        cache_control='private',
+                        conditional_response=True)
+            stream = open(path, 'rb')
             if 'wsgi.file_wrapper' in req.environ:
                 app_iter = req.environ['wsgi.file_wrapper'] \
                         (stream, BLOCK_SIZE)
             else:
                 app_iter = FileIter(stream)
-            content_type, content_encoding = \
-                    mimetypes.guess_type(real_path)
             stat = os.fstat(stream.fileno())
             return Response(
                     app_iter=app_iter,
-                    content_type=content_type or 'application/octet-stream',
-                    content_encoding=content_encoding,
-                    last_modified=stat.st_mtime,
+                    content_type=asset.content_type,
+                    content_encoding=encoding,
+                    last_modified=asset.mtime,
+                    etag=etag,
+                    vary=vary,
                     content_length=stat.st_size,
                     accept_ranges='bytes',
                     cache_control='private',
                     conditional_response=True)
 
+    def asset(self, real_path):
+        # Returns the metadata of a static file; rebuilds it
+        # if the file changed.
+        stat = os.stat(real_path)
+        asset = self.assets.get(real_path)
+        if (asset is not None and asset.mtime == stat.st_mtime and
+                asset.size == stat.st_size):
+            return asset
+        content_type, content_encoding = mimetypes.guess_type(real_path)
+        content_type = content_type or 'application/octet-stream'
+        digest = hashlib.sha1()
+        with open(real_path, 'rb') as stream:
+            for block in iter(lambda: stream.read(BLOCK_SIZE), b''):
+                digest.update(block)
+        variants = []
+        if content_encoding is None:
+            for encoding, extension in self.encoding_extensions:
+                if os.path.isfile(real_path+extension):
+                    variants.append((encoding, real_path+extension, None))
+            if (not any(encoding == 'gzip'
+                        for encoding, path, body in variants) and
+                    self.compress_types.match(content_type) and
+                    self.compress_min_size <= stat.st_size
+                                           <= self.compress_max_size):
+                with open(real_path, 'rb') as stream:
+                    body = gzip.compress(stream.read())
+                if len(body) < stat.st_size:
+                    variants.append(('gzip', None, body))
+        asset = StaticAsset(
+                stat.st_mtime, stat.st_size, digest.hexdigest(),
+                content_type, content_encoding, variants)
+        self.assets[real_path] = asset
+        return asset
+
 
 class CommandDispatcher:
     # Routes the request to a `HandleLocation` implementation.
@@ -422,7 +639,14 @@ class RouteFiles(Route):
         path_map = PathMap()
         if package.exists(StaticServer.www_root):
             file_handler_map = HandleFile.mapped()
-            server = StaticServer(package, file_handler_map)
+            # Load the access map; it is reloaded when the file changes.
+            access_map = None
+            if not package.exists('www.yaml'):
+                access_path = StaticServer.www_root+StaticServer.access_file
+                if package.exists(access_path):
+                    access_map = StaticServer.access_val.parse(
+                            self.open(package.abspath(access_path)))
+            server = StaticServer(package, file_handler_map, access_map)
             guard = StaticGuard(package)
             mask = PathMask('/**', guard)
             path_map.add(mask, server)
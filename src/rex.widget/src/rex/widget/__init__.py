@@ -18,7 +18,7 @@ from .render import render as render_widget, Bootstrap
 from .chrome import Chrome
 
 from .transitionable import encode, as_transitionable
-from .transitionable import Transitionable, TransitionableRecord
+from .transitionable import Transitionable, TransitionableRecord, Static
 
 from .column import ColumnVal
 from .keypath import KeyPathVal
@@ -26,6 +26,7 @@ class FieldBase(object):
 
     transitionable = True
     as_transitionable = None
+    static = False
 
     def __init__(self, name=None, doc=None):
         self.name = name
@@ -81,11 +82,15 @@ class Field(FieldBase):
 
     :param name: Name of the field, its value is set automatically.
     :type name: str
+
+    :param static: If ``True`` then the field value doesn't depend on the
+                   request and its encoding is reused between requests.
+    :type static: bool
     """
 
     def __init__(self, validate=AnyVal(), default=NotImplemented, doc=None,
                  name=None, transitionable=True, deprecated=None,
-                 as_transitionable=None):
+                 as_transitionable=None, static=False):
         if default is None and not isinstance(validate, MaybeVal):
             validate = MaybeVal(validate)
         elif default is undefined and not isinstance(validate, MaybeUndefinedVal):
@@ -100,6 +105,7 @@ class Field(FieldBase):
         self.transitionable = transitionable
         self.deprecated = deprecated
         self.as_transitionable = as_transitionable
+        self.static = static
         super(Field, self).__init__(name=name, doc=doc)
 
     def __clone__(self, **params):
@@ -110,6 +116,7 @@ class Field(FieldBase):
             'transitionable': self.transitionable,
             'as_transitionable': self.as_transitionable,
             'deprecated': self.deprecated,
+            'static': self.static,
             'name': self.name,
         }
         next_params.update(params)
@@ -148,6 +155,8 @@ class ComputedField(FieldBase):
 
 class ComputedValue(Transitionable):
 
+    __transit_dynamic__ = True
+
     def __init__(self, computator, widget):
         self.computator = computator
         self.widget = widget
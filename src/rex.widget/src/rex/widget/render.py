@@ -14,12 +14,12 @@ import os
 from webob import Response
 from webob.exc import HTTPBadRequest
 
-from rex.core import get_packages, get_settings, Extension
+from rex.core import get_packages, get_settings, cached, Extension
 from rex.db import get_db
 from rex.web import render_to_response
 
 from .keypath import KeyPathVal
-from .transitionable import encode, select, SelectError
+from .transitionable import encode, select, SelectError, Static
 from .chrome import get_chrome
 
 __all__ = ('render',)
@@ -50,6 +50,13 @@ class Bootstrap(Extension):
 validate_widget_path = KeyPathVal(allow_empty=True)
 
 
+@cached
+def get_theme():
+    # The theme is the same for every page, so its encoding is kept along
+    # with the application.
+    return Static(get_settings().rex_widget.theme)
+
+
 def render(widget, request,
         template='rex.widget:/templates/index.html',
         path=None,
@@ -98,10 +105,9 @@ def render(widget, request,
             raise HTTPBadRequest('unable to locate responder via selector')
         return widget.respond(request)
     else:
-        settings = get_settings()
         accept = request.accept.best_match(['text/html', 'application/json'])
         payload = encode(widget, request)
-        theme = encode(settings.rex_widget.theme, request)
+        theme = encode(get_theme(), request)
         if accept == 'application/json':
             return Response(payload, content_type='application/json', charset='utf-8')
         else:
@@ -10,18 +10,22 @@
 
 """
 
+import threading
+from collections import OrderedDict
 from io import StringIO
+from weakref import WeakKeyDictionary
 
 from rex.core import Record
 
 from transit.constants import ESC
+from transit.rolling_cache import RollingCache, is_cacheable
 from transit.writer import Writer as BaseWriter
 from transit.writer import JsonMarshaler as BaseJsonMarshaler
 from transit.writer import marshal_dispatch as base_marshal_dispatch
 from transit.write_handlers import WriteHandler as BaseWriteHandler
 
 __all__ = (
-    'Transitionable', 'TransitionableRecord',
+    'Transitionable', 'TransitionableRecord', 'Static',
     'as_transitionable', 'register_transitionable',
     'encode', 'select', 'SelectError'
 )
@@ -30,6 +34,70 @@ __all__ = (
 NOOP_TAG = '---'
 
 
+# Encoded static subtrees: owner -> {(path, request key): parts}; the
+# request key is None for subtrees which do not look at the request.
+_fragments = WeakKeyDictionary()
+_fragments_lock = threading.Lock()
+# Maximum number of encodings kept for each owner.
+FRAGMENT_CACHE_SIZE = 64
+
+
+def _static_owner(obj):
+    # Returns the object which keeps the encoding of a static subtree.
+    if isinstance(obj, Static):
+        return obj.owner
+    if getattr(type(obj), '__transit_static__', False):
+        return obj
+    return None
+
+
+def _request_key(req):
+    # Static subtrees may still contain URLs, which depend on the location
+    # of the page, but not on anything else in the request.
+    if req is None:
+        return None
+    return (req.application_url, req.path_info, req.environ.get('rex.package'))
+
+
+class _RequestProbe(object):
+    """ Wraps a request and notes whether it is used."""
+
+    def __init__(self, request):
+        self.__dict__['_request'] = request
+        self.__dict__['_used'] = False
+
+    def __getattr__(self, name):
+        self.__dict__['_used'] = True
+        return getattr(self._request, name)
+
+    def __setattr__(self, name, value):
+        self.__dict__['_used'] = True
+        setattr(self._request, name, value)
+
+
+class _Name(object):
+    """ A string within an encoded static subtree which could be replaced
+    with a reference to the cache."""
+
+    __slots__ = ('name', 'as_map_key')
+
+    def __init__(self, name, as_map_key):
+        self.name = name
+        self.as_map_key = as_map_key
+
+
+class _Hole(object):
+    """ A dynamic value within an encoded static subtree."""
+
+    __slots__ = ('obj', 'path', 'started', 'is_key')
+
+    def __init__(self, obj, path, started, is_key):
+        self.obj = obj
+        self.path = path
+        self.started = started
+        self.is_key = is_key
+
+
 class JsonMarshaler(BaseJsonMarshaler):
 
     class _PathContext(object):
@@ -50,8 +118,19 @@ class JsonMarshaler(BaseJsonMarshaler):
         self.request = request
         self.handlers = _handlers
         self.path = []
+        self.parts = None
 
     def marshal(self, obj, as_map_key, cache):
+        if not as_map_key:
+            if self.parts is None:
+                owner = _static_owner(obj)
+                if owner is not None:
+                    return self.emit_static(owner, obj, cache)
+            elif getattr(type(obj), '__transit_dynamic__', False):
+                return self.emit_dynamic(obj, cache)
+        return self.emit(obj, as_map_key, cache)
+
+    def emit(self, obj, as_map_key, cache):
         handler = self.handlers[obj]
         tag = handler.tag(obj)
         f = marshal_dispatch.get(tag)
@@ -68,6 +147,92 @@ class JsonMarshaler(BaseJsonMarshaler):
         else:
             self.emit_encoded(tag, rep, obj, as_map_key, cache)
 
+    def emit_static(self, owner, obj, cache):
+        # Static subtrees are encoded once, leaving out the strings a reader
+        # would cache; those are passed through our cache when the encoding
+        # is written, so that the references stay in sync with the reader.
+        path = tuple(self.path)
+        keys = [(path, None)]
+        if self.request is not None:
+            keys.append((path, _request_key(self.request)))
+        with _fragments_lock:
+            fragments = _fragments.get(owner)
+            if fragments is None:
+                fragments = _fragments[owner] = OrderedDict()
+            for key in keys:
+                parts = fragments.get(key)
+                if parts is not None:
+                    fragments.move_to_end(key)
+                    break
+        if parts is None:
+            parts, uses_request = self.record(obj)
+            key = keys[-1] if uses_request else keys[0]
+            with _fragments_lock:
+                fragments[key] = parts
+                while len(fragments) > FRAGMENT_CACHE_SIZE:
+                    fragments.popitem(last=False)
+        self.write_sep()
+        started, is_key, path = self.started, self.is_key, self.path
+        try:
+            for part in parts:
+                if isinstance(part, _Hole):
+                    self.started = part.started[:]
+                    self.is_key = part.is_key[:]
+                    self.path = part.path[:]
+                    self.marshal(part.obj, False, cache)
+                elif isinstance(part, _Name):
+                    # The separator is already a part of the text.
+                    self.started, self.is_key = [True], [None]
+                    self.emit_object(
+                        cache.encode(part.name, part.as_map_key),
+                        part.as_map_key)
+                else:
+                    self.io.write(part)
+        finally:
+            self.started, self.is_key, self.path = started, is_key, path
+
+    def record(self, obj):
+        # Encodes a static subtree as a list of pieces of text, cacheable
+        # strings and holes left for the dynamic values within it; also
+        # tells if the encoding depends on the request.
+        io, started, is_key = self.io, self.started, self.is_key
+        request = self.request
+        self.io, self.started, self.is_key = StringIO(), [True], [None]
+        if request is not None:
+            self.request = _RequestProbe(request)
+        self.parts = parts = []
+        try:
+            self.emit(obj, False, RollingCache())
+            parts.append(self.io.getvalue())
+            uses_request = (request is not None and
+                            self.request.__dict__['_used'])
+        finally:
+            self.io, self.started, self.is_key = io, started, is_key
+            self.request = request
+            self.parts = None
+        return parts, uses_request
+
+    def emit_dynamic(self, obj, cache):
+        self.parts.append(self.io.getvalue())
+        self.parts.append(_Hole(
+            obj, self.path[:], self.started[:], self.is_key[:]))
+        # The separator is written when the value is spliced in, so discard
+        # it here and only keep its effect on the state of the marshaler.
+        self.io = StringIO()
+        self.write_sep()
+        self.io = StringIO()
+
+    def emit_string(self, prefix, tag, string, as_map_key, cache):
+        name = str(prefix) + tag + string
+        if self.parts is not None and is_cacheable(name, as_map_key):
+            self.write_sep()
+            self.parts.append(self.io.getvalue())
+            self.parts.append(_Name(name, as_map_key))
+            self.io = StringIO()
+            return
+        return super(JsonMarshaler, self).emit_string(
+            prefix, tag, string, as_map_key, cache)
+
     def emit_encoded(self, tag, rep, obj, as_map_key, cache):
         if len(tag) == 1:
             if isinstance(rep, str):
@@ -236,7 +401,16 @@ class _TransitionableMeta(type):
 
 
 class Transitionable(object, metaclass=_TransitionableMeta):
-    """ Base class for transitionable objects."""
+    """ Base class for transitionable objects.
+
+    A class may set ``__transit_static__`` to declare that the encoding of
+    its instances does not depend on the request (other than on the URL of
+    the page); such objects are encoded once per location (and per page
+    URL, if they look at the request) and reused afterwards.  Values of
+    classes which set ``__transit_dynamic__`` are encoded anew on each
+    request, even within a static object.  Static objects must support
+    weak references.
+    """
 
     def __transit_format__(self, req, path):
         raise NotImplementedError(
@@ -269,6 +443,24 @@ class TransitionableRecord(Transitionable, metaclass=_TransitionableRecordMeta):
         return [getattr(self, field) for field in self._fields] # pylint: disable=no-member
 
 
+class Static(Transitionable):
+    """ Marks ``value`` as independent of the request.
+
+    The value is encoded once per location (and per page URL, if it looks at
+    the request) and the encoding is reused as long as ``owner`` (which must
+    support weak references) is alive; if ``owner`` is not given, the
+    encoding is kept by the :class:`Static` instance itself.  At most
+    ``FRAGMENT_CACHE_SIZE`` encodings are kept for each owner.
+    """
+
+    def __init__(self, value, owner=None):
+        self.value = value
+        self.owner = owner if owner is not None else self
+
+    def __transit_format__(self, req, path):
+        return self.value
+
+
 def as_transitionable(obj_type, tag=NOOP_TAG):
     """ Decorator to attach transit format externally to an object type."""
     def _register(rep):
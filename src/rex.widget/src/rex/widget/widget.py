@@ -13,7 +13,7 @@ import inspect
 from rex.core import ProxyVal, SeqVal, RecordField
 from rex.core import Extension, Error
 
-from .transitionable import as_transitionable
+from .transitionable import as_transitionable, Static
 from .field import FieldBase, Field, ComputedField, ResponderField
 from .util import PropsContainer
 
@@ -115,6 +115,10 @@ class Widget(Extension, metaclass=WidgetMeta):
 
         w = Widget(title='Title')
 
+    Widgets which are rendered the same way for every request (except for
+    fields computed from the request) can set ``__transit_static__ = True``
+    so that they are encoded only once.
+
     """
 
     name = None
@@ -228,9 +232,12 @@ def _format_Widget(widget, req, path): # pylint: disable=invalid-name
     for name, field in list(widget._fields.items()):
         if field.transitionable:
             if field.as_transitionable:
-                values[name] = field.as_transitionable(widget, field(widget))
+                value = field.as_transitionable(widget, field(widget))
             else:
-                values[name] = field(widget)
+                value = field(widget)
+            if field.static:
+                value = Static(value, owner=widget)
+            values[name] = value
         elif name in values:
             del values[name]
     pkg_name, symbol_name = widget.js_type